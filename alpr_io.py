@@ -6,23 +6,47 @@ Structure: data/input/ et data/output/
 
 import cv2
 import numpy as np
-import easyocr
 import os
 import sys
 import shutil
+import logging
+import multiprocessing
 from datetime import datetime
-import tkinter as tk
-from tkinter import filedialog, messagebox
 import argparse
 
+# Registre partagé des lecteurs EasyOCR (src/reader_pool.py)
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+from reader_pool import get_reader, warmup
+from plate_grammar import PlateGrammar
+from plate_corrector import PlateCorrector
+from report_sink import BatchReportSink
+from plate_store import PlateStore
+from utils import is_interactive, pause_before_exit
+from log import get_logger, banner, add_logging_arguments, setup_from_args, ProgressReporter
+
+log = get_logger('alpr_io')
+
+# Formats acceptés par ALPRSystem
+ALPR_PLATE_FORMATS = {
+    'FR': [
+        r'^[A-Z]{2}-\d{3}-[A-Z]{2}$',  # AB-123-CD
+        r'^[A-Z]{2}\d{3}[A-Z]{2}$',     # AB123CD
+    ],
+    'FR_ANCIEN': [
+        r'^\d{1,4}[A-Z]{1,3}\d{2}$',    # Ancien format
+    ],
+}
+
+# Compilés une seule fois
+PLATE_GRAMMAR = PlateGrammar(ALPR_PLATE_FORMATS)
+PLATE_CORRECTOR = PlateCorrector(ALPR_PLATE_FORMATS)
+
 class ALPRSystem:
     """Système complet ALPR avec gestion des fichiers"""
     
     def __init__(self, lang='fr', gpu=False):
         """Initialise le système ALPR"""
-        print("="*70)
-        print("🚗 ALPR SYSTEM - Version data/input data/output")
-        print("="*70)
+        banner(log, "🚗 ALPR SYSTEM - Version data/input data/output")
         
         # Définir les chemins
         self.base_dir = os.path.dirname(os.path.abspath(__file__))
@@ -34,14 +58,26 @@ class ALPRSystem:
         # Créer les dossiers nécessaires
         self.create_folders()
         
-        # Initialiser OCR
-        print("\n🔧 Initialisation EasyOCR...")
+        # OCR: lecteur partagé, chargé au premier usage
+        self.lang = lang
+        self.gpu = gpu
+    
+    @property
+    def reader(self):
+        """Lecteur EasyOCR partagé (chargé au premier usage)"""
+        return get_reader([self.lang], self.gpu)
+    
+    def warmup(self):
+        """Pré-charge le modèle OCR et affiche le temps de chargement"""
+        log.info("\n🔧 Initialisation EasyOCR...")
         try:
-            self.reader = easyocr.Reader([lang], gpu=gpu)
-            print("✅ OCR prêt")
+            load_time = warmup([self.lang], self.gpu)
+            log.info("✅ OCR prêt (%.2fs)", load_time)
         except Exception as e:
-            print(f"❌ Erreur OCR: {e}")
+            log.error("❌ Erreur OCR: %s", e)
             raise
+        
+        return load_time
     
     def create_folders(self):
         """Crée la structure de dossiers data/"""
@@ -54,52 +90,57 @@ class ALPRSystem:
         
         for folder in folders:
             os.makedirs(folder, exist_ok=True)
-            print(f"📁 Dossier créé/vérifié: {folder}")
+            log.debug("📁 Dossier créé/vérifié: %s", folder)
     
     def get_relative_path(self, full_path):
         """Retourne le chemin relatif depuis le dossier du projet"""
         return os.path.relpath(full_path, self.base_dir)
     
-    def process_single_image(self, image_path):
-        """Traite une seule image"""
-        print(f"\n📸 Traitement: {os.path.basename(image_path)}")
-        print("-"*50)
+    def process_single_image(self, image_path, write_reports=True, summary=False):
+        """Traite une seule image
+        
+        Avec ``write_reports=False`` (mode batch), les rapports par image
+        ne sont pas écrits : l'appelant les regroupe. Le résumé est
+        affiché avec ``summary=True``, sinon seulement au niveau DEBUG.
+        """
+        log.debug("\n📸 Traitement: %s", os.path.basename(image_path))
         
         # Vérifier si le fichier existe
         if not os.path.exists(image_path):
-            print(f"❌ Fichier non trouvé: {image_path}")
+            log.error("❌ Fichier non trouvé: %s", image_path)
             return None
         
         # Charger l'image
         image = cv2.imread(image_path)
         if image is None:
-            print(f"❌ Impossible de lire l'image: {image_path}")
+            log.error("❌ Impossible de lire l'image: %s", image_path)
             return None
         
-        print(f"📏 Dimensions: {image.shape[1]}x{image.shape[0]}")
+        log.debug("📏 Dimensions: %dx%d", image.shape[1], image.shape[0])
         
         # Redimensionner si trop grande (pour performance)
         if image.shape[1] > 1200:
             ratio = 1200 / image.shape[1]
             new_height = int(image.shape[0] * ratio)
             image = cv2.resize(image, (1200, new_height))
-            print(f"📐 Redimensionné à: {image.shape[1]}x{image.shape[0]}")
+            log.debug("📐 Redimensionné à: %dx%d", image.shape[1], image.shape[0])
         
         # Convertir pour OCR
         rgb_image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
         
         # OCR
-        print("🔍 Analyse OCR en cours...")
+        log.debug("🔍 Analyse OCR en cours...")
         results = self.reader.readtext(rgb_image, paragraph=False)
         
         # Traiter les résultats
         plates = self.process_ocr_results(image, results)
         
         # Générer les fichiers de sortie
-        output_files = self.generate_output(image_path, image, plates)
+        output_files = self.generate_output(image_path, image, plates, write_reports)
         
-        # Afficher le résumé
-        self.display_summary(image_path, plates, output_files)
+        # Afficher le résumé (opt-in: rien par image en batch)
+        self.display_summary(image_path, plates, output_files,
+                             level=logging.INFO if summary else logging.DEBUG)
         
         return output_files
     
@@ -109,7 +150,7 @@ class ALPRSystem:
         
         for i, (bbox, text, confidence) in enumerate(ocr_results):
             # Nettoyer le texte
-            clean_text = self.clean_plate_text(text)
+            clean_text = self.clean_plate_text(text, confidence)
             
             # Vérifier si c'est une plaque
             if self.is_valid_plate(clean_text):
@@ -125,11 +166,11 @@ class ALPRSystem:
                 # Dessiner sur l'image
                 self.draw_plate_detection(image, bbox, clean_text, confidence)
                 
-                print(f"  🎯 Plaque {i+1}: {clean_text} ({confidence:.1%})")
+                log.debug("  🎯 Plaque %d: %s (%.1f%%)", i + 1, clean_text, confidence * 100)
         
         return plates
     
-    def clean_plate_text(self, text):
+    def clean_plate_text(self, text, confidence=0.9):
         """Nettoie le texte de la plaque"""
         import re
         
@@ -137,17 +178,11 @@ class ALPRSystem:
         cleaned = re.sub(r'[^\w\-]', '', text)
         cleaned = cleaned.upper()
         
-        # Corrections OCR courantes
-        corrections = {
-            '0': 'O',
-            '1': 'I',
-            '5': 'S',
-            '8': 'B',
-            ' ': '',  # Enlever espaces
-        }
-        
-        for wrong, right in corrections.items():
-            cleaned = cleaned.replace(wrong, right)
+        # Corrections OCR (0/O, 1/I, 5/S, 8/B...) selon la position
+        # de chaque caractère dans le format de plaque
+        corrected = PLATE_CORRECTOR.correct(cleaned, confidence)
+        if corrected:
+            cleaned = corrected[0]
         
         return cleaned
     
@@ -164,14 +199,7 @@ class ALPRSystem:
             return False
         
         # Formats acceptés
-        import re
-        patterns = [
-            r'^[A-Z]{2}-\d{3}-[A-Z]{2}$',  # AB-123-CD
-            r'^[A-Z]{2}\d{3}[A-Z]{2}$',     # AB123CD
-            r'^\d{1,4}[A-Z]{1,3}\d{2}$',    # Ancien format
-        ]
-        
-        return any(re.match(p, text) for p in patterns)
+        return PLATE_GRAMMAR.is_valid(text)
     
     def draw_plate_detection(self, image, bbox, text, confidence):
         """Dessine la détection sur l'image"""
@@ -207,7 +235,7 @@ class ALPRSystem:
                    (x_min, y_min - 5),
                    cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
     
-    def generate_output(self, input_path, image, plates):
+    def generate_output(self, input_path, image, plates, write_reports=True):
         """Génère tous les fichiers de sortie dans data/output/"""
         base_name = os.path.splitext(os.path.basename(input_path))[0]
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -244,15 +272,16 @@ class ALPRSystem:
             cv2.imwrite(plate_image, plate_roi)
             plate['image_path'] = plate_image
         
-        # 3. Rapport texte
-        report_file = os.path.join(self.reports_dir, f"{base_name}_report_{timestamp}.txt")
-        self.generate_text_report(report_file, input_path, plates, timestamp)
-        output_files['report'] = report_file
-        
-        # 4. Rapport CSV (pour Excel)
-        csv_file = os.path.join(self.reports_dir, f"{base_name}_data_{timestamp}.csv")
-        self.generate_csv_report(csv_file, input_path, plates, timestamp)
-        output_files['csv'] = csv_file
+        if write_reports:
+            # 3. Rapport texte
+            report_file = os.path.join(self.reports_dir, f"{base_name}_report_{timestamp}.txt")
+            self.generate_text_report(report_file, input_path, plates, timestamp)
+            output_files['report'] = report_file
+            
+            # 4. Rapport CSV (pour Excel)
+            csv_file = os.path.join(self.reports_dir, f"{base_name}_data_{timestamp}.csv")
+            self.generate_csv_report(csv_file, input_path, plates, timestamp)
+            output_files['csv'] = csv_file
         
         return output_files
     
@@ -311,50 +340,64 @@ class ALPRSystem:
                     os.path.basename(plate.get('image_path', ''))
                 ])
     
-    def display_summary(self, input_path, plates, output_files):
-        """Affiche un résumé à l'écran"""
-        print("\n" + "="*50)
-        print("📊 RÉSUMÉ DE L'ANALYSE")
-        print("="*50)
+    def display_summary(self, input_path, plates, output_files, level=logging.INFO):
+        """Affiche un résumé (au niveau de log ``level``)"""
+        if not log.isEnabledFor(level):
+            return
         
-        print(f"\n📁 Fichier traité: {os.path.basename(input_path)}")
-        print(f"📁 Emplacement: {self.get_relative_path(input_path)}")
-        print(f"📅 Horodatage: {output_files['timestamp']}")
+        lines = [
+            "\n" + "="*50,
+            "📊 RÉSUMÉ DE L'ANALYSE",
+            "="*50,
+            f"\n📁 Fichier traité: {os.path.basename(input_path)}",
+            f"📁 Emplacement: {self.get_relative_path(input_path)}",
+            f"📅 Horodatage: {output_files['timestamp']}",
+        ]
         
         if plates:
-            print(f"\n✅ {len(plates)} plaque(s) détectée(s):")
+            lines.append(f"\n✅ {len(plates)} plaque(s) détectée(s):")
             for plate in plates:
-                print(f"  • {plate['text']} ({plate['confidence']:.1%})")
+                lines.append(f"  • {plate['text']} ({plate['confidence']:.1%})")
         else:
-            print("\n⚠️  Aucune plaque détectée")
+            lines.append("\n⚠️  Aucune plaque détectée")
         
-        print(f"\n💾 FICHIERS GÉNÉRÉS dans data/output/:")
+        lines.append(f"\n💾 FICHIERS GÉNÉRÉS dans data/output/:")
         if 'result_image' in output_files:
             rel_path = self.get_relative_path(output_files['result_image'])
-            print(f"  1. Image résultat: {rel_path}")
+            lines.append(f"  1. Image résultat: {rel_path}")
         
         if 'report' in output_files:
             rel_path = self.get_relative_path(output_files['report'])
-            print(f"  2. Rapport texte: {rel_path}")
+            lines.append(f"  2. Rapport texte: {rel_path}")
         
         if 'csv' in output_files:
             rel_path = self.get_relative_path(output_files['csv'])
-            print(f"  3. Données CSV: {rel_path}")
+            lines.append(f"  3. Données CSV: {rel_path}")
         
         if plates:
             for i, plate in enumerate(plates):
                 if 'image_path' in plate:
                     rel_path = self.get_relative_path(plate['image_path'])
-                    print(f"  4.{i+1}. Image plaque {i+1}: {rel_path}")
+                    lines.append(f"  4.{i+1}. Image plaque {i+1}: {rel_path}")
+        
+        lines += [
+            f"\n📁 Structure complète:",
+            f"  • Entrée: {self.get_relative_path(self.input_dir)}/",
+            f"  • Sortie: {self.get_relative_path(self.output_dir)}/",
+            f"    ├── results/  (images)",
+            f"    └── reports/  (textes)",
+        ]
         
-        print(f"\n📁 Structure complète:")
-        print(f"  • Entrée: {self.get_relative_path(self.input_dir)}/")
-        print(f"  • Sortie: {self.get_relative_path(self.output_dir)}/")
-        print(f"    ├── results/  (images)")
-        print(f"    └── reports/  (textes)")
+        log.log(level, "\n".join(lines), extra={'fields': {
+            'event': 'image', 'path': input_path,
+            'plates': [{'text': p['text'], 'confidence': p['confidence']} for p in plates],
+        }})
 
 def select_image_gui():
     """Interface graphique pour sélectionner une image"""
+    import tkinter as tk
+    from tkinter import filedialog
+    
     root = tk.Tk()
     root.withdraw()  # Cacher la fenêtre principale
     
@@ -368,14 +411,41 @@ def select_image_gui():
     
     return file_path
 
-def process_batch_folder(folder_path):
-    """Traite toutes les images d'un dossier"""
-    print(f"\n📁 TRAITEMENT BATCH: {folder_path}")
-    print("-"*50)
+# Système ALPR propre à chaque processus worker (mode --workers)
+_worker_alpr = None
+
+def _init_worker():
+    """Initialise un worker: un seul ALPRSystem réutilisé"""
+    global _worker_alpr
+    
+    # Un worker = un cœur: éviter la sur-souscription des threads
+    cv2.setNumThreads(1)
+    try:
+        import torch
+        torch.set_num_threads(1)
+    except ImportError:
+        pass
+    
+    _worker_alpr = ALPRSystem()
+    _worker_alpr.warmup()
+
+def _process_in_worker(image_path):
+    """Traite une image dans un worker"""
+    try:
+        return image_path, _worker_alpr.process_single_image(image_path, write_reports=False), None
+    except Exception as e:
+        return image_path, None, str(e)
+
+def process_batch_folder(folder_path, workers=1, store=None):
+    """Traite toutes les images d'un dossier
+    
+    Les lectures sont enregistrées dans ``store`` (PlateStore) si donné.
+    """
+    log.info("\n📁 TRAITEMENT BATCH: %s", folder_path)
     
     # Vérifier le dossier
     if not os.path.exists(folder_path):
-        print(f"❌ Dossier non trouvé: {folder_path}")
+        log.error("❌ Dossier non trouvé: %s", folder_path)
         return
     
     # Lister les images
@@ -387,52 +457,82 @@ def process_batch_folder(folder_path):
             images.append(os.path.join(folder_path, file))
     
     if not images:
-        print("❌ Aucune image trouvée dans le dossier")
+        log.error("❌ Aucune image trouvée dans le dossier")
         return
     
-    print(f"📸 {len(images)} image(s) trouvée(s)")
+    log.info("📸 %d image(s) trouvée(s)", len(images))
     
-    # Initialiser ALPR
-    alpr = ALPRSystem()
+    # Rapport unique pour tout le batch
+    sink = BatchReportSink('csv')
+    progress = ProgressReporter(len(images), log)
+    processed = 0
     
-    # Traiter chaque image
-    all_results = []
-    for i, image_path in enumerate(images, 1):
-        print(f"\n[{i}/{len(images)}] Traitement: {os.path.basename(image_path)}")
-        
-        try:
-            results = alpr.process_single_image(image_path)
-            if results:
-                all_results.append(results)
-        except Exception as e:
-            print(f"❌ Erreur avec {os.path.basename(image_path)}: {e}")
+    try:
+        if workers > 1:
+            # Pool de processus: résultats dans l'ordre de fin de traitement
+            log.info("⚙️  %d workers", workers)
+            
+            with multiprocessing.Pool(processes=workers,
+                                      initializer=_init_worker) as pool:
+                outcomes = pool.imap_unordered(_process_in_worker, images)
+                for i, (image_path, results, error) in enumerate(outcomes, 1):
+                    log.debug("[%d/%d] Terminé: %s", i, len(images), os.path.basename(image_path))
+                    
+                    if error:
+                        log.error("❌ Erreur avec %s: %s", os.path.basename(image_path), error)
+                    elif results:
+                        processed += 1
+                        sink.add(image_path, results['plates'])
+                        if store is not None:
+                            store.add(image_path, results['plates'])
+                    
+                    progress.update()
+        else:
+            # Initialiser ALPR
+            alpr = ALPRSystem()
+            
+            # Traiter chaque image
+            for i, image_path in enumerate(images, 1):
+                log.debug("[%d/%d] Traitement: %s", i, len(images), os.path.basename(image_path))
+                
+                try:
+                    results = alpr.process_single_image(image_path, write_reports=False)
+                    if results:
+                        processed += 1
+                        sink.add(image_path, results['plates'])
+                        if store is not None:
+                            store.add(image_path, results['plates'])
+                except Exception as e:
+                    log.error("❌ Erreur avec %s: %s", os.path.basename(image_path), e)
+                
+                progress.update()
+    finally:
+        summary_path = sink.close()
     
     # Rapport final batch
-    if all_results:
-        print("\n" + "="*60)
-        print("📊 RAPPORT FINAL BATCH")
-        print("="*60)
-        
-        total_plates = sum(len(r['plates']) for r in all_results)
-        total_images = len(all_results)
-        
-        print(f"\n📈 STATISTIQUES:")
-        print(f"  • Images traitées: {total_images}/{len(images)}")
-        print(f"  • Plaques détectées au total: {total_plates}")
-        print(f"  • Taux de détection: {(total_images/len(images))*100:.1f}%")
+    if processed:
+        unique_plates = sink.unique_plates
+        
+        lines = [
+            "📈 STATISTIQUES:",
+            f"  • Images traitées: {processed}/{len(images)}",
+            f"  • Plaques détectées au total: {sink.total_plates}",
+            f"  • Taux de détection: {(processed/len(images))*100:.1f}%",
+            f"  • Plaques uniques: {len(unique_plates)}",
+        ]
         
-        # Plaques uniques
-        unique_plates = set()
-        for result in all_results:
-            for plate in result['plates']:
-                unique_plates.add(plate['text'])
+        if unique_plates:
+            lines.append(f"\n  📋 Liste des plaques uniques:")
+            lines += [f"    - {plate}" for plate in sorted(unique_plates)]
         
-        print(f"  • Plaques uniques: {len(unique_plates)}")
+        lines += [f"\n💾 Rapport: {sink.path}", f"💾 Résumé: {summary_path}"]
         
-        if unique_plates:
-            print(f"\n  📋 Liste des plaques uniques:")
-            for plate in sorted(unique_plates):
-                print(f"    - {plate}")
+        banner(log, "📊 RAPPORT FINAL BATCH", width=60)
+        log.info("\n".join(lines), extra={'fields': {
+            'event': 'batch_done', 'images': len(images), 'processed': processed,
+            'total_plates': sink.total_plates, 'unique_plates': sorted(unique_plates),
+            'report': sink.path, 'summary': summary_path,
+        }})
 
 def main():
     """Point d'entrée principal"""
@@ -443,25 +543,35 @@ def main():
     parser.add_argument('-d', '--directory', help="Dossier d'images à traiter (batch)")
     parser.add_argument('-g', '--gui', action='store_true', help="Ouvrir l'interface graphique")
     parser.add_argument('--data-input', action='store_true', help="Utiliser data/input par défaut")
+    parser.add_argument('--workers', type=int, default=1, help="Nombre de processus pour le mode batch")
+    parser.add_argument('--headless', action='store_true', help="Aucune attente clavier en fin de traitement")
+    parser.add_argument('--no-db', action='store_true', help="Ne pas enregistrer les lectures dans la base des plaques")
+    add_logging_arguments(parser)
     
     args = parser.parse_args()
+    setup_from_args(args)
     
     # Mode GUI
     if args.gui:
-        print("🖼️  Mode interface graphique activé")
+        log.info("🖼️  Mode interface graphique activé")
         image_path = select_image_gui()
         
         if image_path:
-            print(f"📸 Image sélectionnée: {os.path.basename(image_path)}")
+            log.info("📸 Image sélectionnée: %s", os.path.basename(image_path))
             alpr = ALPRSystem()
-            alpr.process_single_image(image_path)
+            alpr.process_single_image(image_path, summary=True)
         else:
-            print("❌ Aucune image sélectionnée")
+            log.error("❌ Aucune image sélectionnée")
         return
     
     # Mode batch
     if args.directory:
-        process_batch_folder(args.directory)
+        store = None if args.no_db else PlateStore()
+        try:
+            process_batch_folder(args.directory, workers=args.workers, store=store)
+        finally:
+            if store is not None:
+                store.close()
         return
     
     # Mode single image
@@ -480,18 +590,22 @@ def main():
             images = [f for f in os.listdir(data_input_dir) if f.lower().endswith(ext)]
             if images:
                 image_path = os.path.join(data_input_dir, images[0])
-                print(f"📸 Image trouvée dans data/input/: {images[0]}")
+                log.info("📸 Image trouvée dans data/input/: %s", images[0])
                 break
         
         if not image_path:
-            print("⚠️  Aucune image trouvée dans data/input/")
-            print("   Création d'une image de test...")
+            log.warning("⚠️  Aucune image trouvée dans data/input/, création d'une image de test...")
             image_path = os.path.join(data_input_dir, "test_plate.jpg")
             img = np.zeros((400, 800, 3), dtype=np.uint8)
             cv2.putText(img, "AB-123-CD", (200, 200),
                        cv2.FONT_HERSHEY_SIMPLEX, 2, (255, 255, 255), 3)
             cv2.imwrite(image_path, img)
-            print(f"✅ Image créée: data/input/test_plate.jpg")
+            log.info("✅ Image créée: data/input/test_plate.jpg")
+    
+    if not image_path and not is_interactive():
+        # Sans terminal, pas de menu: rien ne doit attendre une saisie
+        parser.print_help()
+        return
     
     if not image_path:
         # Mode interactif
@@ -525,12 +639,10 @@ def main():
     
     # Traiter l'image unique
     alpr = ALPRSystem()
-    alpr.process_single_image(image_path)
+    alpr.process_single_image(image_path, summary=True)
     
-    print("\n" + "="*70)
-    print("✨ ALPR SYSTEM - TERMINÉ AVEC SUCCÈS!")
-    print("="*70)
+    banner(log, "✨ ALPR SYSTEM - TERMINÉ AVEC SUCCÈS!")
 
 if __name__ == "__main__":
     main()
-    input("\nAppuyez sur Entrée pour quitter...")
\ No newline at end of file
+    pause_before_exit('--headless' in sys.argv[1:])
\ No newline at end of file
@@ -5,175 +5,583 @@ ALPR avec architecture modulaire - Programme principal
 
 import os
 import sys
+import time
+import atexit
+import logging
 import argparse
+import multiprocessing
+import multiprocessing.util
 
 # Ajouter le dossier src au chemin Python
 sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
 
 from io_manager import IOManager
 from detector import PlateDetector
+from detection_engines import ENGINES
 from ocr_engine import OCREngine
 from preprocessor import ImagePreprocessor
-from utils import draw_results, display_image, print_summary
+from utils import draw_results, print_summary, has_display, is_interactive, pause_before_exit
+from preview import PreviewWindow
+from video_stream import FrameReader, VideoProcessor
+from result_cache import ResultCache, config_fingerprint
+from report_sink import BatchReportSink
+from async_writer import AsyncImageWriter
+from folder_watcher import FolderWatcher, ProcessedIndex, scan_images
+from plate_store import PlateStore
+from hotlist import Hotlist, AlertSink
+import profiling
+from profiling import timed
+from log import get_logger, banner, add_logging_arguments, setup_from_args, ProgressReporter
+from constants import (PREPROCESS_PROFILE, PREPROCESS_PROFILES, PLATE_FORMATS,
+                       INPUT_DIR, WATCH_INDEX_PATH, WATCH_POLL_INTERVAL,
+                       HOTLIST_MAX_DISTANCE, HOTLIST_CONFUSION_COST,
+                       CANDIDATE_TOP_K, CANDIDATE_MIN_SCORE, DETECTION_ENGINES,
+                       DETECTION_MODE, DETECTION_MODES, OCR_BACKEND, OCR_BACKENDS,
+                       ONNX_MODEL_PATH, ONNX_INTRA_OP_THREADS, DECODE_MIN_WIDTH,
+                       DETECTION_CHAIN_CONFIDENCE, NMS_IOU_THRESHOLD, NMS_CONTAINMENT,
+                       MERGE_IOU_THRESHOLD, CORRECTOR_MAX_CHANGES,
+                       CORRECTOR_COUNTRY_PRIOR)
+
+log = get_logger('modular')
 
 class ALPRModularSystem:
     """Système ALPR modulaire"""
     
-    def __init__(self, debug=False):
+    def __init__(self, debug=False, profile=None, use_cache=True,
+                 save_annotated=True, async_output=True, hotlist=None,
+                 hotlist_distance=HOTLIST_MAX_DISTANCE, top_k=CANDIDATE_TOP_K,
+                 min_score=CANDIDATE_MIN_SCORE, engines=None,
+                 detection_mode=DETECTION_MODE, ocr_backend=OCR_BACKEND,
+                 onnx_model=None, ocr_threads=None):
         self.debug = debug
+        self.save_annotated = save_annotated
+        
+        # Fenêtre d'aperçu optionnelle (PreviewWindow), jamais bloquante
+        self.preview = None
         
-        print("="*70)
-        print("🚗 ALPR SYSTEM - Architecture Modulaire")
-        print("="*70)
+        banner(log, "🚗 ALPR SYSTEM - Architecture Modulaire")
         
         # Initialiser les composants
-        self.io = IOManager()
-        self.preprocessor = ImagePreprocessor()
-        self.detector = PlateDetector(debug=debug)
-        self.ocr = OCREngine(debug=debug)
+        self.writer = AsyncImageWriter() if async_output else None
+        self.io = IOManager(writer=self.writer)
+        self.preprocessor = ImagePreprocessor(profile)
+        self.detector = PlateDetector(debug=debug, profile=profile,
+                                      top_k=top_k, min_score=min_score,
+                                      engines=engines, mode=detection_mode)
+        self.ocr = OCREngine(debug=debug, backend=ocr_backend,
+                             model_path=onnx_model, threads=ocr_threads)
+        
+        # Cache des résultats, invalidé par tout changement de configuration
+        self.cache = None
+        if use_cache:
+            self.cache = ResultCache(config_fingerprint(
+                profile=self.detector.preprocessor.profile,
+                candidates=(top_k, min_score),
+                detection=(self.detector.engine_names, detection_mode,
+                           DETECTION_CHAIN_CONFIDENCE),
+                duplicates=(NMS_IOU_THRESHOLD, NMS_CONTAINMENT, MERGE_IOU_THRESHOLD),
+                decode_min_width=DECODE_MIN_WIDTH,
+                plate_formats=PLATE_FORMATS,
+                corrector=(CORRECTOR_MAX_CHANGES, CORRECTOR_COUNTRY_PRIOR),
+                languages=self.ocr.languages,
+                ocr=self.ocr.model_id
+            ))
+        
+        # Liste de surveillance optionnelle (fichier), alertes en JSON Lines
+        self.hotlist = None
+        self.alerts = None
+        if hotlist:
+            self.hotlist = Hotlist.load(hotlist, max_distance=hotlist_distance)
+            self.alerts = AlertSink()
+            log.info("🚨 Liste de surveillance: %d plaque(s)", len(self.hotlist))
         
-        print("✅ Tous les composants sont initialisés")
+        log.info("✅ Tous les composants sont initialisés")
     
-    def process_image(self, image_path):
-        """Traite une image complète"""
-        try:
-            # Charger l'image
-            image = self.io.load_image(image_path)
-            base_name = os.path.splitext(os.path.basename(image_path))[0]
-            
-            print(f"\n📸 Traitement: {base_name}")
-            print(f"📏 Dimensions: {image.shape[1]}x{image.shape[0]}")
+    @timed('pipeline.recognize')
+    def recognize(self, image):
+        """Détecte et lit les plaques d'une image déjà chargée"""
+        return self.recognize_batch([image])[0]
+    
+    def detect(self, image):
+        """Détecte les régions de plaque d'une image"""
+        log.debug("\n🔍 Détection des plaques...")
+        return self.detector.find_plates(image)
+    
+    def recognize_batch(self, images, regions=None):
+        """Lit les plaques de plusieurs images en un seul OCR groupé
+        
+        ``regions`` (une liste par image, issue de ``detect``) évite de
+        refaire la détection. Le résultat de chaque image est celui de
+        ``recognize``.
+        """
+        # 1. Détecter les régions de plaque
+        if regions is None:
+            regions = [self.detect(image) for image in images]
+        
+        # 2. OCR groupé sur toutes les régions de toutes les images
+        ocr_batches = iter(self.ocr.extract_text_batch(
+            [region['roi'] for plate_regions in regions for region in plate_regions]
+        ))
+        
+        return [
+            self._collect_plates(image, plate_regions,
+                                 [next(ocr_batches) for _ in plate_regions])
+            for image, plate_regions in zip(images, regions)
+        ]
+    
+    def check_hotlist(self, source, plates):
+        """Alerte pour chaque plaque proche de la liste de surveillance"""
+        alerts = []
+        if self.hotlist is None:
+            return alerts
+        
+        for plate in plates:
+            matches = self.hotlist.match(plate['text'])
+            if matches:
+                alerts.append(self.alerts.alert(source, plate, matches[0]))
+        
+        return alerts
+    
+    def _collect_plates(self, image, plate_regions, ocr_batches):
+        """Plaques d'une image à partir des résultats OCR de ses régions"""
+        all_plates = []
+        
+        for i, (region, ocr_results) in enumerate(
+                zip(plate_regions, ocr_batches), 1):
+            log.debug("\n  📋 Région %d:", i)
             
-            # 1. Détecter les régions de plaque
-            print("\n🔍 Détection des plaques...")
-            plate_regions = self.detector.find_plates(image)
+            # Traiter les résultats OCR
+            plates = self.ocr.process_plates(ocr_results)
             
-            all_plates = []
+            # Ajuster les coordonnées des bbox (ROI pleine résolution:
+            # ramenées à l'image traitée)
+            roi_scale = region.get('roi_scale', 1.0)
+            x_offset, y_offset = region.get('roi_bbox', region['bbox'])[:2]
             
-            # 2. Pour chaque région, faire l'OCR
-            for i, region in enumerate(plate_regions, 1):
-                print(f"\n  📋 Région {i}:")
-                
-                # OCR sur la ROI
-                ocr_results = self.ocr.extract_text(region['roi'])
+            for plate in plates:
+                # Convertir les coordonnées relatives en absolues
+                adjusted_bbox = []
+                for point in plate['bbox']:
+                    adjusted_bbox.append([
+                        (point[0] + x_offset) / roi_scale,
+                        (point[1] + y_offset) / roi_scale
+                    ])
                 
-                # Traiter les résultats OCR
-                plates = self.ocr.process_plates(ocr_results)
-                
-                # Ajuster les coordonnées des bbox
-                for plate in plates:
-                    # Convertir les coordonnées relatives en absolues
-                    x_offset = region['bbox'][0]
-                    y_offset = region['bbox'][1]
-                    
-                    adjusted_bbox = []
-                    for point in plate['bbox']:
-                        adjusted_bbox.append([
-                            point[0] + x_offset,
-                            point[1] + y_offset
-                        ])
-                    
-                    plate['bbox'] = adjusted_bbox
-                    all_plates.append(plate)
+                plate['bbox'] = adjusted_bbox
+                all_plates.append(plate)
+        
+        # 3. Si aucune plaque détectée, essayer OCR sur toute l'image
+        if not all_plates:
+            log.debug("\n⚠️  Aucune plaque détectée par région")
+            log.debug("🔍 Tentative OCR sur l'image complète...")
+            
+            ocr_results = self.ocr.extract_text(image)
+            all_plates = self.ocr.process_plates(ocr_results)
+        
+        # Même plaque lue dans plusieurs régions: une seule fois
+        return self.ocr.deduplicate_plates(all_plates)
+    
+    @staticmethod
+    def to_original_scale(plates, scale):
+        """Ramène les bbox des plaques d'une image décodée réduite
+        (``IOManager.decode_reduced``) à l'image d'origine"""
+        if scale != 1.0:
+            for plate in plates:
+                plate['bbox'] = [[int(round(x * scale)), int(round(y * scale))]
+                                 for x, y in plate['bbox']]
+        return plates
+    
+    @timed('pipeline.image')
+    def process_image(self, image_path, write_reports=True, summary=False):
+        """Traite une image complète
+        
+        Avec ``write_reports=False`` (mode batch), aucun rapport n'est
+        écrit pour l'image : l'appelant les regroupe. Le résumé est
+        affiché avec ``summary=True``, sinon seulement au niveau DEBUG.
+        """
+        try:
+            base_name = os.path.splitext(os.path.basename(image_path))[0]
             
-            # 3. Si aucune plaque détectée, essayer OCR sur toute l'image
-            if not all_plates:
-                print("\n⚠️  Aucune plaque détectée par région")
-                print("🔍 Tentative OCR sur l'image complète...")
+            # Fichier projeté en mémoire: hachage et décodage sans copie.
+            # Cache consulté avant tout décodage
+            cached = None
+            with self.io.map_image(image_path) as data:
+                if self.cache is not None:
+                    cache_key = self.cache.key(data)
+                    cached = self.cache.get(cache_key)
                 
-                ocr_results = self.ocr.extract_text(image)
-                all_plates = self.ocr.process_plates(ocr_results)
+                if cached is None:
+                    # JPEG très grand: décodé directement à résolution réduite,
+                    # petites plaques relues en pleine résolution
+                    image, scale = self.io.decode_reduced(data, image_path)
+                    regions = self.detector.refine_rois(
+                        self.detect(image),
+                        lambda: self.io.decode_image(data, image_path), scale
+                    )
             
-            # 4. Générer les sorties
             output_files = {}
             
-            if all_plates:
-                # Dessiner résultats
-                result_image = draw_results(image, all_plates)
+            if cached is not None:
+                log.debug("\n♻️  Résultat en cache: %s", base_name)
+                all_plates = cached['plates']
+            else:
+                log.debug("\n📸 Traitement: %s", base_name)
+                log.debug("📏 Dimensions: %dx%d (échelle %.2f)",
+                          image.shape[1], image.shape[0], scale)
                 
-                # Sauvegarder image résultat
-                output_files['result_image'] = self.io.save_result_image(
-                    result_image, base_name
-                )
+                all_plates = self.recognize_batch([image], [regions])[0]
                 
-                # Sauvegarder chaque plaque
-                for i, plate in enumerate(all_plates, 1):
-                    plate_path = self.io.save_plate_roi(
-                        image, plate['bbox'], base_name, i
-                    )
-                    plate['image_path'] = plate_path
+                # 4. Générer les sorties
+                if all_plates:
+                    # Sauvegarder chaque plaque (écriture en arrière-plan)
+                    for i, plate in enumerate(all_plates, 1):
+                        plate_path = self.io.save_plate_roi(
+                            image, plate['bbox'], base_name, i
+                        )
+                        plate['image_path'] = plate_path
+                    
+                    if self.save_annotated or self.preview is not None:
+                        # Dessiner résultats (l'image n'est plus utilisée)
+                        result_image = draw_results(image, all_plates, copy=False)
+                        
+                        # Sauvegarder image résultat
+                        if self.save_annotated:
+                            output_files['result_image'] = self.io.save_result_image(
+                                result_image, base_name
+                            )
+                        
+                        # Aperçu: dernière image seulement, sans attendre
+                        if self.preview is not None:
+                            self.preview.show(result_image)
+                
+                # Coordonnées dans l'image d'origine
+                self.to_original_scale(all_plates, scale)
                 
-                # Afficher l'image
-                display_image(result_image, "ALPR Résultat")
+                if self.cache is not None:
+                    self.cache.put(cache_key, {'plates': [
+                        {k: v for k, v in plate.items() if k != 'image_path'}
+                        for plate in all_plates
+                    ]})
+            
+            # Liste de surveillance (aussi pour un résultat en cache)
+            alerts = self.check_hotlist(image_path, all_plates)
             
             # 5. Générer rapports
-            output_files['text_report'] = self.io.generate_text_report(
-                image_path, all_plates
-            )
-            output_files['csv_report'] = self.io.generate_csv_report(
-                image_path, all_plates
-            )
+            if write_reports:
+                output_files['text_report'] = self.io.generate_text_report(
+                    image_path, all_plates
+                )
+                output_files['csv_report'] = self.io.generate_csv_report(
+                    image_path, all_plates
+                )
             
-            # 6. Afficher résumé
-            print_summary(image_path, all_plates, output_files)
+            # 6. Afficher résumé (opt-in: rien par image en batch)
+            print_summary(image_path, all_plates, output_files,
+                          level=logging.INFO if summary else logging.DEBUG)
             
             return {
                 'success': True,
                 'plates': all_plates,
-                'output_files': output_files
+                'output_files': output_files,
+                'cached': cached is not None,
+                'alerts': alerts
             }
-            
+        
         except Exception as e:
-            print(f"\n❌ Erreur lors du traitement: {e}")
+            log.error("❌ Erreur lors du traitement de %s: %s", image_path, e,
+                      extra={'fields': {'event': 'image_error', 'path': image_path}})
             return {
                 'success': False,
                 'error': str(e)
             }
-
-def process_batch(io_manager, system, folder_path):
-    """Traite toutes les images d'un dossier"""
-    print(f"\n📁 TRAITEMENT BATCH: {folder_path}")
-    print("-"*50)
     
-    images = []
-    for ext in ['.jpg', '.jpeg', '.png', '.bmp']:
-        for file in os.listdir(folder_path):
-            if file.lower().endswith(ext):
-                images.append(os.path.join(folder_path, file))
+    def flush(self):
+        """Attend la fin des écritures d'images en cours"""
+        if self.writer is not None:
+            self.writer.flush()
     
-    if not images:
-        print("❌ Aucune image trouvée")
-        return
-    
-    print(f"📸 {len(images)} image(s) trouvée(s)")
+    def close(self):
+        """Termine les écritures d'images et libère l'écrivain"""
+        if self.writer is not None:
+            self.writer.close()
+        if self.alerts is not None:
+            self.alerts.close()
     
-    results = []
-    for i, image_path in enumerate(images, 1):
-        print(f"\n[{i}/{len(images)}] {os.path.basename(image_path)}")
+    def read_regions(self, rois):
+        """OCR groupé: meilleure plaque (texte, confiance) par ROI, ou None"""
+        reads = []
+        for ocr_results in self.ocr.extract_text_batch(rois):
+            plates = self.ocr.process_plates(ocr_results)
+            reads.append((plates[0]['text'], plates[0]['confidence'])
+                         if plates else None)
         
-        result = system.process_image(image_path)
-        if result['success']:
-            results.append(result)
+        return reads
     
-    # Rapport batch
-    if results:
-        print("\n" + "="*60)
-        print("📊 RAPPORT FINAL BATCH")
-        print("="*60)
+    def process_video(self, source, max_reads=3, store=None):
+        """Traite un flux vidéo: une lecture consolidée par véhicule
         
-        total_plates = sum(len(r.get('plates', [])) for r in results)
+        Chaque lecture consolidée est enregistrée dans ``store`` si donné.
+        """
+        log.info("\n🎥 Flux vidéo: %s", source)
         
-        print(f"\n📈 STATISTIQUES:")
-        print(f"  • Images traitées: {len(results)}/{len(images)}")
-        print(f"  • Plaques détectées: {total_plates}")
+        reader = FrameReader(source).open()
+        processor = VideoProcessor(
+            self.detector, self.read_regions,
+            max_reads=max_reads, debug=self.debug,
+            on_frame=self._preview_frame if self.preview is not None else None
+        )
         
-        # Plaques uniques
-        unique_plates = set()
-        for result in results:
-            for plate in result.get('plates', []):
-                unique_plates.add(plate['text'])
+        reads = []
+        try:
+            for read in processor.run(reader):
+                reads.append(read)
+                self.check_hotlist(str(source), [read])
+                if store is not None:
+                    store.add(str(source), [read])
+                log.info("  🎯 Piste %d: %s (%.1f%%, %d/%d votes, frames %d-%d)",
+                         read['track_id'], read['text'], read['confidence'] * 100,
+                         read['votes'], read['reads'], read['first_frame'], read['last_frame'],
+                         extra={'fields': {'event': 'track', **read}})
+        finally:
+            reader.stop()
+        
+        stats = processor.stats
+        log.info("\n📈 Frames: %d lues, %d traitées, %d sautées, %d perdues\n"
+                 "📈 OCR: %d ROI lues, %d plaque(s)",
+                 stats['frames'], stats['processed'], stats['skipped'], stats['dropped'],
+                 stats['ocr_calls'], len(reads),
+                 extra={'fields': {'event': 'video_done', 'plates': len(reads), **stats}})
         
-        print(f"  • Plaques uniques: {len(unique_plates)}")
+        return reads
+    
+    def _preview_frame(self, frame, tracks):
+        """Publie une frame annotée des pistes en cours dans l'aperçu"""
+        plates = []
+        for track in tracks:
+            x1, y1, x2, y2 = track.bbox
+            read = track.vote()
+            plates.append({
+                'bbox': [[x1, y1], [x2, y1], [x2, y2], [x1, y2]],
+                'text': read['text'] if read else f"#{track.id}",
+                'confidence': read['confidence'] if read else 0.0
+            })
+        
+        # Copie: la frame appartient au lecteur
+        self.preview.show(draw_results(frame, plates))
+
+# Système ALPR propre à chaque processus worker (mode --workers)
+_worker_system = None
+
+def _init_worker(system_options, profile=False):
+    """Initialise un worker: un seul ALPRModularSystem réutilisé"""
+    global _worker_system
+    
+    if profile:
+        profiling.enable()
+    
+    # Un worker = un cœur: éviter la sur-souscription des threads
+    import cv2
+    cv2.setNumThreads(1)
+    try:
+        import torch
+        torch.set_num_threads(1)
+    except ImportError:
+        pass
+    
+    _worker_system = ALPRModularSystem(**system_options)
+    _worker_system.ocr.warmup()
+    
+    # atexit n'est pas exécuté dans un worker: vider l'écrivain à sa sortie
+    multiprocessing.util.Finalize(None, _worker_system.close, exitpriority=10)
+
+def _process_in_worker(image_path):
+    """Traite une image dans un worker (rapports écrits par le parent)"""
+    result = _worker_system.process_image(image_path, write_reports=False)
+    
+    # Temps par étape renvoyés au parent, qui les fusionne
+    if profiling.is_enabled():
+        result['profile'] = profiling.snapshot(reset_after=True)
+    
+    return image_path, result
+
+def list_folder_images(folder_path):
+    """Liste les images d'un dossier"""
+    return scan_images(folder_path)
+
+def iter_parallel(images, workers, system_options=None):
+    """Traite les images dans un pool de processus
+    
+    Les résultats sont rendus dans l'ordre de fin de traitement.
+    ``system_options`` est passé à ``ALPRModularSystem`` dans chaque worker.
+    """
+    with multiprocessing.Pool(
+            processes=workers,
+            initializer=_init_worker,
+            initargs=(system_options or {}, profiling.is_enabled())) as pool:
+        for image_path, result in pool.imap_unordered(_process_in_worker, images):
+            yield image_path, result
+        
+        # Arrêt normal (et non terminate) pour que les workers vident
+        # leurs écritures d'images en attente
+        pool.close()
+        pool.join()
+
+def process_batch(io_manager, system, folder_path, workers=1, system_options=None,
+                  report_format='csv', store=None):
+    """Traite toutes les images d'un dossier
+    
+    Avec ``workers > 1``, les images sont réparties sur un pool de
+    processus et ``system`` n'est pas utilisé. Les résultats sont écrits
+    dans un rapport unique pour tout le batch et, si ``store`` est donné
+    (PlateStore), les nouvelles lectures dans la base des plaques.
+    """
+    log.info("\n📁 TRAITEMENT BATCH: %s", folder_path)
+    
+    images = list_folder_images(folder_path)
+    
+    if not images:
+        log.error("❌ Aucune image trouvée dans %s", folder_path)
+        return None
+    
+    log.info("📸 %d image(s) trouvée(s)", len(images))
+    
+    if workers > 1:
+        log.info("⚙️  %d workers", workers)
+        outcomes = iter_parallel(images, workers, system_options)
+    else:
+        outcomes = ((path, system.process_image(path, write_reports=False))
+                    for path in images)
+    
+    processed = 0
+    cache_hits = 0
+    sink = BatchReportSink(report_format)
+    progress = ProgressReporter(len(images), log)
+    
+    try:
+        for i, (image_path, result) in enumerate(outcomes, 1):
+            if 'profile' in result:
+                profiling.merge(result.pop('profile'))
+            
+            log.debug("[%d/%d] %s (%d plaque(s))", i, len(images),
+                      os.path.basename(image_path), len(result.get('plates', [])))
+            
+            if result['success']:
+                processed += 1
+                cache_hits += bool(result.get('cached'))
+                sink.add(image_path, result['plates'])
+                
+                # Un résultat en cache est une lecture comme une autre
+                # (la base garde chaque passage, avec sa date)
+                if store is not None:
+                    store.add(image_path, result['plates'])
+            
+            progress.update()
+    finally:
+        if system is not None:
+            system.flush()
+        summary_path = sink.close({
+            'Cache (hits)': cache_hits,
+            'Cache (miss)': processed - cache_hits
+        })
+    
+    # Rapport batch
+    if processed:
+        banner(log, "📊 RAPPORT FINAL BATCH", width=60)
+        log.info(
+            "📈 STATISTIQUES:\n"
+            "  • Images traitées: %d/%d\n"
+            "  • Plaques détectées: %d\n"
+            "  • Plaques uniques: %d\n"
+            "  • Cache: %d hit(s), %d miss(es)\n"
+            "💾 Rapport: %s\n"
+            "💾 Résumé: %s",
+            processed, len(images), sink.total_plates, len(sink.unique_plates),
+            cache_hits, processed - cache_hits, sink.path, summary_path,
+            extra={'fields': {
+                'event': 'batch_done', 'images': len(images), 'processed': processed,
+                'total_plates': sink.total_plates, 'unique_plates': len(sink.unique_plates),
+                'cache_hits': cache_hits, 'report': sink.path, 'summary': summary_path,
+                'duration_s': round(time.perf_counter() - progress.start, 3),
+            }}
+        )
+    
+    return {
+        'images': len(images),
+        'processed': processed,
+        'total_plates': sink.total_plates,
+        'unique_plates': sink.unique_plates,
+        'cache_hits': cache_hits,
+        'cache_misses': processed - cache_hits,
+        'report': sink.path
+    }
+
+def watch_folder(system, folder_path, report_format='csv', move_processed=False,
+                 index_path=WATCH_INDEX_PATH, poll_interval=WATCH_POLL_INTERVAL,
+                 mark_every=100, store=None):
+    """Traite en continu les nouvelles images d'un dossier (Ctrl+C pour arrêter)
+    
+    Seuls les fichiers absents de l'index persistant, ou modifiés depuis
+    leur traitement, passent dans le pipeline. Avec ``move_processed``,
+    les images traitées sont déplacées dans ``<dossier>/processed/``.
+    """
+    index = ProcessedIndex(index_path)
+    watcher = FolderWatcher(folder_path, index, poll_interval=poll_interval)
+    sink = BatchReportSink(report_format)
+    processed_dir = os.path.join(folder_path, 'processed')
+    if move_processed:
+        os.makedirs(processed_dir, exist_ok=True)
+    
+    log.info("👀 Surveillance de %s (%s) - Ctrl+C pour arrêter", folder_path, watcher.mode)
+    
+    processed = 0
+    done = []
+    
+    def mark_done():
+        index.mark(done)
+        done.clear()
+    
+    try:
+        for batch in watcher:
+            log.info("📸 %d nouvelle(s) image(s)", len(batch))
+            
+            for path, size, mtime_ns in batch:
+                result = system.process_image(path, write_reports=False)
+                plates = result.get('plates', [])
+                
+                if result['success']:
+                    processed += 1
+                    sink.add(path, plates)
+                    if store is not None:
+                        store.add(path, plates)
+                else:
+                    log.warning("❌ Échec: %s", os.path.basename(path))
+                
+                # Les échecs sont aussi marqués: réessayés seulement si modifiés
+                done.append((path, size, mtime_ns, len(plates)))
+                if move_processed:
+                    os.replace(path, os.path.join(processed_dir, os.path.basename(path)))
+                if len(done) >= mark_every:
+                    mark_done()
+            
+            mark_done()
+            system.flush()
+            sink.flush()
+    except KeyboardInterrupt:
+        log.info("⏹️  Arrêt de la surveillance")
+    finally:
+        mark_done()
+        watcher.close()
+        index.close()
+        system.flush()
+        sink.close()
+    
+    log.info("📊 %d image(s) traitée(s), %d plaque(s) | 💾 %s",
+             processed, sink.total_plates, sink.path,
+             extra={'fields': {'event': 'watch_done', 'processed': processed,
+                               'total_plates': sink.total_plates, 'report': sink.path}})
+    
+    return {'processed': processed, 'total_plates': sink.total_plates,
+            'report': sink.path}
 
 def main():
     """Point d'entrée principal"""
@@ -183,35 +591,153 @@ def main():
     parser.add_argument('-d', '--directory', help="Dossier d'images (batch)")
     parser.add_argument('--data-input', action='store_true', 
                        help="Utiliser data/input/ par défaut")
+    parser.add_argument('--video', help="Fichier vidéo, index caméra ou URL RTSP")
+    parser.add_argument('--watch', nargs='?', const=INPUT_DIR, metavar='DOSSIER',
+                       help="Surveiller un dossier (défaut data/input/) et traiter les nouvelles images")
+    parser.add_argument('--poll-interval', type=float, default=WATCH_POLL_INTERVAL,
+                       help="Avec --watch, délai entre deux vérifications (s)")
+    parser.add_argument('--move-processed', action='store_true',
+                       help="Avec --watch, déplacer les images traitées dans processed/")
+    parser.add_argument('--preprocess', choices=sorted(PREPROCESS_PROFILES),
+                       default=PREPROCESS_PROFILE,
+                       help="Profil de pré-traitement")
+    parser.add_argument('--no-cache', action='store_true',
+                       help="Désactiver le cache des résultats")
+    parser.add_argument('--top-k', type=int, default=CANDIDATE_TOP_K,
+                       help="Régions lues par l'OCR au plus, par image (0: toutes)")
+    parser.add_argument('--min-score', type=float, default=CANDIDATE_MIN_SCORE,
+                       help="Score minimal d'une région pour l'OCR (0: toutes)")
+    parser.add_argument('--detector', nargs='+', choices=sorted(ENGINES),
+                       default=DETECTION_ENGINES, metavar='MOTEUR',
+                       help="Moteurs de détection, dans l'ordre (%s)" % ', '.join(sorted(ENGINES)))
+    parser.add_argument('--detector-mode', choices=DETECTION_MODES, default=DETECTION_MODE,
+                       help="chain: arrêt au premier moteur sûr ; all: tous les moteurs")
+    parser.add_argument('--ocr-backend', choices=OCR_BACKENDS, default=OCR_BACKEND,
+                       help="Moteur de reconnaissance (onnx: modèle exporté par export_onnx.py)")
+    parser.add_argument('--onnx-model', default=ONNX_MODEL_PATH, metavar='FICHIER',
+                       help="Modèle ONNX du recognizer (--ocr-backend onnx)")
+    parser.add_argument('--ocr-threads', type=int, default=ONNX_INTRA_OP_THREADS,
+                       help="Threads intra-opérateur ONNX Runtime (0: un par cœur)")
+    parser.add_argument('--no-db', action='store_true',
+                       help="Ne pas enregistrer les lectures dans la base des plaques")
+    parser.add_argument('--hotlist', metavar='FICHIER',
+                       help="Liste de plaques surveillées (une par ligne, motif optionnel)")
+    parser.add_argument('--hotlist-distance', type=float, default=HOTLIST_MAX_DISTANCE,
+                       help="Coût d'édition max (confusion O/0, B/8... = %.2f)" % HOTLIST_CONFUSION_COST)
+    parser.add_argument('--report-format', choices=BatchReportSink.FORMATS,
+                       default='csv',
+                       help="Format du rapport de batch")
+    parser.add_argument('--workers', type=int, default=1,
+                       help="Nombre de processus pour le mode batch")
+    parser.add_argument('--no-annotated', action='store_true',
+                       help="Ne pas produire les images annotées (débit)")
+    parser.add_argument('--sync-output', action='store_true',
+                       help="Écrire les images de sortie de façon synchrone")
+    parser.add_argument('--headless', action='store_true',
+                       help="Aucune fenêtre ni attente clavier (défaut sans écran)")
+    parser.add_argument('--preview', action='store_true',
+                       help="Aperçu des résultats dans une fenêtre (thread séparé)")
+    parser.add_argument('--preview-fps', type=float, default=10,
+                       help="Fréquence maximale de l'aperçu")
+    parser.add_argument('--profile', action='store_true',
+                       help="Afficher les temps par étape en fin d'exécution")
+    parser.add_argument('--profile-stats', metavar='FICHIER',
+                       help="Avec --profile, écrire aussi un fichier cProfile (pstats)")
     parser.add_argument('--debug', action='store_true', 
                        help="Mode debug")
+    add_logging_arguments(parser)
     
     args = parser.parse_args()
+    setup_from_args(args, debug=args.debug)
+    
+    if args.profile and not profiling.is_enabled():
+        profiling.enable(cprofile=bool(args.profile_stats))
+        atexit.register(profiling.report, args.profile_stats)
+    
+    headless = args.headless or not has_display()
+    
+    system_options = {
+        'debug': args.debug,
+        'profile': args.preprocess,
+        'use_cache': not args.no_cache,
+        'save_annotated': not args.no_annotated,
+        'async_output': not args.sync_output,
+        'hotlist': args.hotlist,
+        'hotlist_distance': args.hotlist_distance,
+        'top_k': args.top_k,
+        'min_score': args.min_score,
+        'engines': args.detector,
+        'detection_mode': args.detector_mode,
+        'ocr_backend': args.ocr_backend,
+        'onnx_model': args.onnx_model,
+        'ocr_threads': args.ocr_threads
+    }
+    
+    # Base des lectures: un seul écrivain, dans le processus principal
+    store = None
+    if not args.no_db:
+        store = PlateStore()
+        atexit.register(store.close)
+    
+    # data/input/: toutes les images, comme un dossier batch
+    if args.data_input and not args.watch and scan_images(INPUT_DIR):
+        args.data_input, args.directory = False, INPUT_DIR
+    
+    # Mode batch multi-processus: chaque worker charge son propre système
+    if args.directory and args.workers > 1:
+        if args.preview:
+            log.warning("⚠️  --preview ignoré avec --workers > 1 (images traitées "
+                        "dans les workers)")
+        process_batch(None, None, args.directory,
+                      workers=args.workers, system_options=system_options,
+                      report_format=args.report_format, store=store)
+        return
     
     # Initialiser le système
-    system = ALPRModularSystem(debug=args.debug)
+    system = ALPRModularSystem(**system_options)
     io_manager = system.io
     
+    # Aperçu: demandé explicitement, ou pour une image seule avec écran
+    if not headless and (args.preview or not (args.directory or args.video or args.watch)):
+        system.preview = PreviewWindow(max_fps=args.preview_fps)
+        system.preview.start()
+        # Fermée à la sortie, quel que soit le mode (ou l'erreur)
+        atexit.register(system.preview.stop)
+    
     # Déterminer le chemin de l'image
     image_path = None
     
-    if args.data_input:
-        # Utiliser data/input/
-        images = io_manager.list_input_images()
-        if images:
-            image_path = images[0]
-            print(f"📸 Utilisation de: {os.path.basename(image_path)}")
-        else:
-            print("⚠️  Aucune image dans data/input/, création d'une image test...")
-            image_path = io_manager.create_test_image()
+    if args.watch:
+        # Mode surveillance continue
+        watch_folder(system, args.watch, report_format=args.report_format,
+                     move_processed=args.move_processed,
+                     poll_interval=args.poll_interval, store=store)
+        system.close()
+        return
+    
+    elif args.data_input:
+        # data/input/ vide: image de test
+        log.warning("⚠️  Aucune image dans data/input/, création d'une image test...")
+        image_path = io_manager.create_test_image()
     
     elif args.input:
         # Chemin spécifique
         image_path = args.input
     
+    elif args.video:
+        # Mode flux vidéo
+        system.process_video(args.video, store=store)
+        return
+    
     elif args.directory:
         # Mode batch
-        process_batch(io_manager, system, args.directory)
+        process_batch(io_manager, system, args.directory,
+                      report_format=args.report_format, store=store)
+        return
+    
+    elif not is_interactive():
+        # Sans terminal, pas de menu: rien ne doit attendre une saisie
+        parser.print_help()
         return
     
     else:
@@ -232,7 +758,7 @@ def main():
             return
         elif choice == '3':
             folder = input("Chemin du dossier: ").strip()
-            process_batch(io_manager, system, folder)
+            process_batch(io_manager, system, folder, store=store)
             return
         elif choice == '4':
             return
@@ -242,15 +768,17 @@ def main():
     
     # Traiter l'image
     if image_path:
-        result = system.process_image(image_path)
+        result = system.process_image(image_path, summary=True)
+        system.close()
+        
+        if store is not None and result['success']:
+            store.add(image_path, result['plates'])
         
         if result['success']:
-            print("\n" + "="*70)
-            print("✨ ALPR SYSTEM - TERMINÉ AVEC SUCCÈS!")
-            print("="*70)
+            banner(log, "✨ ALPR SYSTEM - TERMINÉ AVEC SUCCÈS!")
         else:
-            print("\n❌ Le traitement a échoué")
+            log.error("❌ Le traitement a échoué")
 
 if __name__ == "__main__":
     main()
-    input("\nAppuyez sur Entrée pour quitter...")
\ No newline at end of file
+    pause_before_exit('--headless' in sys.argv[1:])
\ No newline at end of file
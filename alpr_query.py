@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Interrogation de la base des lectures de plaques (data/plates.sqlite3)
+
+Usage:
+    python alpr_query.py AB-123-CD                      # où / quand
+    python alpr_query.py AB-123-CD --since 2024-05-01 --limit 20
+    python alpr_query.py AB-128-CD --fuzzy 1            # plaques proches
+    python alpr_query.py --stats
+"""
+
+import os
+import sys
+import json
+import argparse
+from datetime import datetime
+
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from plate_store import PlateStore
+from constants import PLATE_DB_PATH, PLATE_DB_MAX_DISTANCE
+
+def parse_date(value):
+    """Date ISO (2024-05-01 ou 2024-05-01T08:30) -> timestamp"""
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Date invalide: {value}")
+
+def format_time(timestamp):
+    return datetime.fromtimestamp(timestamp).strftime('%Y-%m-%d %H:%M:%S')
+
+def main():
+    parser = argparse.ArgumentParser(description="Recherche dans la base des plaques")
+    parser.add_argument('plate', nargs='?', help="Plaque recherchée (AB-123-CD)")
+    parser.add_argument('--fuzzy', type=int, nargs='?', const=1, metavar='N',
+                        help=f"Recherche floue, distance d'édition <= N "
+                             f"(max {PLATE_DB_MAX_DISTANCE})")
+    parser.add_argument('--since', type=parse_date, help="Depuis (date ISO)")
+    parser.add_argument('--until', type=parse_date, help="Jusqu'à (date ISO)")
+    parser.add_argument('--limit', type=int, default=50)
+    parser.add_argument('--stats', action='store_true', help="Taille de la base")
+    parser.add_argument('--json', action='store_true', help="Sortie JSON")
+    parser.add_argument('--db', default=PLATE_DB_PATH, help="Fichier de la base")
+    args = parser.parse_args()
+    
+    if not args.plate and not args.stats:
+        parser.error("plaque ou --stats requis")
+    
+    if not os.path.exists(args.db):
+        print(f"❌ Base introuvable: {args.db}")
+        return 1
+    
+    with PlateStore(args.db, readonly=True) as store:
+        if args.stats:
+            result = store.stats()
+            if not args.json:
+                print(f"📊 {result['reads']} lecture(s), {result['plates']} plaque(s) distincte(s)")
+        
+        elif args.fuzzy is not None:
+            try:
+                result = store.fuzzy(args.plate, args.fuzzy, args.limit)
+            except ValueError as e:
+                parser.error(str(e))
+            
+            if not args.json:
+                print(f"🔍 {len(result)} plaque(s) à distance <= {args.fuzzy} de {args.plate}")
+                for match in result:
+                    print(f"  {match['plate']:12s} d={match['distance']}  "
+                          f"{match['reads']:>6} lecture(s)  "
+                          f"{format_time(match['first_seen'])} → {format_time(match['last_seen'])}")
+        
+        else:
+            result = store.sightings(args.plate, args.since, args.until, args.limit)
+            if not args.json:
+                print(f"🔍 {args.plate}: {len(result)} lecture(s)")
+                for read in result:
+                    print(f"  {format_time(read['seen_at'])}  {read['confidence']:6.1%}  "
+                          f"{read['source']}  [{read['x1']}, {read['y1']}, "
+                          f"{read['x2']}, {read['y2']}]")
+    
+    if args.json:
+        print(json.dumps(result, ensure_ascii=False, indent=2))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+Service HTTP ALPR (processus longue durée)
+
+Le modèle OCR est chargé une seule fois. Les requêtes concurrentes sont
+regroupées (micro-batching) pour que l'OCR lise les régions de plusieurs
+images en un seul appel ; la file est bornée et le service répond 503
+quand elle est pleine.
+
+Usage:
+    python alpr_service.py --port 8080
+    curl --data-binary @image.jpg http://127.0.0.1:8080/recognize
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from alpr_modular import ALPRModularSystem
+from detector import PlateDetector
+from micro_batcher import MicroBatcher, QueueFullError
+from result_cache import json_default
+from plate_store import PlateStore
+from log import get_logger, add_logging_arguments, setup_from_args
+from constants import PREPROCESS_PROFILE, PREPROCESS_PROFILES
+
+log = get_logger('service')
+
+MAX_UPLOAD_BYTES = 20 * 2**20
+
+class ALPRService:
+    """Détection en parallèle, OCR groupé dans un thread unique
+    
+    Le pipeline est celui de ``ALPRModularSystem.recognize`` (même
+    détection, OCR groupé, correction et repli sur l'image complète).
+    """
+    
+    def __init__(self, system, max_batch=16, max_wait=0.01, max_queue=64,
+                 detect_workers=None, timeout=30.0, store=None):
+        self.system = system
+        self.timeout = timeout
+        # Base des lectures (PlateStore), résultats en cache compris
+        self.store = store
+        self.batcher = MicroBatcher(self._read_batch, max_batch, max_wait, max_queue)
+        
+        # Requêtes admises (détection + OCR): au-delà, 503
+        self._slots = threading.BoundedSemaphore(max_queue)
+        
+        # Un détecteur par thread de détection
+        self._local = threading.local()
+        self._detect_pool = ThreadPoolExecutor(
+            max_workers=detect_workers or os.cpu_count() or 1,
+            thread_name_prefix='alpr-detect'
+        )
+        
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.rejected = 0
+        self.errors = 0
+    
+    def start(self):
+        self.system.ocr.warmup()
+        self.batcher.start()
+        return self
+    
+    def stop(self):
+        self.batcher.stop()
+        self._detect_pool.shutdown(wait=False)
+    
+    def _detect(self, image, data, scale):
+        detector = getattr(self._local, 'detector', None)
+        if detector is None:
+            base = self.system.detector
+            detector = self._local.detector = PlateDetector(
+                profile=base.preprocessor.profile,
+                top_k=base.scorer.top_k, min_score=base.scorer.min_score,
+                engines=base.engine_names, mode=base.mode
+            )
+        return detector.refine_rois(
+            detector.find_plates(image),
+            lambda: self.system.io.decode_image(data, "upload"), scale
+        )
+    
+    def _read_batch(self, items):
+        """OCR groupé sur les régions de toutes les images du lot"""
+        images, regions = zip(*items)
+        return self.system.recognize_batch(list(images), list(regions))
+    
+    def recognize(self, data, source="upload"):
+        """Plaques d'une image encodée (JPEG/PNG): (plaques, en cache)"""
+        with self._lock:
+            self.requests += 1
+        
+        if not self._slots.acquire(blocking=False):
+            self.count_error('rejected')
+            raise QueueFullError("Service saturé")
+        
+        try:
+            cache = self.system.cache
+            
+            if cache is not None:
+                cache_key = cache.key(data)
+                cached = cache.get(cache_key)
+                if cached is not None:
+                    self._record(source, cached['plates'])
+                    return cached['plates'], True
+            
+            # Même décodage (JPEG réduit) et mêmes coordonnées que la CLI
+            image, scale = self.system.io.decode_reduced(data, "upload")
+            regions = self._detect_pool.submit(self._detect, image, data, scale).result()
+            plates = self.batcher.submit((image, regions)).result(self.timeout)
+            self.system.to_original_scale(plates, scale)
+            
+            if cache is not None:
+                cache.put(cache_key, {'plates': plates})
+            
+            self._record(source, plates)
+            return plates, False
+        finally:
+            self._slots.release()
+    
+    def _record(self, source, plates):
+        if self.store is not None:
+            self.store.add(source, plates)
+    
+    def count_error(self, counter='errors'):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+    
+    def health(self):
+        batches = self.batcher.batches
+        return {
+            'status': 'ok',
+            'requests': self.requests,
+            'errors': self.errors,
+            'pending': self.batcher.pending,
+            'batches': batches,
+            'mean_batch_size': self.batcher.items / batches if batches else 0.0,
+            'rejected': self.rejected + self.batcher.rejected,
+        }
+
+class ALPRRequestHandler(BaseHTTPRequestHandler):
+    """POST /recognize (corps = image), GET /health"""
+    
+    service = None
+    verbose = False
+    
+    def _send_json(self, status, payload, headers=None):
+        body = json.dumps(payload, default=json_default).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def do_GET(self):
+        if self.path == '/health':
+            self._send_json(200, self.service.health())
+        else:
+            self._send_json(404, {'error': 'Introuvable'})
+    
+    def do_POST(self):
+        if self.path != '/recognize':
+            self._send_json(404, {'error': 'Introuvable'})
+            return
+        
+        length = int(self.headers.get('Content-Length') or 0)
+        if length <= 0:
+            self._send_json(400, {'error': 'Corps vide (image JPEG/PNG attendue)'})
+            return
+        if length > MAX_UPLOAD_BYTES:
+            self._send_json(413, {'error': 'Image trop volumineuse'})
+            return
+        
+        data = self.rfile.read(length)
+        start = time.perf_counter()
+        
+        try:
+            plates, cached = self.service.recognize(data, self.client_address[0])
+        except QueueFullError as e:
+            self._send_json(503, {'error': str(e)}, {'Retry-After': '1'})
+            return
+        except FutureTimeout:
+            self.service.count_error()
+            self._send_json(504, {'error': 'Délai de traitement dépassé'})
+            return
+        except ValueError as e:
+            self._send_json(400, {'error': str(e)})
+            return
+        except Exception as e:
+            self.service.count_error()
+            self._send_json(500, {'error': str(e)})
+            return
+        
+        alerts = self.service.system.check_hotlist(self.client_address[0], plates)
+        
+        self._send_json(200, {
+            'plates': [{k: v for k, v in plate.items() if k != 'image_path'}
+                       for plate in plates],
+            'alerts': alerts,
+            'cached': cached,
+            'latency_ms': round((time.perf_counter() - start) * 1000, 2),
+        })
+    
+    def log_message(self, format, *args):
+        if self.verbose:
+            log.info("%s - %s", self.address_string(), format % args)
+
+def main():
+    parser = argparse.ArgumentParser(description="Service HTTP ALPR")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--max-batch', type=int, default=16,
+                        help="Images par lot OCR au maximum")
+    parser.add_argument('--max-wait-ms', type=float, default=10,
+                        help="Attente maximale pour compléter un lot")
+    parser.add_argument('--max-queue', type=int, default=64,
+                        help="Requêtes en cours au maximum (au-delà: 503)")
+    parser.add_argument('--detect-workers', type=int, default=None,
+                        help="Threads de détection (défaut: nombre de cœurs)")
+    parser.add_argument('--preprocess', choices=sorted(PREPROCESS_PROFILES),
+                        default=PREPROCESS_PROFILE)
+    parser.add_argument('--no-cache', action='store_true')
+    parser.add_argument('--hotlist', metavar='FICHIER',
+                        help="Liste de plaques surveillées")
+    parser.add_argument('--no-db', action='store_true',
+                        help="Ne pas enregistrer les lectures dans la base des plaques")
+    parser.add_argument('--verbose', action='store_true',
+                        help="Journaliser chaque requête")
+    add_logging_arguments(parser)
+    args = parser.parse_args()
+    setup_from_args(args)
+    
+    system = ALPRModularSystem(profile=args.preprocess, use_cache=not args.no_cache,
+                               save_annotated=False, async_output=False,
+                               hotlist=args.hotlist)
+    store = None if args.no_db else PlateStore()
+    service = ALPRService(system, args.max_batch, args.max_wait_ms / 1000,
+                          args.max_queue, args.detect_workers, store=store).start()
+    
+    ALPRRequestHandler.service = service
+    ALPRRequestHandler.verbose = args.verbose
+    server = ThreadingHTTPServer((args.host, args.port), ALPRRequestHandler)
+    server.daemon_threads = True
+    
+    log.info("🌐 Service ALPR: http://%s:%d/recognize", args.host, args.port)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        log.info("\n🛑 Arrêt du service")
+    finally:
+        server.server_close()
+        service.stop()
+        if store is not None:
+            store.close()
+
+if __name__ == "__main__":
+    main()
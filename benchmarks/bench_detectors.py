@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Benchmark: latence / rappel des moteurs de détection
+
+Chaque moteur tourne seul, puis tous en chaîne (arrêt au premier moteur
+sûr) et tous ensemble, sur le corpus synthétique (benchmarks/corpus.py).
+Le rappel est la part d'images où une région retenue recouvre la plaque
+(IoU >= 0.5). Avec --shading, un éclairage inégal (dégradé linéaire)
+est appliqué à chaque image.
+
+Usage:
+    python benchmarks/bench_detectors.py --images 200 [--shading]
+"""
+
+import os
+import sys
+import time
+import argparse
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import numpy as np
+
+from detector import PlateDetector
+from detection_engines import ENGINES
+from corpus import generate
+from bench_preprocess import iou
+
+def shade(image, rng, strength=0.7):
+    """Éclairage inégal: gain linéaire de 1 - strength à 1 selon une direction"""
+    h, w = image.shape[:2]
+    angle = rng.uniform(0, 2 * np.pi)
+    ys, xs = np.mgrid[0:h, 0:w].astype(np.float32)
+    ramp = xs / w * np.cos(angle) + ys / h * np.sin(angle)
+    ramp = (ramp - ramp.min()) / max(float(np.ptp(ramp)), 1e-6)
+    gain = 1 - strength + strength * ramp
+    
+    return (image * gain[..., None]).astype(np.uint8)
+
+def bench_strategy(engines, mode, samples):
+    """Retourne les métriques d'une stratégie"""
+    detector = PlateDetector(engines=engines, mode=mode)
+    latencies = []
+    detected = regions_total = 0
+    
+    for image, text, box in samples:
+        start = time.perf_counter()
+        regions = detector.find_plates(image)
+        latencies.append(time.perf_counter() - start)
+        
+        regions_total += len(regions)
+        detected += any(iou(r['bbox'], box) >= 0.5 for r in regions)
+    
+    n = len(samples)
+    ms = np.array(latencies) * 1000
+    return {
+        'mean_ms': float(ms.mean()),
+        'p95_ms': float(np.percentile(ms, 95)),
+        'recall': detected / n,
+        'regions': regions_total / n,
+        'runs': {name: s['runs'] / n for name, s in detector.stats['engines'].items()},
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark des moteurs de détection")
+    parser.add_argument('--images', type=int, default=200)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--shading', action='store_true',
+                        help="Éclairage inégal sur chaque image")
+    parser.add_argument('--chain', nargs='+', choices=sorted(ENGINES),
+                        default=['contours', 'morphology', 'mser'],
+                        help="Ordre des moteurs pour les modes chain/all")
+    args = parser.parse_args()
+    
+    rng = np.random.default_rng(args.seed)
+    samples = list(generate(args.images, args.seed))
+    if args.shading:
+        samples = [(shade(image, rng), text, box) for image, text, box in samples]
+    
+    strategies = [([name], 'chain') for name in ENGINES]
+    strategies += [(args.chain, 'chain'), (args.chain, 'all')]
+    
+    print(f"{'stratégie':>32} {'moy (ms)':>9} {'p95 (ms)':>9} {'rappel':>7} {'régions':>8}")
+    for engines, mode in strategies:
+        m = bench_strategy(engines, mode, samples)
+        label = engines[0] if len(engines) == 1 else f"{mode}: {'>'.join(engines)}"
+        print(f"{label:>32} {m['mean_ms']:>9.2f} {m['p95_ms']:>9.2f} "
+              f"{m['recall']:>7.0%} {m['regions']:>8.2f}")
+        
+        if len(engines) > 1:
+            runs = ', '.join(f"{k}={v:.0%}" for k, v in m['runs'].items())
+            print(f"{'':>32} passages: {runs}")
+
+if __name__ == "__main__":
+    main()
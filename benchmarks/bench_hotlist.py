@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Benchmark: construction et interrogation de la liste de surveillance
+
+Liste de N plaques FR aléatoires ; les requêtes sont pour moitié des
+plaques de la liste bruitées (confusions OCR, une erreur), pour moitié
+des plaques inconnues.
+
+Usage:
+    python benchmarks/bench_hotlist.py --plates 100000 --queries 20000
+"""
+
+import os
+import sys
+import time
+import argparse
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import numpy as np
+
+from hotlist import Hotlist
+from plate_corrector import LETTER_TO_DIGIT, DIGIT_TO_LETTER
+from bench_preprocess import random_plate_text
+from run_benchmarks import peak_rss_mb, summarize
+
+CONFUSIONS = {**LETTER_TO_DIGIT, **DIGIT_TO_LETTER}
+
+def add_noise(rng, text):
+    """Une confusion OCR et, une fois sur deux, une vraie erreur"""
+    chars = list(text)
+    positions = [i for i, c in enumerate(chars) if c in CONFUSIONS]
+    if positions:
+        i = positions[rng.integers(len(positions))]
+        chars[i] = CONFUSIONS[chars[i]]
+    if rng.random() < 0.5:
+        i = int(rng.integers(len(chars)))
+        chars[i] = chr(65 + rng.integers(26))
+    return ''.join(chars)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark liste de surveillance")
+    parser.add_argument('--plates', type=int, default=100000)
+    parser.add_argument('--queries', type=int, default=20000)
+    parser.add_argument('--distance', type=float, default=1.0)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    
+    rng = np.random.default_rng(args.seed)
+    plates = [random_plate_text(rng) for _ in range(args.plates)]
+    
+    rss_before = peak_rss_mb()
+    start = time.perf_counter()
+    hotlist = Hotlist(plates, max_distance=args.distance)
+    build = time.perf_counter() - start
+    
+    queries = [add_noise(rng, plates[rng.integers(len(plates))]) if i % 2 == 0
+               else random_plate_text(rng) for i in range(args.queries)]
+    
+    latencies, hits = [], 0
+    start = time.perf_counter()
+    for query in queries:
+        t = time.perf_counter()
+        hits += bool(hotlist.match(query))
+        latencies.append(time.perf_counter() - t)
+    elapsed = time.perf_counter() - start
+    
+    lat = summarize(latencies)
+    print(f"Liste: {len(hotlist)} plaques | distance {args.distance}")
+    print(f"  Construction: {build:.2f} s ({len(hotlist) / build:,.0f} plaques/s)")
+    if rss_before is not None:
+        print(f"  Pic RSS: {peak_rss_mb():.0f} Mo (avant: {rss_before:.0f} Mo)")
+    print(f"  Requêtes: {len(queries) / elapsed:,.0f}/s | p50 {lat['p50']:.3f} ms "
+          f"| p99 {lat['p99']:.3f} ms")
+    print(f"  Correspondances: {hits}/{len(queries)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Benchmark: moteurs OCR (EasyOCR / ONNX Runtime)
+
+Chaque moteur tourne dans un processus séparé: temps de démarrage
+(import + chargement du modèle), mémoire résidente ajoutée, latence par
+ROI en lots de --batch plaques (corpus.render_plate) et taux de lecture
+exacte. Un moteur indisponible (paquet ou modèle absent) est signalé.
+
+Usage:
+    python benchmarks/bench_ocr_backends.py --crops 200 --batch 8 --threads 1 4
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import importlib.util
+import subprocess
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import numpy as np
+
+from constants import OCR_BACKENDS, ONNX_MODEL_PATH
+from corpus import random_plate, render_plate
+
+REQUIRES = {'easyocr': 'easyocr', 'onnx': 'onnxruntime'}
+
+def rss_mb():
+    """Mémoire résidente actuelle (Mo), None hors Linux"""
+    try:
+        with open('/proc/self/statm') as f:
+            pages = int(f.read().split()[1])
+    except OSError:
+        return None
+    return pages * os.sysconf('SC_PAGE_SIZE') / 2**20
+
+def make_crops(n, seed):
+    """ROI de plaques à plat (texte, image)"""
+    rng = np.random.default_rng(seed)
+    crops = []
+    for _ in range(n):
+        text, country = random_plate(rng)
+        crops.append((text, render_plate(text, country, rng, height=int(rng.integers(40, 110)))))
+    return crops
+
+def measure(backend, model, threads, crops, batch):
+    """Mesures d'un moteur dans le processus courant"""
+    rss_before = rss_mb()
+    start = time.perf_counter()
+    
+    from ocr_engine import OCREngine
+    ocr = OCREngine(backend=backend, model_path=model, threads=threads)
+    ocr.warmup()
+    ocr.extract_text_batch([crops[0][1]])
+    startup = time.perf_counter() - start
+    rss_loaded = rss_mb()
+    
+    latencies, exact = [], 0
+    for i in range(0, len(crops), batch):
+        chunk = crops[i:i + batch]
+        t = time.perf_counter()
+        results = ocr.extract_text_batch([crop for _, crop in chunk])
+        latencies.append((time.perf_counter() - t) / len(chunk))
+        
+        for (text, _), reads in zip(chunk, results):
+            plates = ocr.process_plates(reads)
+            exact += any(p['text'].replace('-', '') == text.replace('-', '') for p in plates)
+    
+    ms = np.array(latencies) * 1000
+    return {
+        'startup_s': round(startup, 3),
+        'rss_model_mb': round(rss_loaded - rss_before, 1) if rss_before else None,
+        'crop_ms_mean': round(float(ms.mean()), 3),
+        'crop_ms_p95': round(float(np.percentile(ms, 95)), 3),
+        'exact_reads': round(exact / len(crops), 4),
+    }
+
+def run_isolated(backend, args, threads):
+    """Lance la mesure dans un processus neuf (démarrage et mémoire à froid)"""
+    command = [sys.executable, __file__, '--child', backend,
+               '--crops', str(args.crops), '--batch', str(args.batch),
+               '--seed', str(args.seed), '--model', args.model,
+               '--threads', str(threads)]
+    out = subprocess.run(command, capture_output=True, text=True)
+    if out.returncode:
+        raise RuntimeError(out.stderr.strip().splitlines()[-1])
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark des moteurs OCR")
+    parser.add_argument('--crops', type=int, default=200)
+    parser.add_argument('--batch', type=int, default=8)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--model', default=ONNX_MODEL_PATH, help="Modèle ONNX")
+    parser.add_argument('--threads', type=int, nargs='+', default=[0],
+                        help="Threads intra-opérateur ONNX Runtime (0: un par cœur)")
+    parser.add_argument('--backends', nargs='+', choices=OCR_BACKENDS, default=OCR_BACKENDS)
+    parser.add_argument('--child', choices=OCR_BACKENDS, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    
+    if args.child:
+        crops = make_crops(args.crops, args.seed)
+        print(json.dumps(measure(args.child, args.model, args.threads[0], crops, args.batch)))
+        return
+    
+    print(f"{'moteur':>12} {'démarrage (s)':>14} {'mémoire (Mo)':>13} "
+          f"{'ms/ROI':>8} {'p95':>8} {'lecture':>8}")
+    
+    for backend in args.backends:
+        if importlib.util.find_spec(REQUIRES[backend]) is None:
+            print(f"{backend:>12}  ⚠️  {REQUIRES[backend]} absent")
+            continue
+        if backend == 'onnx' and not os.path.exists(args.model):
+            print(f"{backend:>12}  ⚠️  modèle absent ({args.model}, voir export_onnx.py)")
+            continue
+        
+        for threads in (args.threads if backend == 'onnx' else [0]):
+            label = f"{backend}/{threads}t" if backend == 'onnx' else backend
+            try:
+                m = run_isolated(backend, args, threads)
+            except RuntimeError as e:
+                print(f"{label:>12}  ❌ {e}")
+                continue
+            
+            print(f"{label:>12} {m['startup_s']:>14.2f} {m['rss_model_mb']:>13} "
+                  f"{m['crop_ms_mean']:>8.2f} {m['crop_ms_p95']:>8.2f} "
+                  f"{m['exact_reads']:>8.0%}")
+
+if __name__ == "__main__":
+    main()
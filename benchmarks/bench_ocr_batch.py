@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Benchmark: OCR région par région vs OCR groupé (extract_text_batch)
+
+Usage:
+    python benchmarks/bench_ocr_batch.py --images 20 --plates 12
+"""
+
+import os
+import sys
+import time
+import argparse
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import cv2
+import numpy as np
+
+from detector import PlateDetector
+from ocr_engine import OCREngine
+
+def make_street_image(rng, n_plates):
+    """Image encombrée avec plusieurs plaques (façon create_test_image)"""
+    img = rng.integers(0, 60, (1080, 1920, 3), dtype=np.uint8)
+
+    for _ in range(n_plates):
+        x = int(rng.integers(0, 1920 - 260))
+        y = int(rng.integers(0, 1080 - 60))
+        text = "%s%s-%03d-%s%s" % (
+            chr(65 + rng.integers(26)), chr(65 + rng.integers(26)),
+            rng.integers(1000),
+            chr(65 + rng.integers(26)), chr(65 + rng.integers(26))
+        )
+        cv2.rectangle(img, (x, y), (x + 250, y + 55), (255, 255, 255), -1)
+        cv2.rectangle(img, (x, y), (x + 250, y + 55), (0, 0, 0), 2)
+        cv2.putText(img, text, (x + 12, y + 40),
+                    cv2.FONT_HERSHEY_SIMPLEX, 1.0, (0, 0, 0), 2)
+
+    return img
+
+def percentile(values, q):
+    return float(np.percentile(values, q)) if values else 0.0
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark OCR groupé")
+    parser.add_argument('--images', type=int, default=20)
+    parser.add_argument('--plates', type=int, default=12)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    images = [make_street_image(rng, args.plates) for _ in range(args.images)]
+
+    detector = PlateDetector()
+    ocr = OCREngine()
+
+    # Préchauffage (chargement des poids, allocations)
+    ocr.extract_text_batch([images[0][:64, :256]])
+
+    loop_times, batch_times, n_regions = [], [], []
+
+    for image in images:
+        rois = [r['roi'] for r in detector.find_plates(image)]
+        n_regions.append(len(rois))
+
+        start = time.perf_counter()
+        for roi in rois:
+            ocr.extract_text(roi)
+        loop_times.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        ocr.extract_text_batch(rois)
+        batch_times.append(time.perf_counter() - start)
+
+    print(f"Images: {len(images)} | Régions/image: {np.mean(n_regions):.1f}")
+    for name, times in (("boucle", loop_times), ("groupé", batch_times)):
+        ms = [t * 1000 for t in times]
+        print(f"  {name:7s} moyenne {np.mean(ms):8.1f} ms | "
+              f"p50 {percentile(ms, 50):8.1f} ms | p95 {percentile(ms, 95):8.1f} ms")
+
+    if sum(batch_times) > 0:
+        print(f"  Accélération: x{sum(loop_times) / sum(batch_times):.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Benchmark: latence / précision des profils de pré-traitement
+
+Jeu synthétique généré comme IOManager.create_test_image (plaque blanche
+sur fond sombre), avec bruit gaussien. La précision est le rappel de
+détection (une région recouvre la plaque, IoU >= 0.5) et, avec --ocr,
+le taux de lecture exacte du texte.
+
+Usage:
+    python benchmarks/bench_preprocess.py --images 100 [--ocr]
+"""
+
+import os
+import sys
+import time
+import argparse
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import cv2
+import numpy as np
+
+from constants import PREPROCESS_PROFILES
+from detector import PlateDetector
+
+def random_plate_text(rng):
+    """Numéro au format FR (AB-123-CD)"""
+    letters = lambda n: ''.join(chr(65 + rng.integers(26)) for _ in range(n))
+    return f"{letters(2)}-{rng.integers(1000):03d}-{letters(2)}"
+
+def make_test_image(rng, noise=12):
+    """Image 800x400 façon create_test_image, plaque placée aléatoirement"""
+    img = np.zeros((400, 800, 3), dtype=np.uint8)
+    text = random_plate_text(rng)
+    
+    x = int(rng.integers(20, 360))
+    y = int(rng.integers(20, 280))
+    box = (x, y, x + 400, y + 100)
+    
+    cv2.rectangle(img, box[:2], box[2:], (255, 255, 255), -1)
+    cv2.rectangle(img, box[:2], box[2:], (0, 0, 0), 2)
+    cv2.putText(img, text, (x + 50, y + 50),
+                cv2.FONT_HERSHEY_SIMPLEX, 1.5, (0, 0, 0), 3)
+    
+    if noise:
+        img = cv2.add(img, rng.normal(0, noise, img.shape).clip(0, 255).astype(np.uint8))
+    
+    return img, text, box
+
+def iou(a, b):
+    """IoU de deux boîtes [x1, y1, x2, y2]"""
+    ix = max(0, min(a[2], b[2]) - max(a[0], b[0]))
+    iy = max(0, min(a[3], b[3]) - max(a[1], b[1]))
+    inter = ix * iy
+    union = (a[2] - a[0]) * (a[3] - a[1]) + (b[2] - b[0]) * (b[3] - b[1]) - inter
+    return inter / union if union else 0.0
+
+def bench_profile(profile, samples, ocr=None):
+    """Retourne les métriques d'un profil"""
+    detector = PlateDetector(profile=profile)
+    latencies, stage_totals = [], {}
+    detected = read = 0
+    
+    for image, text, box in samples:
+        start = time.perf_counter()
+        regions = detector.find_plates(image)
+        latencies.append(time.perf_counter() - start)
+        
+        for stage, duration in detector.preprocessor.timings.items():
+            stage_totals[stage] = stage_totals.get(stage, 0.0) + duration
+        
+        hits = [r for r in regions if iou(r['bbox'], box) >= 0.5]
+        detected += bool(hits)
+        
+        if ocr is not None and hits:
+            texts = [t for res in ocr.extract_text_batch([r['roi'] for r in hits])
+                     for _, t, _ in res]
+            read += any(t.upper().replace(' ', '') == text for t in texts)
+    
+    n = len(samples)
+    ms = np.array(latencies) * 1000
+    return {
+        'mean_ms': float(ms.mean()),
+        'p95_ms': float(np.percentile(ms, 95)),
+        'recall': detected / n,
+        'read_rate': read / n if ocr is not None else None,
+        'stages_ms': {k: v * 1000 / n for k, v in stage_totals.items()},
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark des profils de pré-traitement")
+    parser.add_argument('--images', type=int, default=100)
+    parser.add_argument('--noise', type=float, default=12)
+    parser.add_argument('--ocr', action='store_true', help="Mesurer aussi la lecture OCR")
+    args = parser.parse_args()
+    
+    rng = np.random.default_rng(0)
+    samples = [make_test_image(rng, args.noise) for _ in range(args.images)]
+    
+    ocr = None
+    if args.ocr:
+        from ocr_engine import OCREngine
+        ocr = OCREngine()
+        ocr.warmup()
+    
+    print(f"{'profil':>10} {'moy (ms)':>9} {'p95 (ms)':>9} {'rappel':>7} {'lecture':>8}")
+    for profile in PREPROCESS_PROFILES:
+        m = bench_profile(profile, samples, ocr)
+        read_rate = f"{m['read_rate']:.0%}" if m['read_rate'] is not None else '-'
+        print(f"{profile:>10} {m['mean_ms']:>9.2f} {m['p95_ms']:>9.2f} "
+              f"{m['recall']:>7.0%} {read_rate:>8}")
+        
+        stages = ', '.join(f"{k}={v:.2f}" for k, v in m['stages_ms'].items()
+                           if not k.endswith('.total'))
+        print(f"{'':>10} étapes (ms): {stages}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Benchmark: débit du mode batch selon le nombre de workers
+
+Usage:
+    python benchmarks/bench_workers.py --images 64 --workers 1 2 4 8
+"""
+
+import os
+import io
+import sys
+import time
+import argparse
+import tempfile
+import contextlib
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import cv2
+import numpy as np
+
+from alpr_modular import ALPRModularSystem, process_batch
+from bench_ocr_batch import make_street_image
+
+def run(folder, workers):
+    """Lance un batch et retourne (durée, statistiques)"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        if workers > 1:
+            stats = process_batch(None, None, folder, workers=workers,
+                                  system_options={'use_cache': False})
+        else:
+            stats = process_batch(None, ALPRModularSystem(use_cache=False), folder)
+        elapsed = time.perf_counter() - start
+
+    return elapsed, stats
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark mode --workers")
+    parser.add_argument('--images', type=int, default=64)
+    parser.add_argument('--plates', type=int, default=3)
+    parser.add_argument('--workers', type=int, nargs='+',
+                        default=[1, 2, 4, os.cpu_count() or 1])
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+
+    with tempfile.TemporaryDirectory() as folder:
+        for i in range(args.images):
+            cv2.imwrite(os.path.join(folder, f"img_{i:05d}.jpg"),
+                        make_street_image(rng, args.plates))
+
+        baseline = None
+        print(f"{'workers':>8} {'durée (s)':>10} {'img/s':>8} {'scaling':>8} {'eff.':>6}")
+
+        for workers in sorted(set(args.workers)):
+            elapsed, stats = run(folder, workers)
+            throughput = args.images / elapsed
+            if baseline is None:
+                baseline = throughput
+
+            scaling = throughput / baseline
+            print(f"{workers:>8} {elapsed:>10.2f} {throughput:>8.2f} "
+                  f"{scaling:>7.2f}x {scaling / workers:>6.0%}"
+                  f"   ({stats['total_plates']} plaques, "
+                  f"{len(stats['unique_plates'])} uniques)")
+
+if __name__ == "__main__":
+    main()
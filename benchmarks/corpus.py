@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Générateur de corpus synthétique de plaques
+
+Reprend le dessin de ``run.alpr_demo`` (plaque blanche, bande bleue UE)
+et de ``IOManager.create_test_image``, avec des numéros aléatoires aux
+formats FR/EU, une déformation perspective, du flou, du bruit et des
+fonds variés. Chaque échantillon est (image, texte, boîte [x1, y1, x2, y2]).
+
+Usage:
+    python benchmarks/corpus.py --images 2000 --out data/bench
+"""
+
+import os
+import json
+import argparse
+
+import cv2
+import numpy as np
+
+# Lettres des bandes UE
+COUNTRY_CODES = ['F', 'D', 'B', 'NL', 'E', 'I', 'L']
+
+LETTERS = 'ABCDEFGHJKLMNPQRSTVWXYZ'  # sans I, O, U (format SIV)
+
+def _letters(rng, n):
+    return ''.join(LETTERS[i] for i in rng.integers(len(LETTERS), size=n))
+
+def _digits(rng, n):
+    return ''.join(str(d) for d in rng.integers(10, size=n))
+
+def random_plate(rng, fr_ratio=0.7):
+    """Numéro aléatoire: (texte, pays)
+    
+    FR: AB-123-CD (SIV). EU: 1-3 lettres, 1-4 chiffres, 0-2 lettres.
+    """
+    if rng.random() < fr_ratio:
+        return f"{_letters(rng, 2)}-{_digits(rng, 3)}-{_letters(rng, 2)}", 'FR'
+    
+    text = (_letters(rng, int(rng.integers(1, 4)))
+            + _digits(rng, int(rng.integers(1, 5)))
+            + _letters(rng, int(rng.integers(0, 3))))
+    return text, 'EU'
+
+def render_plate(text, country, rng, height=110):
+    """Plaque à plat (dessin de run.alpr_demo, proportions 520x110 mm)"""
+    width = int(height * 520 / 110)
+    img = np.full((height, width, 3), 255, dtype=np.uint8)
+    
+    # Légère teinte (plaques sales, jaunies)
+    img[:] = np.clip(img.astype(np.int16) - rng.integers(0, 40, 3), 0, 255)
+    
+    # Bande bleue UE
+    blue_width = height // 2
+    img[:, :blue_width] = [153, 51, 0]
+    code = 'F' if country == 'FR' else COUNTRY_CODES[int(rng.integers(1, len(COUNTRY_CODES)))]
+    cv2.putText(img, code, (blue_width // 2 - 10 * len(code), height - 15),
+                cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
+    
+    # Numéro centré dans la zone blanche
+    font_scale = height / 40
+    thickness = max(2, height // 25)
+    (tw, th), _ = cv2.getTextSize(text, cv2.FONT_HERSHEY_SIMPLEX, font_scale, thickness)
+    available = width - blue_width - 20
+    if tw > available:
+        font_scale *= available / tw
+        (tw, th), _ = cv2.getTextSize(text, cv2.FONT_HERSHEY_SIMPLEX, font_scale, thickness)
+    
+    x = blue_width + (width - blue_width - tw) // 2
+    y = (height + th) // 2
+    cv2.putText(img, text, (x, y), cv2.FONT_HERSHEY_SIMPLEX,
+                font_scale, (0, 0, 0), thickness)
+    
+    # Bordures
+    cv2.rectangle(img, (0, 0), (width - 1, height - 1), (0, 0, 0), 3)
+    
+    return img
+
+def make_background(rng, height, width):
+    """Fond aléatoire: texture bruitée, dégradé ou route"""
+    kind = rng.integers(3)
+    
+    if kind == 0:
+        # Texture (feuillage, façades)
+        small = rng.integers(0, 120, (height // 8, width // 8, 3), dtype=np.uint8)
+        return cv2.resize(small, (width, height), interpolation=cv2.INTER_LINEAR)
+    
+    if kind == 1:
+        # Dégradé vertical (ciel / parking)
+        top, bottom = rng.integers(0, 200, 3), rng.integers(0, 120, 3)
+        t = np.linspace(0, 1, height, dtype=np.float32)[:, None, None]
+        row = top * (1 - t) + bottom * t
+        return np.broadcast_to(row, (height, width, 3)).astype(np.uint8).copy()
+    
+    # Route avec marquages
+    img = np.full((height, width, 3), int(rng.integers(40, 90)), dtype=np.uint8)
+    for _ in range(int(rng.integers(2, 6))):
+        x = int(rng.integers(0, width))
+        cv2.line(img, (x, height), (x + int(rng.integers(-200, 200)), 0),
+                 (200, 200, 200), int(rng.integers(3, 10)))
+    return img
+
+def make_sample(rng, width=1280, height=720, min_plate=160, max_plate=420):
+    """Scène avec une plaque: (image, texte, boîte englobante)"""
+    img = make_background(rng, height, width)
+    text, country = random_plate(rng)
+    plate = render_plate(text, country, rng)
+    
+    # Taille et position de la plaque dans la scène
+    pw = int(rng.integers(min_plate, max_plate))
+    ph = int(pw * plate.shape[0] / plate.shape[1])
+    x = int(rng.integers(20, width - pw - 20))
+    y = int(rng.integers(20, height - ph - 20))
+    
+    # Carrosserie autour de la plaque (create_test_image)
+    body = tuple(int(c) for c in rng.integers(0, 256, 3))
+    cv2.rectangle(img, (max(0, x - pw // 4), max(0, y - ph)),
+                  (min(width - 1, x + pw + pw // 4), min(height - 1, y + 2 * ph)),
+                  body, -1)
+    
+    # Déformation perspective: coins déplacés jusqu'à 8 %
+    src = np.float32([[0, 0], [plate.shape[1], 0],
+                      [plate.shape[1], plate.shape[0]], [0, plate.shape[0]]])
+    dst = np.float32([[x, y], [x + pw, y], [x + pw, y + ph], [x, y + ph]])
+    dst += rng.uniform(-0.08, 0.08, (4, 2)).astype(np.float32) * [pw, ph]
+    
+    matrix = cv2.getPerspectiveTransform(src, dst)
+    warped = cv2.warpPerspective(plate, matrix, (width, height))
+    mask = cv2.warpPerspective(np.full(plate.shape[:2], 255, np.uint8), matrix, (width, height))
+    img[mask > 0] = warped[mask > 0]
+    
+    # Flou (mise au point ou bougé)
+    sigma = rng.uniform(0, 1.5)
+    if sigma > 0.3:
+        img = cv2.GaussianBlur(img, (0, 0), sigma)
+    if rng.random() < 0.2:
+        k = int(rng.integers(3, 8))
+        kernel = np.zeros((k, k), np.float32)
+        kernel[k // 2] = 1.0 / k
+        img = cv2.filter2D(img, -1, kernel)
+    
+    # Éclairage et bruit capteur
+    img = cv2.convertScaleAbs(img, alpha=rng.uniform(0.7, 1.2), beta=rng.uniform(-30, 30))
+    noise = rng.normal(0, rng.uniform(2, 12), img.shape)
+    img = np.clip(img + noise, 0, 255).astype(np.uint8)
+    
+    x1, y1 = dst.min(axis=0)
+    x2, y2 = dst.max(axis=0)
+    box = [int(max(0, x1)), int(max(0, y1)), int(min(width, x2)), int(min(height, y2))]
+    
+    return img, text, box
+
+def generate(n, seed=0, **kwargs):
+    """Génère ``n`` échantillons reproductibles"""
+    rng = np.random.default_rng(seed)
+    for _ in range(n):
+        yield make_sample(rng, **kwargs)
+
+def write_corpus(folder, n, seed=0, **kwargs):
+    """Écrit le corpus: images + labels.jsonl (fichier, texte, boîte)"""
+    os.makedirs(folder, exist_ok=True)
+    labels_path = os.path.join(folder, 'labels.jsonl')
+    
+    with open(labels_path, 'w', encoding='utf-8') as labels:
+        for i, (img, text, box) in enumerate(generate(n, seed, **kwargs)):
+            filename = f"plate_{i:06d}.jpg"
+            cv2.imwrite(os.path.join(folder, filename), img)
+            labels.write(json.dumps({'file': filename, 'text': text, 'bbox': box}) + '\n')
+    
+    return labels_path
+
+def load_corpus(folder):
+    """Relit un corpus écrit par ``write_corpus``"""
+    with open(os.path.join(folder, 'labels.jsonl'), encoding='utf-8') as labels:
+        for line in labels:
+            entry = json.loads(line)
+            img = cv2.imread(os.path.join(folder, entry['file']))
+            yield img, entry['text'], entry['bbox']
+
+def main():
+    parser = argparse.ArgumentParser(description="Corpus synthétique de plaques")
+    parser.add_argument('--images', type=int, default=1000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--out', default=os.path.join('data', 'bench'))
+    args = parser.parse_args()
+    
+    labels_path = write_corpus(args.out, args.images, args.seed)
+    print(f"✅ {args.images} images générées: {labels_path}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Test de charge du service HTTP (alpr_service.py)
+
+Envoie des images du corpus synthétique depuis plusieurs clients
+concurrents et mesure le débit, les latences p50/p95/p99 et les refus
+(503). La taille moyenne des lots est lue sur /health.
+
+Usage:
+    python alpr_service.py --port 8080 &
+    python benchmarks/load_test_service.py --url http://127.0.0.1:8080 \\
+        --clients 16 --requests 500
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import urllib.error
+import urllib.request
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+import numpy as np
+
+sys.path.append(os.path.dirname(__file__))
+
+from corpus import generate
+
+def post_image(url, data, timeout):
+    """Envoie une image: (statut HTTP, latence en s)"""
+    request = urllib.request.Request(
+        f"{url}/recognize", data=data, method='POST',
+        headers={'Content-Type': 'image/jpeg'}
+    )
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            response.read()
+            status = response.status
+    except urllib.error.HTTPError as e:
+        status = e.code
+    except OSError:
+        status = 0  # Connexion refusée / délai
+    return status, time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description="Test de charge du service ALPR")
+    parser.add_argument('--url', default='http://127.0.0.1:8080')
+    parser.add_argument('--clients', type=int, default=16)
+    parser.add_argument('--requests', type=int, default=500)
+    parser.add_argument('--images', type=int, default=50,
+                        help="Images distinctes (uniques: --images >= --requests)")
+    parser.add_argument('--timeout', type=float, default=60)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    
+    payloads = [cv2.imencode('.jpg', img)[1].tobytes()
+                for img, _, _ in generate(args.images, args.seed)]
+    
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.clients) as pool:
+        results = list(pool.map(
+            lambda i: post_image(args.url, payloads[i % len(payloads)], args.timeout),
+            range(args.requests)
+        ))
+    elapsed = time.perf_counter() - start
+    
+    statuses = Counter(status for status, _ in results)
+    ok_ms = np.array([t for status, t in results if status == 200]) * 1000
+    
+    report = {
+        'clients': args.clients,
+        'requests': args.requests,
+        'duration_s': round(elapsed, 3),
+        'throughput_rps': round(statuses[200] / elapsed, 3),
+        'statuses': {str(k): v for k, v in sorted(statuses.items())},
+        'latency_ms': {
+            q: round(float(np.percentile(ok_ms, int(q[1:]))), 2) if ok_ms.size else None
+            for q in ('p50', 'p95', 'p99')
+        },
+    }
+    
+    try:
+        with urllib.request.urlopen(f"{args.url}/health", timeout=5) as response:
+            report['service'] = json.load(response)
+    except OSError:
+        pass
+    
+    print(json.dumps(report, indent=2))
+
+if __name__ == "__main__":
+    main()
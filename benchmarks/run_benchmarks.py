@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+"""
+Suite de benchmarks du pipeline complet
+
+Génère un corpus synthétique (benchmarks/corpus.py) ou relit un corpus
+écrit sur disque, puis chronomètre chaque étape séparément: décodage,
+pré-traitement, détection, OCR et écriture des sorties. Le résultat est
+un JSON (débit, latences p50/p95/p99, pic de RSS, précision) à comparer
+d'un commit à l'autre avec --baseline. Avec --trace-alloc, tracemalloc
+mesure en plus le pic de mémoire allouée par image.
+
+Usage:
+    python benchmarks/run_benchmarks.py --images 500 --output bench.json
+    python benchmarks/run_benchmarks.py --corpus data/bench --baseline bench.json
+    python benchmarks/run_benchmarks.py --width 3840 --height 2160 --trace-alloc
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import tracemalloc
+import tempfile
+import subprocess
+import importlib.util
+from datetime import datetime
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import cv2
+import numpy as np
+
+from constants import (PREPROCESS_PROFILE, PREPROCESS_PROFILES, DECODE_MIN_WIDTH,
+                       CANDIDATE_TOP_K, CANDIDATE_MIN_SCORE, DETECTION_ENGINES,
+                       DETECTION_MODE, DETECTION_MODES, OCR_BACKEND, OCR_BACKENDS)
+from detection_engines import ENGINES
+from io_manager import decode_image_reduced
+from detector import PlateDetector
+from utils import draw_results
+from corpus import generate, load_corpus
+from bench_preprocess import iou
+
+STAGES = ['decode', 'preprocess', 'detect', 'ocr', 'write', 'total']
+
+def peak_rss_mb():
+    """Pic de mémoire résidente du processus (Mo), None si indisponible"""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Octets sous macOS, kilo-octets sous Linux
+    return peak / 2**20 if sys.platform == 'darwin' else peak / 2**10
+
+def git_commit():
+    """Commit courant (pour comparer les résultats)"""
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'],
+                              capture_output=True, text=True, check=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def normalize(text):
+    return text.upper().replace('-', '').replace(' ', '')
+
+def summarize(values_s):
+    """Statistiques de latence en millisecondes"""
+    ms = np.asarray(values_s, dtype=np.float64) * 1000
+    if ms.size == 0:
+        return None
+    return {
+        'mean': round(float(ms.mean()), 3),
+        'p50': round(float(np.percentile(ms, 50)), 3),
+        'p95': round(float(np.percentile(ms, 95)), 3),
+        'p99': round(float(np.percentile(ms, 99)), 3),
+    }
+
+def write_outputs(image, regions, plates, folder, index):
+    """Écriture synchrone des sorties, comme IOManager (image annotée + plaques)"""
+    for i, region in enumerate(regions):
+        x1, y1, x2, y2 = region['bbox']
+        cv2.imwrite(os.path.join(folder, f"{index}_plate_{i}.jpg"), image[y1:y2, x1:x2])
+    
+    cv2.imwrite(os.path.join(folder, f"{index}_result.jpg"), draw_results(image, plates))
+
+def run(samples, profile, ocr=None, write_dir=None, decode_min_width=DECODE_MIN_WIDTH,
+        reuse_buffers=True, trace_alloc=False, top_k=CANDIDATE_TOP_K,
+        min_score=CANDIDATE_MIN_SCORE, engines=None, detection_mode=DETECTION_MODE):
+    """Chronomètre le pipeline sur chaque échantillon"""
+    detector = PlateDetector(profile=profile, top_k=top_k, min_score=min_score,
+                             engines=engines, mode=detection_mode)
+    if not reuse_buffers:
+        detector.preprocessor.pool = None
+    timings = {stage: [] for stage in STAGES}
+    alloc_peaks = []
+    detected = read = regions_total = 0
+    n = 0
+    
+    if trace_alloc:
+        tracemalloc.start()
+    
+    wall_start = time.perf_counter()
+    
+    for index, (encoded, text, box) in enumerate(samples):
+        n += 1
+        if trace_alloc:
+            tracemalloc.reset_peak()
+            before, _ = tracemalloc.get_traced_memory()
+        start = time.perf_counter()
+        
+        image, scale = decode_image_reduced(encoded, decode_min_width)
+        t_decoded = time.perf_counter()
+        
+        regions = detector.find_plates(image)
+        t_detected = time.perf_counter()
+        preprocess = detector.preprocessor.timings.get('frame.total', 0.0)
+        
+        plates = []
+        if ocr is not None and regions:
+            for region, results in zip(regions, ocr.extract_text_batch(
+                    [r['roi'] for r in regions])):
+                x_offset, y_offset = region['bbox'][:2]
+                for plate in ocr.process_plates(results):
+                    plate['bbox'] = [[x + x_offset, y + y_offset] for x, y in plate['bbox']]
+                    plate['region'] = region
+                    plates.append(plate)
+            plates = ocr.deduplicate_plates(plates)
+        t_read = time.perf_counter()
+        
+        if write_dir is not None:
+            write_outputs(image, regions, plates, write_dir, index)
+        end = time.perf_counter()
+        
+        if trace_alloc:
+            _, peak = tracemalloc.get_traced_memory()
+            alloc_peaks.append(peak - before)
+        
+        timings['decode'].append(t_decoded - start)
+        timings['preprocess'].append(preprocess)
+        timings['detect'].append(t_detected - t_decoded - preprocess)
+        if ocr is not None:
+            timings['ocr'].append(t_read - t_detected)
+        if write_dir is not None:
+            timings['write'].append(end - t_read)
+        timings['total'].append(end - start)
+        
+        # Précision: une région recouvre la plaque, puis lecture exacte
+        # (boîtes ramenées à l'image d'origine si décodage réduit)
+        regions_total += len(regions)
+        hits = [r for r in regions
+                if iou([v * scale for v in r['bbox']], box) >= 0.5]
+        detected += bool(hits)
+        read += any(normalize(p['text']) == normalize(text)
+                    for p in plates if any(p['region'] is r for r in hits))
+    
+    wall = time.perf_counter() - wall_start
+    
+    allocations = None
+    if trace_alloc:
+        tracemalloc.stop()
+        allocations = {
+            'peak_mb_per_image': round(float(np.mean(alloc_peaks)) / 2**20, 3),
+            'max_peak_mb': round(max(alloc_peaks) / 2**20, 3),
+        }
+    
+    return {
+        'images': n,
+        'images_per_sec': round(n / wall, 3) if wall else None,
+        'latency_ms': {stage: summarize(values) for stage, values in timings.items()
+                       if values},
+        'peak_rss_mb': peak_rss_mb(),
+        'allocations': allocations,
+        'accuracy': {
+            'detection_recall': round(detected / n, 4) if n else None,
+            'read_accuracy': round(read / n, 4) if n and ocr is not None else None,
+            'regions_per_image': round(regions_total / n, 3) if n else None,
+        },
+        # Régions envoyées à l'OCR après la cascade de score
+        'ocr_calls': {
+            'candidates_per_image': round(detector.stats['candidates'] / n, 3) if n else None,
+            'unique_per_image': round(detector.stats['unique'] / n, 3) if n else None,
+            'ocr_per_image': round(detector.stats['kept'] / n, 3) if n else None,
+            'reduction': (round(1 - detector.stats['kept'] / detector.stats['candidates'], 4)
+                          if detector.stats['candidates'] else None),
+        },
+        # Passages et régions sûres par moteur de détection
+        'engines': detector.stats['engines'],
+    }
+
+def compare(result, baseline):
+    """Affiche l'écart avec un résultat précédent"""
+    def delta(new, old):
+        if new is None or old is None or not old:
+            return '-'
+        return f"{(new - old) / old:+.1%}"
+    
+    print(f"\n📊 Comparaison avec {baseline.get('commit') or 'la référence'}:")
+    print(f"  • img/s: {baseline['images_per_sec']} -> {result['images_per_sec']} "
+          f"({delta(result['images_per_sec'], baseline['images_per_sec'])})")
+    
+    for stage, stats in result['latency_ms'].items():
+        old = (baseline['latency_ms'].get(stage) or {}).get('p95')
+        print(f"  • {stage} p95 (ms): {old} -> {stats['p95']} ({delta(stats['p95'], old)})")
+    
+    for metric, value in result['accuracy'].items():
+        print(f"  • {metric}: {baseline['accuracy'].get(metric)} -> {value}")
+    
+    for metric, value in (result.get('ocr_calls') or {}).items():
+        print(f"  • {metric}: {(baseline.get('ocr_calls') or {}).get(metric)} -> {value}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks du pipeline ALPR")
+    parser.add_argument('--images', type=int, default=200,
+                        help="Taille du corpus généré")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--width', type=int, default=1280,
+                        help="Largeur des images générées")
+    parser.add_argument('--height', type=int, default=720,
+                        help="Hauteur des images générées")
+    parser.add_argument('--corpus', help="Corpus écrit par benchmarks/corpus.py")
+    parser.add_argument('--preprocess', choices=sorted(PREPROCESS_PROFILES),
+                        default=PREPROCESS_PROFILE)
+    parser.add_argument('--no-ocr', action='store_true',
+                        help="Sans OCR (détection seule)")
+    parser.add_argument('--ocr-backend', choices=OCR_BACKENDS, default=OCR_BACKEND,
+                        help="Moteur de reconnaissance")
+    parser.add_argument('--no-write', action='store_true',
+                        help="Sans écriture des sorties")
+    parser.add_argument('--decode-min-width', type=int, default=DECODE_MIN_WIDTH,
+                        help="Décodage JPEG réduit au-dessus de cette largeur (0: jamais)")
+    parser.add_argument('--no-reuse', action='store_true',
+                        help="Sans réutilisation des tampons du pré-traitement")
+    parser.add_argument('--top-k', type=int, default=CANDIDATE_TOP_K,
+                        help="Régions envoyées à l'OCR au plus (0: toutes)")
+    parser.add_argument('--min-score', type=float, default=CANDIDATE_MIN_SCORE,
+                        help="Score minimal des régions (0: toutes)")
+    parser.add_argument('--detector', nargs='+', choices=sorted(ENGINES),
+                        default=DETECTION_ENGINES, metavar='MOTEUR',
+                        help="Moteurs de détection, dans l'ordre")
+    parser.add_argument('--detector-mode', choices=DETECTION_MODES, default=DETECTION_MODE)
+    parser.add_argument('--trace-alloc', action='store_true',
+                        help="Mesurer les allocations par image (tracemalloc, plus lent)")
+    parser.add_argument('--output', help="Fichier JSON de résultat")
+    parser.add_argument('--baseline', help="JSON précédent à comparer")
+    args = parser.parse_args()
+    
+    samples = (load_corpus(args.corpus) if args.corpus else
+               generate(args.images, args.seed, width=args.width, height=args.height))
+    
+    # Images encodées en mémoire: le décodage fait partie de la mesure
+    encoded = [(cv2.imencode('.jpg', img)[1], text, box) for img, text, box in samples]
+    
+    ocr = None
+    if not args.no_ocr:
+        package = 'onnxruntime' if args.ocr_backend == 'onnx' else 'easyocr'
+        if importlib.util.find_spec(package) is None:
+            print(f"⚠️  {package} absent: benchmark sans OCR", file=sys.stderr)
+        else:
+            from ocr_engine import OCREngine
+            ocr = OCREngine(backend=args.ocr_backend)
+            ocr.warmup()
+    
+    with tempfile.TemporaryDirectory() as write_dir:
+        result = run(encoded, args.preprocess, ocr,
+                     None if args.no_write else write_dir,
+                     decode_min_width=args.decode_min_width,
+                     reuse_buffers=not args.no_reuse,
+                     trace_alloc=args.trace_alloc,
+                     top_k=args.top_k, min_score=args.min_score,
+                     engines=args.detector, detection_mode=args.detector_mode)
+    
+    result = {
+        'commit': git_commit(),
+        'date': datetime.now().isoformat(timespec='seconds'),
+        'config': {
+            'corpus': args.corpus or f"generated:{args.images}:seed={args.seed}",
+            'preprocess': args.preprocess,
+            'ocr': ocr.model_id if ocr is not None else None,
+            'write': not args.no_write,
+            'decode_min_width': args.decode_min_width,
+            'reuse_buffers': not args.no_reuse,
+            'top_k': args.top_k,
+            'min_score': args.min_score,
+            'detector': args.detector,
+            'detector_mode': args.detector_mode,
+            'python': platform.python_version(),
+            'opencv': cv2.__version__,
+            'cpus': os.cpu_count(),
+        },
+        **result
+    }
+    
+    print(json.dumps(result, indent=2))
+    
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(result, f, indent=2)
+    
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            compare(result, json.load(f))
+
+if __name__ == "__main__":
+    main()
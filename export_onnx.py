@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Export du recognizer EasyOCR au format ONNX (--ocr-backend onnx)
+
+Le modèle PyTorch du recognizer (langues OCR_LANGUAGES) est exporté avec
+un lot et une largeur dynamiques ; le jeu de caractères est écrit dans
+les métadonnées du modèle et dans ``<modèle>.charset``. Avec --check,
+les sorties ONNX Runtime sont comparées à celles de PyTorch.
+
+Usage:
+    python export_onnx.py                       # data/models/recognizer.onnx
+    python export_onnx.py --output modele.onnx --check
+"""
+
+import os
+import sys
+import argparse
+
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+import numpy as np
+
+from constants import OCR_LANGUAGES, ONNX_MODEL_PATH, ONNX_INPUT_HEIGHT
+
+def load_recognizer(languages):
+    """Recognizer PyTorch et jeu de caractères d'EasyOCR
+    
+    Sans quantification dynamique (défaut d'EasyOCR sur CPU), dont les
+    LSTM quantifiés ne s'exportent pas en ONNX.
+    """
+    import easyocr
+    
+    reader = easyocr.Reader(languages, gpu=False, quantize=False, verbose=False)
+    return reader.recognizer.eval(), reader.character
+
+def export(model, charset, output, opset=17):
+    """Écrit le modèle ONNX et son jeu de caractères"""
+    import torch
+    import onnx
+    
+    class Recognizer(torch.nn.Module):
+        """Entrée image seule (le texte ne sert qu'à l'attention, absente en CTC)"""
+        
+        def __init__(self, model):
+            super().__init__()
+            self.model = model
+        
+        def forward(self, image):
+            return self.model(image, None)
+    
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    dummy = torch.zeros(1, 1, ONNX_INPUT_HEIGHT, 256)
+    
+    with torch.no_grad():
+        torch.onnx.export(
+            Recognizer(model), dummy, output,
+            input_names=['image'], output_names=['logits'],
+            dynamic_axes={'image': {0: 'batch', 3: 'width'},
+                          'logits': {0: 'batch', 1: 'steps'}},
+            opset_version=opset
+        )
+    
+    proto = onnx.load(output)
+    entry = proto.metadata_props.add()
+    entry.key, entry.value = 'charset', charset
+    onnx.save(proto, output)
+    
+    with open(output + '.charset', 'w', encoding='utf-8') as f:
+        f.write(charset + '\n')
+
+def check(model, output, widths=(96, 256, 512)):
+    """Écart max entre PyTorch et ONNX Runtime, lot de 4 par largeur"""
+    import torch
+    from onnx_recognizer import get_session
+    
+    session = get_session(output)
+    rng = np.random.default_rng(0)
+    worst = 0.0
+    
+    for width in widths:
+        batch = rng.uniform(-1, 1, (4, 1, ONNX_INPUT_HEIGHT, width)).astype(np.float32)
+        with torch.no_grad():
+            expected = model(torch.from_numpy(batch), None).numpy()
+        actual = session.run(None, {'image': batch})[0]
+        worst = max(worst, float(np.abs(expected - actual).max()))
+    
+    return worst
+
+def main():
+    parser = argparse.ArgumentParser(description="Export du recognizer EasyOCR en ONNX")
+    parser.add_argument('--output', default=ONNX_MODEL_PATH)
+    parser.add_argument('--languages', nargs='+', default=OCR_LANGUAGES)
+    parser.add_argument('--opset', type=int, default=17)
+    parser.add_argument('--check', action='store_true',
+                        help="Comparer les sorties ONNX Runtime et PyTorch")
+    args = parser.parse_args()
+    
+    model, charset = load_recognizer(args.languages)
+    export(model, charset, args.output, args.opset)
+    print(f"✅ Recognizer exporté: {args.output} ({len(charset)} caractères)")
+    
+    if args.check:
+        print(f"🔍 Écart max PyTorch / ONNX Runtime: {check(model, args.output):.2e}")
+
+if __name__ == "__main__":
+    main()
@@ -8,6 +8,9 @@ import numpy as np
 import os
 import sys
 
+# Modules partagés (src/)
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+
 def check_requirements():
     """Vérifie si les requirements sont installés"""
     missing = []
@@ -63,10 +66,12 @@ def alpr_demo():
     """Démonstration complète ALPR avec EasyOCR"""
     print("\n🎯 Démarrage système ALPR...")
     
-    # Initialiser EasyOCR
-    import easyocr
-    reader = easyocr.Reader(['fr', 'en'], gpu=False)
-    print("✅ EasyOCR initialisé")
+    # Initialiser EasyOCR (lecteur partagé du registre)
+    from reader_pool import get_reader, warmup
+    
+    load_time = warmup(['fr', 'en'], gpu=False)
+    reader = get_reader(['fr', 'en'], gpu=False)
+    print(f"✅ EasyOCR initialisé ({load_time:.2f}s)")
     
     # Créer une image de test réaliste
     print("\n📸 Création d'une plaque française...")
@@ -129,10 +134,12 @@ def alpr_demo():
     cv2.imwrite("alpr_result.jpg", img)
     print("\n💾 Résultat: alpr_result.jpg")
     
-    # Afficher
-    cv2.imshow("ALPR - Reconnaissance de Plaque", img)
-    cv2.waitKey(3000)
-    cv2.destroyAllWindows()
+    # Afficher (seulement avec un écran)
+    from utils import has_display
+    if has_display():
+        cv2.imshow("ALPR - Reconnaissance de Plaque", img)
+        cv2.waitKey(3000)
+        cv2.destroyAllWindows()
     
     return True
 
@@ -169,4 +176,6 @@ def main():
 
 if __name__ == "__main__":
     main()
-    input("\nAppuyez sur Entrée pour quitter...")
\ No newline at end of file
+    
+    from utils import pause_before_exit
+    pause_before_exit()
\ No newline at end of file
@@ -0,0 +1,111 @@
+"""
+Écriture asynchrone des images de sortie
+"""
+
+import os
+import atexit
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+import cv2
+from profiling import timer
+from log import get_logger
+from constants import (OUTPUT_IMAGE_FORMAT, OUTPUT_JPEG_QUALITY,
+                       OUTPUT_WRITER_THREADS, OUTPUT_WRITER_QUEUE)
+
+log = get_logger('writer')
+
+class AsyncImageWriter:
+    """Encode et écrit les images dans un pool de threads
+    
+    ``submit`` rend la main immédiatement tant que moins de
+    ``max_pending`` images sont en attente, puis bloque (mémoire bornée).
+    Les écritures en attente sont terminées par ``close``, appelé aussi
+    à la sortie du programme.
+    """
+    
+    def __init__(self, max_workers=OUTPUT_WRITER_THREADS,
+                 max_pending=OUTPUT_WRITER_QUEUE,
+                 image_format=OUTPUT_IMAGE_FORMAT,
+                 jpeg_quality=OUTPUT_JPEG_QUALITY):
+        self.extension = image_format.lower().lstrip('.')
+        
+        self.params = []
+        if self.extension in ('jpg', 'jpeg'):
+            self.params = [cv2.IMWRITE_JPEG_QUALITY, int(jpeg_quality)]
+        elif self.extension == 'webp':
+            self.params = [cv2.IMWRITE_WEBP_QUALITY, int(jpeg_quality)]
+        
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix='alpr-writer'
+        )
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._lock = threading.Lock()
+        self._pending = set()
+        self.written = 0
+        self.errors = []
+        self.closed = False
+        
+        atexit.register(self.close)
+    
+    def submit(self, path, image):
+        """Met une image en file d'écriture
+        
+        L'image ne doit plus être modifiée par l'appelant.
+        """
+        self._slots.acquire()
+        try:
+            future = self._executor.submit(self._write, path, image)
+        except RuntimeError:
+            self._slots.release()
+            raise
+        
+        with self._lock:
+            self._pending.add(future)
+        future.add_done_callback(self._done)
+    
+    def _done(self, future):
+        with self._lock:
+            self._pending.discard(future)
+    
+    def _write(self, path, image):
+        """Encode puis écrit une image (thread du pool)"""
+        try:
+            with timer('io.async_write'):
+                ok, buffer = cv2.imencode(f".{self.extension}", image, self.params)
+                if not ok:
+                    raise ValueError(f"Encodage impossible: {path}")
+                
+                with open(path, 'wb') as f:
+                    f.write(buffer.tobytes())
+            
+            with self._lock:
+                self.written += 1
+        except Exception as e:
+            with self._lock:
+                self.errors.append((path, str(e)))
+        finally:
+            self._slots.release()
+    
+    def flush(self):
+        """Attend les écritures en cours (l'écrivain reste utilisable)"""
+        with self._lock:
+            pending = list(self._pending)
+        wait(pending)
+    
+    def close(self):
+        """Attend la fin de toutes les écritures"""
+        if self.closed:
+            return
+        
+        self.closed = True
+        self._executor.shutdown(wait=True)
+        atexit.unregister(self.close)
+        
+        for path, error in self.errors:
+            log.error("❌ Écriture impossible: %s (%s)", os.path.basename(path), error)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,76 @@
+"""
+Opérations vectorisées sur les boîtes [x1, y1, x2, y2]
+"""
+
+import numpy as np
+
+def _as_boxes(boxes):
+    return np.asarray(boxes, dtype=np.float32).reshape(-1, 4)
+
+def _intersections(a, b):
+    """Aires d'intersection de toutes les paires, et aires de a et b"""
+    a = a.reshape(-1, 1, 4)
+    b = b.reshape(1, -1, 4)
+    
+    ix = np.clip(np.minimum(a[..., 2], b[..., 2]) - np.maximum(a[..., 0], b[..., 0]), 0, None)
+    iy = np.clip(np.minimum(a[..., 3], b[..., 3]) - np.maximum(a[..., 1], b[..., 1]), 0, None)
+    
+    area_a = (a[..., 2] - a[..., 0]) * (a[..., 3] - a[..., 1])
+    area_b = (b[..., 2] - b[..., 0]) * (b[..., 3] - b[..., 1])
+    return ix * iy, area_a, area_b
+
+def iou_matrix(boxes_a, boxes_b):
+    """IoU de toutes les paires de boîtes [x1, y1, x2, y2]"""
+    inter, area_a, area_b = _intersections(_as_boxes(boxes_a), _as_boxes(boxes_b))
+    union = area_a + area_b - inter
+    
+    return np.where(union > 0, inter / np.maximum(union, 1e-6), 0.0)
+
+def overlap_matrix(boxes):
+    """Part de la plus petite boîte de chaque paire couverte par l'autre"""
+    inter, area_a, area_b = _intersections(_as_boxes(boxes), _as_boxes(boxes))
+    smaller = np.minimum(area_a, area_b)
+    
+    return np.where(smaller > 0, inter / np.maximum(smaller, 1e-6), 0.0)
+
+def nms(boxes, scores, iou_threshold=0.3, containment=0.8):
+    """Suppression des non-maxima
+    
+    Une boîte est supprimée si une boîte de meilleur score la recouvre
+    (IoU >= ``iou_threshold``) ou la contient en grande partie (part de
+    la plus petite >= ``containment``). Retourne (indices gardés par
+    score décroissant, {indice gardé: indices supprimés par lui}).
+    """
+    boxes = _as_boxes(boxes)
+    if not len(boxes):
+        return [], {}
+    
+    # Matrices calculées une fois pour toutes les paires
+    conflicts = ((iou_matrix(boxes, boxes) >= iou_threshold) |
+                 (overlap_matrix(boxes) >= containment))
+    
+    suppressed = np.zeros(len(boxes), dtype=bool)
+    keep, groups = [], {}
+    
+    for i in np.argsort(-np.asarray(scores, dtype=np.float32), kind='stable'):
+        if suppressed[i]:
+            continue
+        
+        members = np.flatnonzero(conflicts[i] & ~suppressed)
+        suppressed[members] = True
+        
+        keep.append(int(i))
+        groups[int(i)] = [int(j) for j in members if j != i]
+    
+    return keep, groups
+
+def union_box(boxes):
+    """Plus petite boîte contenant toutes les boîtes"""
+    boxes = _as_boxes(boxes)
+    return [int(boxes[:, 0].min()), int(boxes[:, 1].min()),
+            int(boxes[:, 2].max()), int(boxes[:, 3].max())]
+
+def polygon_box(points):
+    """Boîte englobante d'un polygone [[x, y], ...] (bbox EasyOCR)"""
+    points = np.asarray(points, dtype=np.float32).reshape(-1, 2)
+    return [*points.min(axis=0).tolist(), *points.max(axis=0).tolist()]
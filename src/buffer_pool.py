@@ -0,0 +1,52 @@
+"""
+Tampons d'image réutilisés d'une image à l'autre
+
+Les fonctions OpenCV acceptent un tableau de sortie (``dst=``) qu'elles
+réutilisent s'il a déjà la bonne taille et le bon type : en gardant la
+sortie de chaque étape pour l'appel suivant, le pipeline n'alloue plus
+rien à résolution de travail constante.
+"""
+
+import threading
+
+class BufferPool:
+    """Sortie de chaque étape conservée par clé, un jeu de tampons par thread
+    
+    Le tableau rendu par ``run`` est écrasé au prochain appel avec la
+    même clé (dans le même thread) : le copier s'il doit être gardé.
+    """
+    
+    def __init__(self):
+        self._local = threading.local()
+        self.reused = 0
+        self.allocated = 0
+    
+    def _buffers(self):
+        buffers = getattr(self._local, 'buffers', None)
+        if buffers is None:
+            buffers = self._local.buffers = {}
+        return buffers
+    
+    def run(self, key, func, image, *args, **kwargs):
+        """Appelle ``func(image, *args, dst=tampon, **kwargs)``"""
+        buffers = self._buffers()
+        dst = buffers.get(key)
+        
+        # Jamais l'entrée comme sortie (filtres non en place)
+        if dst is image:
+            dst = None
+        
+        out = func(image, *args, dst=dst, **kwargs)
+        
+        if out is dst:
+            self.reused += 1
+        elif out is not image:
+            # Nouvelle taille (ou premier appel): ce tableau devient le tampon
+            buffers[key] = out
+            self.allocated += 1
+        
+        return out
+    
+    def clear(self):
+        """Libère les tampons du thread courant"""
+        self._buffers().clear()
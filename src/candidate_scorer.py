@@ -0,0 +1,121 @@
+"""
+Score des régions candidates avant OCR
+
+Cascade de critères bon marché calculés sur la ROI ramenée à une hauteur
+fixe : contraste, densité de contours verticaux, alternances du profil
+de colonnes (traits des caractères) et nombre de blobs de la taille d'un
+caractère. Une région rejetée par un critère ne calcule pas les
+suivants ; les autres reçoivent une confiance dans [0, 1] qui sert à
+classer les candidats et à n'envoyer à l'OCR que les ``top_k`` meilleurs.
+"""
+
+import cv2
+import numpy as np
+from constants import CANDIDATE_TOP_K, CANDIDATE_MIN_SCORE
+from profiling import timed
+
+# Hauteur de travail de la ROI (px)
+SCORE_HEIGHT = 32
+
+def ramp(value, low, high):
+    """0 sous ``low``, 1 au-dessus de ``high``, linéaire entre les deux"""
+    return float(np.clip((value - low) / (high - low), 0.0, 1.0))
+
+def band(value, low, ideal_low, ideal_high, high):
+    """1 dans [ideal_low, ideal_high], décroît jusqu'à 0 en ``low`` / ``high``"""
+    if value < ideal_low:
+        return ramp(value, low, ideal_low)
+    if value > ideal_high:
+        return 1.0 - ramp(value, ideal_high, high)
+    return 1.0
+
+class CandidateScorer:
+    """Classe les régions candidates et filtre celles qui iront à l'OCR
+    
+    ``top_k`` (0: pas de limite) et ``min_score`` bornent le nombre de
+    régions conservées par image.
+    """
+    
+    # Poids des critères dans la confiance finale
+    WEIGHTS = {'contrast': 0.2, 'edges': 0.25, 'strokes': 0.3, 'blobs': 0.25}
+    
+    def __init__(self, top_k=CANDIDATE_TOP_K, min_score=CANDIDATE_MIN_SCORE):
+        self.top_k = top_k
+        self.min_score = min_score
+    
+    @staticmethod
+    def _normalize(roi):
+        """ROI en gris, hauteur ``SCORE_HEIGHT``"""
+        if roi.ndim == 3:
+            roi = cv2.cvtColor(roi, cv2.COLOR_BGR2GRAY)
+        width = max(1, int(round(roi.shape[1] * SCORE_HEIGHT / roi.shape[0])))
+        return cv2.resize(roi, (width, SCORE_HEIGHT), interpolation=cv2.INTER_AREA)
+    
+    def features(self, roi):
+        """Scores par critère (s'arrête au premier critère nul)"""
+        scores = {}
+        if roi is None or roi.size == 0 or min(roi.shape[:2]) < 4:
+            return scores
+        
+        gray = self._normalize(roi)
+        
+        # 1. Contraste: écart entre fond et caractères
+        low, high = np.percentile(gray, (5, 95))
+        scores['contrast'] = ramp(high - low, 40, 100)
+        if not scores['contrast']:
+            return scores
+        
+        # Bande centrale (caractères), sans les bords de la plaque
+        h = gray.shape[0]
+        center = gray[h // 5:h - h // 5].astype(np.int16)
+        
+        # 2. Densité de contours verticaux (gradient horizontal)
+        gradient = np.abs(np.diff(center, axis=1))
+        density = float((gradient > (high - low) / 4).mean())
+        scores['edges'] = band(density, 0.02, 0.08, 0.30, 0.5)
+        if not scores['edges']:
+            return scores
+        
+        # 3. Traits: alternances du profil de colonnes binarisé
+        threshold = (int(low) + int(high)) / 2
+        dark = center < threshold
+        profile = dark.mean(axis=0) > 0.15
+        strokes = int(np.count_nonzero(profile[1:] != profile[:-1])) // 2
+        scores['strokes'] = band(strokes / (gray.shape[1] / h), 0.5, 1.2, 3.5, 6.0)
+        if not scores['strokes']:
+            return scores
+        
+        # 4. Blobs de la taille d'un caractère
+        binary = (gray < threshold).astype(np.uint8)
+        count, _, stats, _ = cv2.connectedComponentsWithStats(binary, connectivity=8)
+        widths, heights = stats[1:, cv2.CC_STAT_WIDTH], stats[1:, cv2.CC_STAT_HEIGHT]
+        chars = int(np.count_nonzero((heights >= 0.35 * h) & (heights <= 0.95 * h) &
+                                     (widths >= 2) & (widths <= 0.8 * h)))
+        scores['blobs'] = band(chars, 1, 4, 10, 16)
+        
+        return scores
+    
+    def score(self, roi):
+        """Confiance dans [0, 1] (0 si un critère rejette la ROI)"""
+        scores = self.features(roi)
+        if len(scores) < len(self.WEIGHTS) or not all(scores.values()):
+            return 0.0
+        return sum(self.WEIGHTS[name] * value for name, value in scores.items())
+    
+    @timed('detect.score')
+    def score_regions(self, regions):
+        """Renseigne la confiance de chaque région"""
+        for region in regions:
+            region['confidence'] = round(self.score(region['roi']), 4)
+        return regions
+    
+    def select(self, regions):
+        """Régions déjà notées, triées et filtrées (seuil et ``top_k``)"""
+        ranked = sorted((r for r in regions if r['confidence'] >= self.min_score),
+                        key=lambda r: r['confidence'], reverse=True)
+        
+        return ranked[:self.top_k] if self.top_k else ranked
+    
+    def rank(self, regions):
+        """Régions triées par confiance, filtrées (seuil et ``top_k``)"""
+        return self.select(self.score_regions(regions))
@@ -11,16 +11,102 @@ INPUT_DIR = os.path.join(DATA_DIR, 'input')
 OUTPUT_DIR = os.path.join(DATA_DIR, 'output')
 RESULTS_DIR = os.path.join(OUTPUT_DIR, 'results')
 REPORTS_DIR = os.path.join(OUTPUT_DIR, 'reports')
+CACHE_DIR = os.path.join(DATA_DIR, 'cache')
+
+# Images d'entrée
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp')
+
+# Surveillance de dossier (--watch)
+WATCH_INDEX_PATH = os.path.join(DATA_DIR, 'watch_index.sqlite3')
+WATCH_POLL_INTERVAL = 1.0         # s, attente entre deux vérifications
+WATCH_FULL_SCAN_INTERVAL = 300.0  # s, relecture complète (fichiers modifiés)
+WATCH_SETTLE_SECONDS = 1.0        # s, fichier considéré complet (polling)
+
+# Base des lectures de plaques (alpr_query.py)
+PLATE_DB_PATH = os.path.join(DATA_DIR, 'plates.sqlite3')
+PLATE_DB_BATCH = 500            # lectures par transaction
+PLATE_DB_QUEUE = 20000          # lectures en attente avant de bloquer le pipeline
+PLATE_DB_MAX_DISTANCE = 2       # distance d'édition max de la recherche floue
+
+# Liste de surveillance (--hotlist)
+HOTLIST_MAX_DISTANCE = 1.0      # coût d'édition max d'une correspondance
+HOTLIST_CONFUSION_COST = 0.25   # substitution entre caractères confondus (O/0, B/8...)
+ALERTS_PATH = os.path.join(OUTPUT_DIR, 'alerts.jsonl')
+
+# Cache des résultats (clé: contenu de l'image + configuration)
+# À incrémenter à chaque changement des résultats de process_image
+CACHE_VERSION = 4
+CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+# Images de sortie (annotées et plaques)
+OUTPUT_IMAGE_FORMAT = 'jpg'
+OUTPUT_JPEG_QUALITY = 90
+OUTPUT_WRITER_THREADS = 2
+OUTPUT_WRITER_QUEUE = 32
+
+# Décodage JPEG réduit (1/2, 1/4, 1/8) tant que la largeur reste >= à ceci.
+# Les régions plus basses que OCR_BATCH_HEIGHT y sont relues dans l'image
+# décodée en pleine résolution ; les autres gardent la ROI réduite
+DECODE_MIN_WIDTH = 1920
 
 # Configuration OCR
 OCR_LANGUAGES = ['fr', 'en']
 OCR_GPU = False
+# Hauteur commune des ROI lors de l'OCR groupé (hauteur du recognizer EasyOCR)
+OCR_BATCH_HEIGHT = 64
+
+# Moteur de reconnaissance: easyocr (PyTorch) ou onnx (ONNX Runtime, CPU)
+OCR_BACKENDS = ('easyocr', 'onnx')
+OCR_BACKEND = 'easyocr'
+MODELS_DIR = os.path.join(DATA_DIR, 'models')
+ONNX_MODEL_PATH = os.path.join(MODELS_DIR, 'recognizer.onnx')  # export_onnx.py
+ONNX_INTRA_OP_THREADS = 0       # 0: un thread par cœur
+ONNX_INPUT_HEIGHT = OCR_BATCH_HEIGHT
+
+# Profils de pré-traitement
+# 'frame': étapes sur l'image complète (détection)
+# 'roi': étapes sur les seules régions candidates (avant OCR)
+PREPROCESS_PROFILE = 'balanced'
+PREPROCESS_PROFILES = {
+    'fast': {
+        'frame': ['resize', 'grayscale', 'contrast', ('median', {'ksize': 3})],
+        'roi': [('bilateral', {'d': 5})],
+    },
+    'balanced': {
+        'frame': ['resize', 'grayscale', 'contrast', 'bilateral', 'sharpen'],
+        'roi': [],
+    },
+    'quality': {
+        'frame': ['resize', 'grayscale', 'contrast', 'denoise', 'sharpen'],
+        'roi': [],
+    },
+}
 
 # Paramètres de détection
 MIN_PLATE_LENGTH = 6
 MAX_PLATE_LENGTH = 12
+# Caractères corrigés au plus par lecture (PlateCorrector)
+CORRECTOR_MAX_CHANGES = 2
+# Coût ajouté par rang de pays dans PLATE_FORMATS: départage à coût égal
+CORRECTOR_COUNTRY_PRIOR = 0.05
 MIN_CONFIDENCE = 0.3
 
+# Score des régions candidates avant OCR (0: pas de limite)
+CANDIDATE_TOP_K = 5
+CANDIDATE_MIN_SCORE = 0.35
+
+# Doublons de régions: suppression (NMS) puis fusion des quasi-identiques
+NMS_IOU_THRESHOLD = 0.3
+NMS_CONTAINMENT = 0.8           # part de la plus petite boîte couverte
+MERGE_IOU_THRESHOLD = 0.6
+
+# Moteurs de détection (contours, morphology, mser), dans l'ordre.
+# chain: arrêt au premier moteur sûr ; all: tous, régions fusionnées
+DETECTION_ENGINES = ['contours']
+DETECTION_MODES = ('chain', 'all')
+DETECTION_MODE = 'chain'
+DETECTION_CHAIN_CONFIDENCE = 0.6
+
 # Formats de plaques
 PLATE_FORMATS = {
     'FR': [
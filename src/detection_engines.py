@@ -0,0 +1,237 @@
+"""
+Moteurs de détection de régions de plaque
+
+Chaque moteur reçoit l'image de travail (niveaux de gris, réduite par le
+pré-traitement) et retourne les rectangles candidats [N, 4] (x, y, w, h)
+dans ses coordonnées, avec leur surface (``regions``). ``PlateDetector``
+en extrait les ROI, les note et les dédoublonne.
+"""
+
+import cv2
+import numpy as np
+
+NO_RECTS = np.empty((0, 4), dtype=np.int32)
+
+def contour_rects(contours):
+    """Rectangles englobants de tous les contours, vectorisés
+    
+    Équivalent à ``cv2.boundingRect`` appelé sur chaque contour.
+    Retourne un tableau [N, 4] (x, y, w, h).
+    """
+    lengths = np.fromiter((len(c) for c in contours), dtype=np.intp,
+                          count=len(contours))
+    points = np.concatenate(contours).reshape(-1, 2)
+    
+    starts = np.zeros(len(contours), dtype=np.intp)
+    np.cumsum(lengths[:-1], out=starts[1:])
+    
+    mins = np.minimum.reduceat(points, starts, axis=0)
+    maxs = np.maximum.reduceat(points, starts, axis=0)
+    
+    return np.concatenate((mins, maxs - mins + 1), axis=1)
+
+def plate_shaped(rects, min_ratio=3.0, max_ratio=6.0, min_area=500, max_area=50000):
+    """Masque des rectangles aux proportions d'une plaque (~4.7:1)"""
+    widths, heights = rects[:, 2], rects[:, 3]
+    areas = widths * heights
+    ratios = widths / np.maximum(heights, 1)
+    
+    return ((areas >= min_area) & (areas <= max_area) &
+            (ratios > min_ratio) & (ratios < max_ratio))
+
+class DetectionEngine:
+    """Interface d'un moteur: ``detect(gray)`` -> rectangles [N, 4]"""
+    
+    name = None
+    
+    def detect(self, gray):
+        raise NotImplementedError
+    
+    def regions(self, gray):
+        """Rectangles et surfaces des régions (w * h sans contour)"""
+        rects = self.detect(gray)
+        return rects, (rects[:, 2] * rects[:, 3]).astype(np.float64)
+
+class ContourEngine(DetectionEngine):
+    """Seuil global (Otsu) puis contours externes
+    
+    Rapide, mais un éclairage inégal fait fusionner la plaque avec son
+    entourage ou la coupe en morceaux.
+    """
+    
+    name = 'contours'
+    
+    def detect(self, gray):
+        return self.regions(gray)[0]
+    
+    def regions(self, gray):
+        """Rectangles et surfaces des contours retenus"""
+        _, thresh = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+        contours, _ = cv2.findContours(thresh, cv2.RETR_EXTERNAL,
+                                       cv2.CHAIN_APPROX_SIMPLE)
+        
+        if not contours:
+            return NO_RECTS, np.empty(0)
+        
+        # Filtrage vectorisé sur les rectangles ; la surface d'un contour
+        # ne dépasse pas celle de son rectangle
+        rects = contour_rects(contours)
+        keep, areas = [], []
+        for i in np.flatnonzero(plate_shaped(rects, max_area=np.inf)):
+            area = cv2.contourArea(contours[i])
+            if 500 <= area <= 50000:
+                keep.append(i)
+                areas.append(area)
+        
+        return rects[keep], np.array(areas)
+
+class MorphologyEngine(DetectionEngine):
+    """Top-hat / black-hat puis gradient horizontal (Sobel)
+    
+    Les deux chapeaux isolent les caractères, clairs ou sombres, plus
+    petits que le noyau quel que soit l'éclairage local ; le gradient
+    horizontal, fermé par un noyau large, relie les caractères d'une
+    même ligne en un bloc de la taille de la plaque.
+    """
+    
+    name = 'morphology'
+    
+    def detect(self, gray):
+        width = gray.shape[1]
+        
+        # Noyaux proportionnels à l'image de travail (<= 1200 px)
+        hat = cv2.getStructuringElement(cv2.MORPH_RECT,
+                                        (max(9, width // 40), max(5, width // 100)))
+        text = cv2.max(cv2.morphologyEx(gray, cv2.MORPH_BLACKHAT, hat),
+                       cv2.morphologyEx(gray, cv2.MORPH_TOPHAT, hat))
+        
+        gradient = cv2.convertScaleAbs(cv2.Sobel(text, cv2.CV_16S, 1, 0, ksize=3))
+        gradient = cv2.GaussianBlur(gradient, (5, 5), 0)
+        
+        close = cv2.getStructuringElement(cv2.MORPH_RECT,
+                                          (max(15, width // 50), max(3, width // 300)))
+        closed = cv2.morphologyEx(gradient, cv2.MORPH_CLOSE, close)
+        _, thresh = cv2.threshold(closed, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+        thresh = cv2.morphologyEx(thresh, cv2.MORPH_OPEN, None, iterations=2)
+        
+        contours, _ = cv2.findContours(thresh, cv2.RETR_EXTERNAL,
+                                       cv2.CHAIN_APPROX_SIMPLE)
+        if not contours:
+            return NO_RECTS
+        
+        rects = contour_rects(contours)
+        return rects[plate_shaped(rects, min_ratio=2.0, max_ratio=8.0)]
+
+class MSEREngine(DetectionEngine):
+    """Régions stables (MSER) groupées en lignes de caractères
+    
+    Chaque région de la forme d'un caractère est reliée à ses voisines
+    de même hauteur, alignées et proches ; un groupe d'au moins
+    ``min_chars`` caractères donne une plaque (marge autour du texte).
+    """
+    
+    name = 'mser'
+    
+    def __init__(self, min_chars=4, window=64):
+        self.min_chars = min_chars
+        self.window = window
+        self.mser = cv2.MSER_create()
+        self.mser.setDelta(5)
+        self.mser.setMinArea(30)
+        self.mser.setMaxArea(4000)
+        self.mser.setMaxVariation(0.8)
+    
+    def characters(self, gray):
+        """Rectangles [N, 4] des régions de la forme d'un caractère, triés par x"""
+        _, boxes = self.mser.detectRegions(gray)
+        if not len(boxes):
+            return NO_RECTS
+        
+        boxes = np.unique(np.asarray(boxes, dtype=np.int32).reshape(-1, 4), axis=0)
+        w, h = boxes[:, 2], boxes[:, 3]
+        keep = ((h >= 8) & (h <= gray.shape[0] // 4) &
+                (h >= 0.8 * w) & (h <= 8 * w))
+        
+        return boxes[keep]
+    
+    def _links(self, chars):
+        """Paires (i, j) de caractères voisins
+        
+        Hauteurs proches, centres alignés et écart horizontal inférieur à
+        une hauteur de caractère. Triés par x, chaque caractère n'est
+        comparé qu'aux ``window`` suivants (décalages vectorisés).
+        """
+        x, y, w, h = (chars[:, i].astype(np.float32) for i in range(4))
+        cy = y + h / 2
+        right = x + w
+        
+        links = []
+        for offset in range(1, min(self.window, len(chars) - 1) + 1):
+            i = np.arange(len(chars) - offset)
+            j = i + offset
+            mean_h = (h[i] + h[j]) / 2
+            near = ((np.abs(h[i] - h[j]) <= 0.3 * mean_h) &
+                    (np.abs(cy[i] - cy[j]) <= 0.4 * mean_h) &
+                    (x[j] - np.minimum(right[i], right[j]) <= mean_h))
+            links.append(np.stack((i[near], j[near]), axis=1))
+        
+        return np.concatenate(links) if links else np.empty((0, 2), dtype=int)
+    
+    @staticmethod
+    def _components(n, links):
+        """Étiquette de composante connexe de chaque nœud (union-find)"""
+        parent = list(range(n))
+        
+        def find(i):
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+        
+        for i, j in links.tolist():
+            parent[find(i)] = find(j)
+        
+        return np.array([find(i) for i in range(n)])
+    
+    def detect(self, gray):
+        chars = self.characters(gray)
+        if len(chars) < self.min_chars:
+            return NO_RECTS
+        
+        labels = self._components(len(chars), self._links(chars))
+        
+        rects = []
+        for label in np.unique(labels):
+            members = chars[labels == label]
+            if len(members) < self.min_chars:
+                continue
+            
+            # Les régions MSER s'imbriquent: la ligne doit aussi être
+            # assez longue pour ``min_chars`` caractères (~h/2 chacun)
+            char_h = int(np.median(members[:, 3]))
+            span = (members[:, 0] + members[:, 2]).max() - members[:, 0].min()
+            if span < self.min_chars * char_h / 2:
+                continue
+            
+            x1 = max(0, members[:, 0].min() - char_h // 2)
+            y1 = max(0, members[:, 1].min() - char_h // 3)
+            x2 = min(gray.shape[1], (members[:, 0] + members[:, 2]).max() + char_h // 2)
+            y2 = min(gray.shape[0], (members[:, 1] + members[:, 3]).max() + char_h // 3)
+            rects.append((x1, y1, x2 - x1, y2 - y1))
+        
+        if not rects:
+            return NO_RECTS
+        
+        rects = np.array(rects, dtype=np.int32)
+        return rects[plate_shaped(rects, min_ratio=2.0, max_ratio=8.0)]
+
+# Nom -> classe (``DETECTION_ENGINES``, option --detector)
+ENGINES = {engine.name: engine for engine in (ContourEngine, MorphologyEngine, MSEREngine)}
+
+def create_engines(names):
+    """Instancie les moteurs dans l'ordre donné"""
+    unknown = [name for name in names if name not in ENGINES]
+    if unknown:
+        raise ValueError(f"Moteur de détection inconnu: {', '.join(unknown)}")
+    
+    return [ENGINES[name]() for name in names]
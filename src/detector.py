@@ -2,71 +2,193 @@
 Détecteur de plaques d'immatriculation
 """
 
-import cv2
 import numpy as np
 from preprocessor import ImagePreprocessor
+from candidate_scorer import CandidateScorer
+from detection_engines import create_engines
+from boxes import iou_matrix, nms, union_box
+from constants import (CANDIDATE_TOP_K, CANDIDATE_MIN_SCORE, NMS_IOU_THRESHOLD,
+                       NMS_CONTAINMENT, MERGE_IOU_THRESHOLD, DETECTION_ENGINES,
+                       DETECTION_MODE, DETECTION_MODES, DETECTION_CHAIN_CONFIDENCE,
+                       OCR_BATCH_HEIGHT)
+from profiling import timed, timer
+from log import get_logger
+
+log = get_logger('detector')
 
 class PlateDetector:
-    """Détecte les plaques dans les images"""
+    """Détecte les plaques dans les images
+    
+    Les moteurs (``detection_engines``) tournent dans l'ordre donné: en
+    mode ``chain``, on s'arrête au premier qui trouve une région de
+    confiance >= ``DETECTION_CHAIN_CONFIDENCE`` ; en mode ``all``, tous
+    tournent et leurs régions sont dédoublonnées ensemble.
+    """
     
-    def __init__(self, debug=False):
+    def __init__(self, debug=False, profile=None, top_k=CANDIDATE_TOP_K,
+                 min_score=CANDIDATE_MIN_SCORE, engines=None, mode=DETECTION_MODE):
+        if mode not in DETECTION_MODES:
+            raise ValueError(f"Mode de détection inconnu: {mode}")
+        
         self.debug = debug
-        self.preprocessor = ImagePreprocessor()
+        self.preprocessor = ImagePreprocessor(profile)
+        self.scorer = CandidateScorer(top_k, min_score)
+        self.engines = create_engines(engines or DETECTION_ENGINES)
+        self.mode = mode
+        
+        # Régions trouvées / après doublons / retenues pour l'OCR (cumul),
+        # et passages / régions sûres par moteur
+        self.stats = {'candidates': 0, 'unique': 0, 'kept': 0,
+                      'engines': {e.name: {'runs': 0, 'hits': 0} for e in self.engines}}
         
-        if debug:
-            print("🔧 Détecteur de plaques initialisé")
+        log.debug("🔧 Détecteur de plaques initialisé (profil: %s, moteurs: %s, mode: %s)",
+                  self.preprocessor.profile, self.engine_names, self.mode)
+    
+    @property
+    def engine_names(self):
+        return [engine.name for engine in self.engines]
     
     def find_plates(self, image):
-        """Trouve les plaques dans une image"""
+        """Trouve les plaques dans une image
+        
+        La détection tourne sur l'image réduite du pré-traitement ; les
+        bbox retournées sont en coordonnées de l'image originale et les
+        ROI sont extraites à sa pleine résolution. Les régions sont
+        notées (``CandidateScorer``), dédoublonnées puis filtrées.
+        """
         # Pré-traiter l'image
         processed = self.preprocessor.preprocess_for_ocr(image)
         
-        # Détection par contours (méthode simple)
-        plates = self._detect_by_contours(processed, image)
+        # Facteurs d'échelle image réduite / image originale
+        scale = (processed.shape[1] / image.shape[1],
+                 processed.shape[0] / image.shape[0])
         
-        if self.debug:
-            print(f"  📊 {len(plates)} région(s) potentielle(s) de plaque")
+        # Moteurs de détection (chaîne ou tous), régions notées
+        candidates = []
+        for engine in self.engines:
+            regions = self._detect(engine, processed, image, scale)
+            self.scorer.score_regions(regions)
+            candidates += regions
+            
+            hits = sum(r['confidence'] >= DETECTION_CHAIN_CONFIDENCE for r in regions)
+            self.stats['engines'][engine.name]['runs'] += 1
+            self.stats['engines'][engine.name]['hits'] += hits
+            
+            if self.mode == 'chain' and hits:
+                break
+        
+        # Une seule région par plaque, puis seules les régions
+        # prometteuses vont à l'OCR
+        unique = self._merge_duplicates(candidates, image)
+        plates = self.scorer.select(unique)
+        
+        self.stats['candidates'] += len(candidates)
+        self.stats['unique'] += len(unique)
+        self.stats['kept'] += len(plates)
+        
+        log.debug("  📊 %d région(s) potentielle(s) de plaque, %d distincte(s), %d retenue(s)",
+                  len(candidates), len(unique), len(plates))
         
         return plates
     
-    def _detect_by_contours(self, processed_image, original_image):
-        """Détection par analyse de contours"""
-        plates = []
+    @staticmethod
+    def to_original(bbox, scale, shape):
+        """Convertit une bbox [x1, y1, x2, y2] de l'image réduite vers
+        l'image originale (bornée à ses dimensions)"""
+        sx, sy = scale
+        x1, y1, x2, y2 = bbox
+        return [
+            max(0, int(x1 / sx)),
+            max(0, int(y1 / sy)),
+            min(shape[1], int(np.ceil(x2 / sx))),
+            min(shape[0], int(np.ceil(y2 / sy)))
+        ]
+    
+    def refine_rois(self, regions, decode_full, scale, min_height=OCR_BATCH_HEIGHT):
+        """ROI en pleine résolution pour une image décodée réduite
         
-        # Seuillage
-        _, thresh = cv2.threshold(processed_image, 0, 255, 
-                                 cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+        L'OCR ramène chaque ROI à ``min_height`` pixels de haut : seules
+        les régions plus basses dans l'image réduite y perdent. Pour elles,
+        ``decode_full()`` (décodage complet, appelé au plus une fois) donne
+        l'image d'origine, ``scale`` fois plus grande, où la ROI est
+        ré-extraite ; ``roi_bbox`` est alors sa boîte dans cette image.
+        """
+        small = [r for r in regions if r['bbox'][3] - r['bbox'][1] < min_height]
+        if scale == 1.0 or not small:
+            return regions
         
-        # Trouver les contours
-        contours, _ = cv2.findContours(
-            thresh, 
-            cv2.RETR_EXTERNAL, 
-            cv2.CHAIN_APPROX_SIMPLE
-        )
+        full = decode_full()
+        for region in small:
+            x1, y1, x2, y2 = self.to_original(region['bbox'], (1 / scale, 1 / scale),
+                                              full.shape)
+            region['roi'] = self.preprocessor.preprocess_roi(full[y1:y2, x1:x2])
+            region['roi_bbox'] = [x1, y1, x2, y2]
+            region['roi_scale'] = scale
         
-        # Filtrer les contours
-        for contour in contours:
-            area = cv2.contourArea(contour)
-            
-            # Ignorer les trop petits/grands
-            if area < 500 or area > 50000:
-                continue
+        return regions
+    
+    @timed('detect.nms')
+    def _merge_duplicates(self, regions, image):
+        """Une région par plaque (NMS sur la confiance)
+        
+        Les doublons quasi identiques d'une région gardée (IoU >=
+        ``MERGE_IOU_THRESHOLD``) l'étendent à leur union, dont la ROI est
+        ré-extraite ; les autres régions recouvertes sont supprimées.
+        """
+        if len(regions) < 2:
+            return regions
+        
+        boxes = np.array([r['bbox'] for r in regions], dtype=np.float32)
+        keep, groups = nms(boxes, [r['confidence'] for r in regions],
+                           NMS_IOU_THRESHOLD, NMS_CONTAINMENT)
+        ious = iou_matrix(boxes, boxes)
+        
+        merged = []
+        for i in keep:
+            region = regions[i]
+            twins = [j for j in groups[i] if ious[i, j] >= MERGE_IOU_THRESHOLD]
             
-            # Rectangle englobant
-            x, y, w, h = cv2.boundingRect(contour)
+            if twins:
+                x1, y1, x2, y2 = union_box(boxes[[i, *twins]])
+                wx1, wy1, wx2, wy2 = union_box([regions[j]['work_bbox'] for j in [i, *twins]])
+                region = dict(
+                    region,
+                    bbox=[x1, y1, x2, y2],
+                    work_bbox=[wx1, wy1, wx2, wy2],
+                    roi=self.preprocessor.preprocess_roi(image[y1:y2, x1:x2]),
+                    # Surface et ratio de l'union (image de travail)
+                    aspect_ratio=(wx2 - wx1) / max(1, wy2 - wy1),
+                    area=(wx2 - wx1) * (wy2 - wy1),
+                    merged=len(twins)
+                )
+            merged.append(region)
+        
+        return merged
+    
+    def _detect(self, engine, processed_image, original_image, scale=(1.0, 1.0)):
+        """Régions candidates d'un moteur
+        
+        Les rectangles du moteur (image réduite) sont ramenés à l'image
+        originale, où la ROI est extraite en pleine résolution.
+        """
+        with timer(f"detect.{engine.name}"):
+            rects, areas = engine.regions(processed_image)
+        
+        plates = []
+        for (x, y, w, h), area in zip(rects.tolist(), areas.tolist()):
+            x1, y1, x2, y2 = self.to_original(
+                [x, y, x + w, y + h], scale, original_image.shape
+            )
+            roi = original_image[y1:y2, x1:x2]
+            roi = self.preprocessor.preprocess_roi(roi)
             
-            # Ratio typique d'une plaque (~4.7:1)
-            aspect_ratio = w / h
-            if 3.0 < aspect_ratio < 6.0:
-                # ROI (Region of Interest)
-                roi = original_image[y:y+h, x:x+w]
-                
-                plates.append({
-                    'bbox': [x, y, x + w, y + h],
-                    'roi': roi,
-                    'confidence': 0.7,  # Estimation
-                    'aspect_ratio': aspect_ratio,
-                    'area': area
-                })
-        
-        return plates
\ No newline at end of file
+            plates.append({
+                'bbox': [x1, y1, x2, y2],
+                'work_bbox': [x, y, x + w, y + h],
+                'roi': roi,
+                'aspect_ratio': w / h,
+                'area': area,
+                'engine': engine.name
+            })
+        
+        return plates
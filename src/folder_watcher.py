@@ -0,0 +1,271 @@
+"""
+Surveillance incrémentale d'un dossier d'images
+
+inotify (Linux, via ctypes) signale les fichiers terminés d'écrire ;
+ailleurs, un polling ``os.scandir`` ne relit le dossier que lorsque sa
+date de modification change et ne fait ``stat`` que sur les nouveaux
+noms. Un index SQLite (chemin, taille, mtime) garde la trace des fichiers
+déjà traités d'une exécution à l'autre.
+"""
+
+import os
+import sys
+import time
+import select
+import struct
+import sqlite3
+import threading
+import ctypes
+import ctypes.util
+from constants import (IMAGE_EXTENSIONS, WATCH_INDEX_PATH, WATCH_POLL_INTERVAL,
+                       WATCH_FULL_SCAN_INTERVAL, WATCH_SETTLE_SECONDS)
+from log import get_logger
+
+log = get_logger('watch')
+
+# inotify(7)
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_Q_OVERFLOW = 0x00004000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+_EVENT_HEADER = struct.Struct('iIII')
+
+def is_image(name):
+    return name.lower().endswith(IMAGE_EXTENSIONS)
+
+def scan_images(folder):
+    """Images d'un dossier en un seul passage ``os.scandir``"""
+    with os.scandir(folder) as entries:
+        return sorted(entry.path for entry in entries
+                      if is_image(entry.name) and entry.is_file())
+
+class ProcessedIndex:
+    """Index persistant des fichiers traités (chemin, taille, mtime)"""
+    
+    def __init__(self, path=WATCH_INDEX_PATH):
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("""
+            CREATE TABLE IF NOT EXISTS files (
+                path TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                processed_at REAL NOT NULL,
+                plates INTEGER
+            )
+        """)
+        self.db.commit()
+    
+    def unprocessed(self, entries, chunk=500):
+        """Filtre les (chemin, taille, mtime_ns) nouveaux ou modifiés"""
+        pending = []
+        for start in range(0, len(entries), chunk):
+            part = entries[start:start + chunk]
+            rows = self.db.execute(
+                f"SELECT path, size, mtime_ns FROM files WHERE path IN "
+                f"({','.join('?' * len(part))})",
+                [path for path, _, _ in part]
+            )
+            known = {path: (size, mtime) for path, size, mtime in rows}
+            pending += [e for e in part if known.get(e[0]) != (e[1], e[2])]
+        
+        return pending
+    
+    def mark(self, entries):
+        """Enregistre des fichiers traités (chemin, taille, mtime_ns, plaques)
+        
+        Une seule transaction par appel: marquer par lots.
+        """
+        now = time.time()
+        with self.db:
+            self.db.executemany(
+                "INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?)",
+                [(path, size, mtime, now, plates)
+                 for path, size, mtime, plates in entries]
+            )
+    
+    def __len__(self):
+        return self.db.execute("SELECT COUNT(*) FROM files").fetchone()[0]
+    
+    def close(self):
+        self.db.close()
+
+class _Inotify:
+    """Surveillance inotify d'un dossier (fichiers écrits ou déplacés)"""
+    
+    def __init__(self, folder):
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1")
+        
+        wd = libc.inotify_add_watch(self.fd, os.fsencode(folder),
+                                    IN_CLOSE_WRITE | IN_MOVED_TO)
+        if wd < 0:
+            err = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(err, f"inotify_add_watch: {folder}")
+    
+    def read(self, timeout):
+        """Noms de fichiers signalés, et vrai si la file a débordé"""
+        names, overflow = [], False
+        
+        if not select.select([self.fd], [], [], timeout)[0]:
+            return names, overflow
+        
+        while True:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            
+            offset = 0
+            while offset + _EVENT_HEADER.size <= len(data):
+                _, mask, _, length = _EVENT_HEADER.unpack_from(data, offset)
+                offset += _EVENT_HEADER.size
+                name = data[offset:offset + length].rstrip(b'\0')
+                offset += length
+                
+                if mask & IN_Q_OVERFLOW:
+                    overflow = True
+                elif name:
+                    names.append(os.fsdecode(name))
+        
+        return names, overflow
+    
+    def close(self):
+        os.close(self.fd)
+
+class FolderWatcher:
+    """Génère les lots de nouvelles images d'un dossier
+    
+    Chaque lot est une liste de (chemin, taille, mtime_ns) absents de
+    l'index ou modifiés depuis ; l'appelant les marque (``index.mark``)
+    une fois traités.
+    """
+    
+    def __init__(self, folder, index, poll_interval=WATCH_POLL_INTERVAL,
+                 full_scan_interval=WATCH_FULL_SCAN_INTERVAL,
+                 settle=WATCH_SETTLE_SECONDS, use_inotify=True):
+        self.folder = folder
+        self.index = index
+        self.poll_interval = poll_interval
+        self.full_scan_interval = full_scan_interval
+        self.settle = settle
+        
+        self._inotify = None
+        if use_inotify and sys.platform.startswith('linux'):
+            try:
+                self._inotify = _Inotify(folder)
+            except (OSError, AttributeError) as e:
+                log.info("inotify indisponible (%s), polling", e)
+        
+        # Dernière lecture du dossier: nom -> (taille, mtime_ns)
+        self._listing = {}
+        self._dir_mtime = None
+        self._last_full_scan = None
+        self._unsettled = set()
+        self._stop_event = threading.Event()
+    
+    @property
+    def mode(self):
+        return 'inotify' if self._inotify else 'polling'
+    
+    def stop(self):
+        self._stop_event.set()
+    
+    def close(self):
+        if self._inotify:
+            self._inotify.close()
+            self._inotify = None
+    
+    def _stat(self, name):
+        try:
+            st = os.stat(os.path.join(self.folder, name))
+        except FileNotFoundError:
+            return None
+        return st.st_size, st.st_mtime_ns
+    
+    def _scan(self, full):
+        """Relit le dossier ; ``stat`` seulement des nouveaux noms sauf si ``full``"""
+        listing = {}
+        with os.scandir(self.folder) as entries:
+            for entry in entries:
+                if not is_image(entry.name):
+                    continue
+                
+                known = None if full else self._listing.get(entry.name)
+                if known is None:
+                    try:
+                        if not entry.is_file():
+                            continue
+                        st = entry.stat()
+                    except FileNotFoundError:
+                        continue
+                    known = (st.st_size, st.st_mtime_ns)
+                listing[entry.name] = known
+        
+        changed = [name for name, stat in listing.items()
+                   if self._listing.get(name) != stat or full]
+        self._listing = listing
+        
+        if full:
+            self._last_full_scan = time.monotonic()
+        return changed
+    
+    def _changed_names(self, timeout):
+        """Noms à vérifier depuis le dernier appel"""
+        now = time.monotonic()
+        if (self._last_full_scan is None or
+                now - self._last_full_scan >= self.full_scan_interval):
+            return self._scan(full=True)
+        
+        if self._inotify:
+            names, overflow = self._inotify.read(timeout)
+            if overflow:
+                log.warning("File inotify saturée, relecture complète")
+                return self._scan(full=True)
+            return [name for name in names if is_image(name)]
+        
+        self._stop_event.wait(timeout)
+        
+        # Le dossier ne change de mtime qu'à l'ajout/suppression/renommage
+        dir_mtime = os.stat(self.folder).st_mtime_ns
+        if dir_mtime == self._dir_mtime:
+            return []
+        self._dir_mtime = dir_mtime
+        return self._scan(full=False)
+    
+    def poll(self, timeout=None):
+        """Attend au plus ``timeout`` s et retourne le lot prêt"""
+        timeout = self.poll_interval if timeout is None else timeout
+        names = set(self._changed_names(timeout)) | self._unsettled
+        self._unsettled = set()
+        
+        entries = []
+        cutoff = time.time_ns() - int(self.settle * 1e9)
+        for name in sorted(names):
+            stat = self._stat(name)
+            if stat is None:
+                continue
+            
+            # Encore en cours d'écriture (polling): revu au prochain appel
+            if not self._inotify and stat[1] > cutoff:
+                self._unsettled.add(name)
+                continue
+            
+            entries.append((os.path.join(self.folder, name), *stat))
+        
+        return self.index.unprocessed(entries) if entries else []
+    
+    def __iter__(self):
+        """Lots successifs jusqu'à ``stop()``"""
+        while not self._stop_event.is_set():
+            batch = self.poll()
+            if batch:
+                yield batch
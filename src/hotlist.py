@@ -0,0 +1,189 @@
+"""
+Liste de surveillance: correspondance floue des plaques lues
+
+Les confusions de l'OCR (O/0, I/1, B/8...) sont ramenées à un même
+caractère avant l'indexation, puis chaque plaque de la liste est indexée
+par ses variantes à k suppressions près (« symmetric delete »). Une
+lecture ne compare sa distance pondérée (confusion moins chère qu'une
+vraie erreur) qu'aux quelques candidats partageant une variante.
+"""
+
+import os
+import csv
+import json
+import threading
+from datetime import datetime
+from itertools import combinations
+from constants import HOTLIST_MAX_DISTANCE, HOTLIST_CONFUSION_COST, ALERTS_PATH
+from plate_corrector import DIGIT_TO_LETTER, LETTER_TO_DIGIT
+from plate_store import plate_key
+from log import get_logger
+
+log = get_logger('hotlist')
+
+# Caractère -> représentant de sa classe de confusion (O, Q, D -> 0 ...)
+CONFUSION_CLASS = {letter: digit for letter, digit in LETTER_TO_DIGIT.items()}
+CONFUSION_CLASS.update({letter: digit for digit, letter in DIGIT_TO_LETTER.items()})
+_FOLD = str.maketrans(CONFUSION_CLASS)
+
+def fold(key):
+    """Ramène chaque caractère confondable à sa classe (AB-123-CD -> A8123C0)"""
+    return key.translate(_FOLD)
+
+def _deletions(key, k):
+    """Variantes de ``key`` à au plus ``k`` suppressions"""
+    variants = {key}
+    for n in range(1, min(k, len(key)) + 1):
+        for positions in combinations(range(len(key)), n):
+            variants.add(''.join(c for i, c in enumerate(key) if i not in positions))
+    return variants
+
+def weighted_distance(a, b, confusion_cost=HOTLIST_CONFUSION_COST, max_cost=None):
+    """Levenshtein pondéré: une confusion OCR coûte ``confusion_cost``
+    
+    Retourne ``inf`` dès que le coût minimal d'une ligne dépasse ``max_cost``.
+    """
+    previous = [float(j) for j in range(len(b) + 1)]
+    for i, ca in enumerate(a, 1):
+        current = [float(i)]
+        for j, cb in enumerate(b, 1):
+            if ca == cb:
+                substitution = 0.0
+            elif CONFUSION_CLASS.get(ca, ca) == CONFUSION_CLASS.get(cb, cb):
+                substitution = confusion_cost
+            else:
+                substitution = 1.0
+            current.append(min(previous[j] + 1, current[j - 1] + 1,
+                               previous[j - 1] + substitution))
+        
+        if max_cost is not None and min(current) > max_cost:
+            return float('inf')
+        previous = current
+    
+    return previous[-1]
+
+class Hotlist:
+    """Index des plaques surveillées
+    
+    ``max_distance`` est le coût d'édition maximal (une vraie erreur
+    coûte 1, une confusion ``confusion_cost``) ; l'index couvre
+    ``int(max_distance)`` erreurs hors confusions.
+    """
+    
+    def __init__(self, entries=(), max_distance=HOTLIST_MAX_DISTANCE,
+                 confusion_cost=HOTLIST_CONFUSION_COST):
+        self.max_distance = max_distance
+        self.confusion_cost = confusion_cost
+        self._k = int(max_distance)
+        
+        # Plaques (clé, texte, motif) et variante -> identifiant(s)
+        self.plates = []
+        self._index = {}
+        
+        for entry in entries:
+            text, reason = (entry, None) if isinstance(entry, str) else entry
+            self.add(text, reason)
+    
+    @classmethod
+    def load(cls, path, **options):
+        """Charge une liste: une plaque par ligne, motif optionnel après une virgule"""
+        entries = []
+        with open(path, newline='', encoding='utf-8') as f:
+            for row in csv.reader(f):
+                if not row or not row[0].strip() or row[0].startswith('#'):
+                    continue
+                reason = row[1].strip() if len(row) > 1 else None
+                entries.append((row[0].strip(), reason))
+        
+        return cls(entries, **options)
+    
+    def add(self, text, reason=None):
+        """Ajoute une plaque à la liste"""
+        key = plate_key(text)
+        if not key:
+            return
+        
+        plate_id = len(self.plates)
+        self.plates.append((key, text, reason))
+        
+        # Un seul identifiant par variante dans la grande majorité des cas
+        for variant in _deletions(fold(key), self._k):
+            ids = self._index.get(variant)
+            if ids is None:
+                self._index[variant] = plate_id
+            elif isinstance(ids, int):
+                self._index[variant] = (ids, plate_id)
+            else:
+                self._index[variant] = ids + (plate_id,)
+    
+    def __len__(self):
+        return len(self.plates)
+    
+    def match(self, text):
+        """Plaques surveillées proches de ``text``, la plus proche d'abord"""
+        key = plate_key(text)
+        if not key:
+            return []
+        
+        candidates = set()
+        for variant in _deletions(fold(key), self._k):
+            ids = self._index.get(variant)
+            if ids is None:
+                continue
+            if isinstance(ids, int):
+                candidates.add(ids)
+            else:
+                candidates.update(ids)
+        
+        matches = []
+        for plate_id in candidates:
+            listed_key, listed_text, reason = self.plates[plate_id]
+            distance = weighted_distance(key, listed_key, self.confusion_cost,
+                                         self.max_distance)
+            if distance <= self.max_distance:
+                matches.append({'plate': listed_text, 'distance': distance,
+                                'reason': reason})
+        
+        return sorted(matches, key=lambda m: m['distance'])
+
+class AlertSink:
+    """Journal des alertes (JSON Lines, ajouté et vidé à chaque alerte)"""
+    
+    def __init__(self, path=ALERTS_PATH):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self.count = 0
+        self._lock = threading.Lock()
+        self._file = open(path, 'a', encoding='utf-8')
+    
+    def alert(self, source, plate, match):
+        """Enregistre une lecture correspondant à une plaque surveillée"""
+        record = {
+            'date': datetime.now().isoformat(timespec='seconds'),
+            'source': source,
+            'read': plate['text'],
+            'confidence': float(plate['confidence']),
+            'hotlist': match['plate'],
+            'distance': match['distance'],
+            'reason': match['reason'],
+        }
+        
+        with self._lock:
+            self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+            self._file.flush()
+            self.count += 1
+        
+        log.warning("🚨 Plaque surveillée: %s lue %s (distance %.2f) - %s",
+                    match['plate'], plate['text'], match['distance'], source,
+                    extra={'fields': {'event': 'hotlist_alert', **record}})
+        return record
+    
+    def close(self):
+        with self._lock:
+            self._file.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
@@ -5,13 +5,84 @@ Gestionnaire d'Input/Output pour data/input et data/output
 import os
 import cv2
 import csv
+import mmap
+import numpy as np
+from contextlib import contextmanager
 from datetime import datetime
 from constants import *
+from profiling import timed
+from folder_watcher import scan_images
+from log import get_logger
+
+log = get_logger('io')
+
+# Décodage JPEG réduit, du plus fort au plus faible
+_REDUCED_FLAGS = ((8, cv2.IMREAD_REDUCED_COLOR_8),
+                  (4, cv2.IMREAD_REDUCED_COLOR_4),
+                  (2, cv2.IMREAD_REDUCED_COLOR_2))
+
+def jpeg_size(data):
+    """(largeur, hauteur) lues dans l'en-tête JPEG (marqueur SOF), None sinon"""
+    if bytes(data[:2]) != b'\xff\xd8':
+        return None
+    
+    pos, end = 2, len(data)
+    while pos + 9 <= end:
+        if data[pos] != 0xFF:
+            return None
+        
+        marker = data[pos + 1]
+        if marker == 0xFF:
+            # Octet de remplissage
+            pos += 1
+            continue
+        if marker == 0x01 or 0xD0 <= marker <= 0xD8:
+            pos += 2
+            continue
+        
+        # SOF0..SOF15, sauf DHT (C4), JPG (C8) et DAC (CC)
+        if 0xC0 <= marker <= 0xCF and marker not in (0xC4, 0xC8, 0xCC):
+            height = int.from_bytes(data[pos + 5:pos + 7], 'big')
+            width = int.from_bytes(data[pos + 7:pos + 9], 'big')
+            return width, height
+        
+        pos += 2 + int.from_bytes(data[pos + 2:pos + 4], 'big')
+    
+    return None
+
+def decode_image_reduced(data, min_width=DECODE_MIN_WIDTH):
+    """Décode une image, en JPEG réduit si la largeur reste >= ``min_width``
+    
+    Retourne (image, échelle), l'échelle étant taille d'origine / taille
+    décodée (1.0 sans réduction) ; image None si le décodage échoue.
+    """
+    flags = cv2.IMREAD_COLOR
+    size = jpeg_size(data) if min_width else None
+    if size:
+        for factor, reduced in _REDUCED_FLAGS:
+            if size[0] // factor >= min_width:
+                flags = reduced
+                break
+    
+    image = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), flags)
+    if image is None or flags == cv2.IMREAD_COLOR:
+        return image, 1.0
+    
+    # Côté le plus long: indépendant d'une rotation EXIF
+    return image, max(size) / max(image.shape[:2])
 
 class IOManager:
     """Gère les opérations d'entrée/sortie de fichiers"""
     
-    def __init__(self):
+    def __init__(self, writer=None, image_format=OUTPUT_IMAGE_FORMAT,
+                 jpeg_quality=OUTPUT_JPEG_QUALITY):
+        # Écrivain asynchrone optionnel (AsyncImageWriter)
+        self.writer = writer
+        self.image_format = writer.extension if writer else image_format
+        self.write_params = []
+        if self.image_format in ('jpg', 'jpeg'):
+            self.write_params = [cv2.IMWRITE_JPEG_QUALITY, int(jpeg_quality)]
+        
         self.create_directories()
     
     def create_directories(self):
@@ -25,36 +96,84 @@ class IOManager:
         
         for directory in directories:
             os.makedirs(directory, exist_ok=True)
-            print(f"📁 Dossier créé/vérifié: {os.path.relpath(directory, BASE_DIR)}")
+            log.debug("📁 Dossier créé/vérifié: %s", directory)
     
     def get_relative_path(self, full_path):
         """Retourne le chemin relatif depuis le dossier du projet"""
         return os.path.relpath(full_path, BASE_DIR)
     
-    def load_image(self, image_path):
-        """Charge une image depuis le chemin donné"""
-        if not os.path.exists(image_path):
-            raise FileNotFoundError(f"Fichier non trouvé: {image_path}")
+    @contextmanager
+    def map_image(self, image_path):
+        """Contenu d'un fichier image projeté en mémoire (sans copie)
+        
+        La vue n'est valide que dans le bloc ``with``.
+        """
+        with open(image_path, 'rb') as f:
+            try:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:  # fichier vide
+                raise ValueError(f"Impossible de lire l'image: {image_path}")
         
-        image = cv2.imread(image_path)
+        view = memoryview(mapped)
+        try:
+            yield view
+        finally:
+            try:
+                view.release()
+                mapped.close()
+            except BufferError:
+                # Vue encore référencée (trace d'exception): libérée par le GC
+                pass
+    
+    @timed('io.load_image')
+    def load_image(self, image_path):
+        """Charge une image depuis le chemin donné (pleine résolution)"""
+        with self.map_image(image_path) as data:
+            return self.decode_image(data, image_path)
+    
+    @timed('io.decode_image')
+    def decode_image(self, data, image_path=""):
+        """Décode une image depuis son contenu brut"""
+        image = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)
         if image is None:
             raise ValueError(f"Impossible de lire l'image: {image_path}")
         
         return image
     
+    @timed('io.decode_image')
+    def decode_reduced(self, data, image_path="", min_width=DECODE_MIN_WIDTH):
+        """Décode une image à la plus petite résolution JPEG >= ``min_width``
+        
+        Retourne (image, échelle vers l'image d'origine).
+        """
+        image, scale = decode_image_reduced(data, min_width)
+        if image is None:
+            raise ValueError(f"Impossible de lire l'image: {image_path}")
+        
+        return image, scale
+    
+    def write_image(self, output_path, image):
+        """Écrit une image, en arrière-plan si un écrivain est configuré"""
+        if self.writer is not None:
+            self.writer.submit(output_path, image)
+        else:
+            cv2.imwrite(output_path, image, self.write_params)
+    
+    @timed('io.save_result_image')
     def save_result_image(self, image, base_name, suffix="result"):
         """Sauvegarde une image de résultat"""
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"{base_name}_{suffix}_{timestamp}.jpg"
+        filename = f"{base_name}_{suffix}_{timestamp}.{self.image_format}"
         output_path = os.path.join(RESULTS_DIR, filename)
         
-        cv2.imwrite(output_path, image)
+        self.write_image(output_path, image)
         return output_path
     
+    @timed('io.save_plate_roi')
     def save_plate_roi(self, image, bbox, base_name, plate_number):
         """Sauvegarde une région d'intérêt (plaque)"""
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"{base_name}_plate_{plate_number}_{timestamp}.jpg"
+        filename = f"{base_name}_plate_{plate_number}_{timestamp}.{self.image_format}"
         output_path = os.path.join(RESULTS_DIR, filename)
         
         # Extraire la région
@@ -63,11 +182,13 @@ class IOManager:
         x_max = min(image.shape[1], int(max(p[0] for p in bbox)) + 5)
         y_max = min(image.shape[0], int(max(p[1] for p in bbox)) + 5)
         
-        plate_roi = image[y_min:y_max, x_min:x_max]
-        cv2.imwrite(output_path, plate_roi)
+        # Copie: l'image source peut être réutilisée avant l'écriture
+        plate_roi = image[y_min:y_max, x_min:x_max].copy()
+        self.write_image(output_path, plate_roi)
         
         return output_path
     
+    @timed('io.generate_text_report')
     def generate_text_report(self, input_path, plates):
         """Génère un rapport texte"""
         base_name = os.path.splitext(os.path.basename(input_path))[0]
@@ -98,6 +219,7 @@ class IOManager:
         
         return report_file
     
+    @timed('io.generate_csv_report')
     def generate_csv_report(self, input_path, plates):
         """Génère un rapport CSV"""
         base_name = os.path.splitext(os.path.basename(input_path))[0]
@@ -135,14 +257,8 @@ class IOManager:
         return csv_file
     
     def list_input_images(self):
-        """Liste toutes les images dans data/input/"""
-        images = []
-        for ext in ['.jpg', '.jpeg', '.png', '.bmp']:
-            for file in os.listdir(INPUT_DIR):
-                if file.lower().endswith(ext):
-                    images.append(os.path.join(INPUT_DIR, file))
-        
-        return sorted(images)
+        """Liste toutes les images dans data/input/ (un seul parcours)"""
+        return scan_images(INPUT_DIR)
     
     def create_test_image(self):
         """Crée une image de test si data/input/ est vide"""
@@ -162,6 +278,6 @@ class IOManager:
             cv2.rectangle(img, (180, 130), (620, 270), (0, 100, 255), 2)
             
             cv2.imwrite(test_path, img)
-            print(f"✅ Image test créée: {self.get_relative_path(test_path)}")
+            log.info("✅ Image test créée: %s", self.get_relative_path(test_path))
         
         return test_path
\ No newline at end of file
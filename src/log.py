@@ -0,0 +1,130 @@
+"""
+Journalisation: niveaux, sortie JSON et progression limitée en fréquence
+
+Les modules écrivent via ``get_logger`` ; les points d'entrée appellent
+``setup_logging`` une fois. Les messages par image sont au niveau DEBUG
+(formatage différé, aucun coût quand ils sont filtrés) : en mode
+``quiet``, seuls les avertissements et erreurs sont écrits.
+"""
+
+import sys
+import json
+import time
+import logging
+from datetime import datetime
+
+ROOT_LOGGER = 'alpr'
+
+LEVELS = ['debug', 'info', 'warning', 'error']
+
+def get_logger(name):
+    """Logger d'un module (sous-logger de ``alpr``)"""
+    return logging.getLogger(f"{ROOT_LOGGER}.{name}")
+
+class TextFormatter(logging.Formatter):
+    """Message seul ; les titres (``banner``) sont encadrés"""
+    
+    def format(self, record):
+        message = super().format(record)
+        width = getattr(record, 'banner', 0)
+        if width:
+            return f"{'=' * width}\n{message}\n{'=' * width}"
+        return message
+
+def banner(logger, title, width=70, level=logging.INFO):
+    """Titre de section (encadré en mode texte)"""
+    logger.log(level, title, extra={'banner': width})
+
+class JsonFormatter(logging.Formatter):
+    """Une ligne JSON par message, champs structurés inclus
+    
+    Les champs passés par ``extra={'fields': {...}}`` sont ajoutés à
+    l'objet, pour les consommateurs automatiques.
+    """
+    
+    def format(self, record):
+        entry = {
+            'ts': datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+            'level': record.levelname.lower(),
+            'logger': record.name,
+            'msg': record.getMessage().strip(),
+        }
+        entry.update(getattr(record, 'fields', {}))
+        
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+def setup_logging(level='info', json_output=False, quiet=False, stream=None):
+    """Configure la sortie des logs ``alpr`` (texte ou JSON)"""
+    logger = logging.getLogger(ROOT_LOGGER)
+    
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+    
+    handler = logging.StreamHandler(stream or sys.stdout)
+    handler.setFormatter(JsonFormatter() if json_output
+                         else TextFormatter('%(message)s'))
+    logger.addHandler(handler)
+    logger.setLevel(logging.WARNING if quiet else getattr(logging, level.upper()))
+    logger.propagate = False
+    
+    return logger
+
+def add_logging_arguments(parser):
+    """Options communes des points d'entrée"""
+    parser.add_argument('--log-level', choices=LEVELS, default='info',
+                        help="Niveau de journalisation (debug: détail par image)")
+    parser.add_argument('--log-json', action='store_true',
+                        help="Logs au format JSON (une ligne par message)")
+    parser.add_argument('-q', '--quiet', action='store_true',
+                        help="Avertissements et erreurs seulement")
+
+def setup_from_args(args, debug=False):
+    """``setup_logging`` à partir des options ``add_logging_arguments``"""
+    return setup_logging('debug' if debug else args.log_level,
+                         json_output=args.log_json, quiet=args.quiet)
+
+def _format_duration(seconds):
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02d}:{seconds:02d}" if hours else f"{minutes}:{seconds:02d}"
+
+class ProgressReporter:
+    """Progression d'un batch, au plus une ligne toutes les ``interval`` s"""
+    
+    def __init__(self, total, logger, interval=2.0, unit='images'):
+        self.total = total
+        self.logger = logger
+        self.interval = interval
+        self.unit = unit
+        self.done = 0
+        self.start = time.perf_counter()
+        self._last = self.start
+    
+    def update(self, n=1):
+        self.done += n
+        now = time.perf_counter()
+        
+        if now - self._last >= self.interval or self.done == self.total:
+            self._last = now
+            self._emit(now)
+    
+    def _emit(self, now):
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+        
+        elapsed = now - self.start
+        rate = self.done / elapsed if elapsed > 0 else 0.0
+        eta = (self.total - self.done) / rate if rate else None
+        
+        self.logger.info(
+            "⏳ %d/%d %s | %.1f %s/s | ETA %s",
+            self.done, self.total, self.unit, rate, self.unit,
+            _format_duration(eta) if eta is not None else '-',
+            extra={'fields': {
+                'event': 'progress', 'done': self.done, 'total': self.total,
+                'rate': round(rate, 3), 'eta_s': round(eta, 1) if eta is not None else None,
+            }}
+        )
@@ -0,0 +1,101 @@
+"""
+Regroupement des requêtes concurrentes en lots (micro-batching)
+"""
+
+import time
+import queue
+import threading
+from concurrent.futures import Future
+
+class QueueFullError(Exception):
+    """File d'attente pleine: le client doit réessayer plus tard"""
+
+class MicroBatcher:
+    """Regroupe les éléments soumis par plusieurs threads
+    
+    Un thread unique attend le premier élément, puis en accumule d'autres
+    pendant au plus ``max_wait`` secondes (ou jusqu'à ``max_batch``), et
+    appelle ``process_batch(items)`` qui retourne un résultat par élément.
+    La file est bornée: au-delà de ``max_queue`` éléments en attente,
+    ``submit`` lève ``QueueFullError`` au lieu d'accumuler du retard.
+    """
+    
+    def __init__(self, process_batch, max_batch=16, max_wait=0.01, max_queue=64):
+        self.process_batch = process_batch
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='micro-batcher', daemon=True)
+        
+        self.batches = 0
+        self.items = 0
+        self.rejected = 0
+    
+    def start(self):
+        self._thread.start()
+        return self
+    
+    def stop(self, timeout=5):
+        """Arrête le thread après le lot en cours"""
+        self._stop_event.set()
+        self._thread.join(timeout)
+        
+        # Éléments jamais traités
+        while True:
+            try:
+                _, future = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            future.set_exception(RuntimeError("Traitement arrêté"))
+    
+    @property
+    def pending(self):
+        return self._queue.qsize()
+    
+    def submit(self, item):
+        """Soumet un élément, retourne un ``Future`` de son résultat"""
+        future = Future()
+        try:
+            self._queue.put_nowait((item, future))
+        except queue.Full:
+            self.rejected += 1
+            raise QueueFullError(f"{self._queue.maxsize} éléments déjà en attente")
+        return future
+    
+    def _collect(self):
+        """Attend un premier élément puis remplit le lot"""
+        try:
+            batch = [self._queue.get(timeout=0.1)]
+        except queue.Empty:
+            return []
+        
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            try:
+                batch.append(self._queue.get(timeout=max(0.0, remaining))
+                             if remaining > 0 else self._queue.get_nowait())
+            except queue.Empty:
+                break
+        
+        return batch
+    
+    def _run(self):
+        while not self._stop_event.is_set():
+            batch = self._collect()
+            if not batch:
+                continue
+            
+            items = [item for item, _ in batch]
+            try:
+                results = self.process_batch(items)
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+            
+            self.batches += 1
+            self.items += len(batch)
+            for (_, future), result in zip(batch, results):
+                future.set_result(result)
@@ -1,32 +1,91 @@
 """
-Moteur OCR basé sur EasyOCR
+Moteur OCR basé sur EasyOCR, ou sur un recognizer ONNX (ONNX Runtime)
 """
 
-import easyocr
+import os
+import cv2
+import numpy as np
 import re
-from constants import OCR_LANGUAGES, OCR_GPU, PLATE_FORMATS
+import logging
+from constants import (OCR_LANGUAGES, OCR_GPU, OCR_BATCH_HEIGHT, PLATE_FORMATS,
+                       OCR_BACKEND, OCR_BACKENDS, ONNX_MODEL_PATH)
+from reader_pool import get_reader, warmup
+from onnx_recognizer import OnnxRecognizer
+from plate_grammar import PlateGrammar
+from plate_corrector import PlateCorrector
+from profiling import timed
+from buffer_pool import BufferPool
+from boxes import iou_matrix, polygon_box
+from log import get_logger
+
+log = get_logger('ocr')
 
 class OCREngine:
-    """Moteur de reconnaissance optique de caractères"""
+    """Moteur de reconnaissance optique de caractères
+    
+    ``backend='onnx'``: les ROI sont lues par le recognizer exporté
+    (``OnnxRecognizer``), sans détecteur de texte ; ``extract_text`` lit
+    alors l'image entière comme une seule ligne.
+    """
     
-    def __init__(self, debug=False):
+    def __init__(self, debug=False, languages=None, gpu=None, backend=None,
+                 model_path=None, threads=None):
         self.debug = debug
-        self.reader = easyocr.Reader(
-            OCR_LANGUAGES,
-            gpu=OCR_GPU,
-            model_storage_directory=None,
-            download_enabled=True
-        )
+        self.languages = OCR_LANGUAGES if languages is None else languages
+        self.gpu = OCR_GPU if gpu is None else gpu
+        self.backend = backend or OCR_BACKEND
+        self.grammar = PlateGrammar(PLATE_FORMATS)
+        self.corrector = PlateCorrector(PLATE_FORMATS)
+        
+        if self.backend not in OCR_BACKENDS:
+            raise ValueError(f"Moteur OCR inconnu: {self.backend}")
+        
+        self.recognizer = None
+        if self.backend == 'onnx':
+            self.recognizer = OnnxRecognizer(model_path or ONNX_MODEL_PATH, threads)
+        
+        # Tampon de conversion RGB réutilisé (image complète)
+        self.pool = BufferPool()
+        
+        log.debug("🔧 OCR Engine initialisé (%s, chargement différé)", self.backend)
+    
+    @property
+    def model_id(self):
+        """Identifiant du modèle (empreinte du cache)"""
+        if self.recognizer is None:
+            return self.backend
         
-        if debug:
-            print("🔧 OCR Engine initialisé (EasyOCR)")
+        # Un nouvel export au même chemin change aussi l'empreinte
+        path = os.path.abspath(self.recognizer.model_path)
+        stamp = os.stat(path).st_mtime_ns if os.path.exists(path) else None
+        return f"{self.backend}:{path}:{stamp}"
+    
+    @property
+    def reader(self):
+        """Lecteur EasyOCR partagé (chargé au premier usage)"""
+        return get_reader(self.languages, self.gpu)
     
+    def warmup(self):
+        """Pré-charge le modèle OCR et retourne le temps de chargement (s)"""
+        if self.recognizer is not None:
+            load_time = self.recognizer.warmup()
+        else:
+            load_time = warmup(self.languages, self.gpu)
+        
+        log.debug("🔧 Modèle OCR chargé en %.2fs", load_time)
+        
+        return load_time
+    
+    @timed('ocr.extract_text')
     def extract_text(self, image):
         """Extrait le texte d'une image"""
+        if self.recognizer is not None:
+            return self.extract_text_batch([image])[0]
+        
         try:
             # EasyOCR attend du RGB
             if len(image.shape) == 3 and image.shape[2] == 3:
-                rgb_image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+                rgb_image = self.pool.run('rgb', cv2.cvtColor, image, cv2.COLOR_BGR2RGB)
             else:
                 rgb_image = image
             
@@ -37,26 +96,136 @@ class OCREngine:
                 detail=1
             )
             
-            if self.debug:
-                print(f"  📝 {len(results)} texte(s) détecté(s)")
+            log.debug("  📝 %d texte(s) détecté(s)", len(results))
             
             return results
             
         except Exception as e:
-            if self.debug:
-                print(f"  ❌ Erreur OCR: {e}")
+            log.warning("  ❌ Erreur OCR: %s", e)
             return []
     
+    @timed('ocr.extract_text_batch')
+    def extract_text_batch(self, rois):
+        """Extrait le texte de plusieurs ROI en une seule passe
+        
+        Les ROI sont ramenées à une hauteur commune et empilées sur un
+        canevas unique : le recognizer EasyOCR les lit toutes via
+        ``reader.recognize`` sans relancer le détecteur pour chacune.
+        Retourne une liste de résultats par ROI, au format de
+        ``extract_text`` (bbox relative à la ROI).
+        """
+        batch = [[] for _ in rois]
+        valid = [i for i, roi in enumerate(rois)
+                 if roi is not None and roi.size > 0]
+        
+        if not valid:
+            return batch
+        
+        if self.recognizer is not None:
+            return self._recognize_onnx(rois, valid, batch)
+        
+        try:
+            canvas, boxes = self._build_batch_canvas([rois[i] for i in valid])
+            
+            # Lecture OCR (recognizer seul, une boîte par ROI)
+            results = self.reader.recognize(
+                canvas,
+                horizontal_list=boxes,
+                free_list=[],
+                detail=1,
+                paragraph=False,
+                batch_size=len(boxes)
+            )
+            
+            # Associer chaque résultat à sa ROI via la ligne du canevas
+            row_of = {box[2]: i for i, box in zip(valid, boxes)}
+            for bbox, text, confidence in results:
+                i = row_of.get(int(bbox[0][1]))
+                if i is None or not text:
+                    continue
+                
+                h, w = rois[i].shape[:2]
+                roi_bbox = [[0, 0], [w, 0], [w, h], [0, h]]
+                batch[i].append((roi_bbox, text, confidence))
+            
+            if log.isEnabledFor(logging.DEBUG):
+                found = sum(1 for r in batch if r)
+                log.debug("  📝 OCR groupé: %d/%d ROI avec texte", found, len(rois))
+            
+        except Exception as e:
+            log.warning("  ❌ Erreur OCR groupé: %s", e)
+        
+        return batch
+    
+    def _recognize_onnx(self, rois, valid, batch):
+        """Lecture des ROI valides par le recognizer ONNX (un seul lot)"""
+        try:
+            reads = self.recognizer.recognize([rois[i] for i in valid])
+            
+            for i, (text, confidence, char_confidences) in zip(valid, reads):
+                if not text:
+                    continue
+                h, w = rois[i].shape[:2]
+                roi_bbox = [[0, 0], [w, 0], [w, h], [0, h]]
+                batch[i].append((roi_bbox, text, confidence, char_confidences))
+            
+        except Exception as e:
+            log.warning("  ❌ Erreur OCR ONNX: %s", e)
+        
+        return batch
+    
+    def _build_batch_canvas(self, rois, gap=8):
+        """Empile les ROI (gris, hauteur commune) sur un seul canevas"""
+        height = OCR_BATCH_HEIGHT
+        lines = []
+        
+        for roi in rois:
+            if len(roi.shape) == 3:
+                roi = cv2.cvtColor(roi, cv2.COLOR_BGR2GRAY)
+            
+            ratio = height / roi.shape[0]
+            width = max(1, int(round(roi.shape[1] * ratio)))
+            lines.append(cv2.resize(roi, (width, height)))
+        
+        max_width = max(line.shape[1] for line in lines)
+        canvas = np.full(
+            (len(lines) * (height + gap), max_width), 255, dtype=np.uint8
+        )
+        
+        # Boîtes au format EasyOCR: [x_min, x_max, y_min, y_max]
+        boxes = []
+        for n, line in enumerate(lines):
+            y = n * (height + gap)
+            canvas[y:y + height, :line.shape[1]] = line
+            boxes.append([0, line.shape[1], y, y + height])
+        
+        return canvas, boxes
+    
+    @timed('ocr.process_plates')
     def process_plates(self, ocr_results):
         """Traite les résultats OCR pour trouver les plaques"""
         plates = []
         
-        for bbox, text, confidence in ocr_results:
+        for result in ocr_results:
+            bbox, text, confidence = result[:3]
+            
+            # Confiances par caractère, si le moteur les fournit
+            char_confidences = result[3] if len(result) > 3 else None
+            
             # Nettoyer le texte
             cleaned_text = self._clean_text(text)
             
-            # Vérifier si c'est une plaque
-            plate_format = self._get_plate_format(cleaned_text)
+            # Corriger les confusions selon le format, case par case
+            corrected = self.corrector.correct(
+                cleaned_text, confidence, char_confidences
+            )
+            
+            if corrected:
+                cleaned_text, (country, pattern) = corrected
+                plate_format = f"{country}: {pattern}"
+            else:
+                # Vérifier si c'est une plaque (format non standard)
+                plate_format = self._get_plate_format(cleaned_text)
             
             if plate_format:
                 plates.append({
@@ -67,39 +236,59 @@ class OCREngine:
                     'raw_text': text
                 })
                 
-                if self.debug:
-                    print(f"  🎯 Plaque détectée: {cleaned_text} ({confidence:.1%})")
+                log.debug("  🎯 Plaque détectée: %s (%.1f%%)", cleaned_text, confidence * 100)
         
         # Trier par confiance
         plates.sort(key=lambda x: x['confidence'], reverse=True)
         
         return plates
     
+    @staticmethod
+    def deduplicate_plates(plates, iou_threshold=0.5):
+        """Une lecture par plaque physique
+        
+        Par confiance décroissante, une plaque est écartée si une plaque
+        déjà gardée a le même texte (hors tirets/espaces) ou recouvre sa
+        bbox (IoU >= ``iou_threshold``, deux lectures de la même plaque).
+        """
+        if len(plates) < 2:
+            return plates
+        
+        plates = sorted(plates, key=lambda x: x['confidence'], reverse=True)
+        ious = iou_matrix([polygon_box(p['bbox']) for p in plates],
+                          [polygon_box(p['bbox']) for p in plates])
+        
+        # ``seen``: emplacements des plaques déjà rapportées (y compris
+        # les doublons de texte, autres vues de la même plaque)
+        kept, seen, texts = [], [], set()
+        for i, plate in enumerate(plates):
+            if any(ious[i, j] >= iou_threshold for j in seen):
+                continue
+            seen.append(i)
+            
+            key = re.sub(r'[^0-9A-Z]', '', plate['text'].upper())
+            if key not in texts:
+                kept.append(i)
+                texts.add(key)
+        
+        return [plates[i] for i in kept]
+    
     def _clean_text(self, text):
         """Nettoie le texte de la plaque"""
         # Supprimer caractères spéciaux
         cleaned = re.sub(r'[^\w\-]', '', text)
         cleaned = cleaned.upper()
         
-        # Corrections courantes
-        corrections = {
-            '0': 'O',
-            '1': 'I',
-            '5': 'S',
-            '8': 'B'
-        }
-        
-        for wrong, right in corrections.items():
-            cleaned = cleaned.replace(wrong, right)
-        
+        # Les confusions (0/O, 1/I...) sont corrigées par PlateCorrector,
+        # selon la position dans le format
         return cleaned
     
     def _get_plate_format(self, text):
         """Détermine le format de la plaque"""
-        for country, patterns in PLATE_FORMATS.items():
-            for pattern in patterns:
-                if re.match(pattern, text):
-                    return f"{country}: {pattern}"
+        match = self.grammar.classify(text)
+        if match:
+            country, pattern = match
+            return f"{country}: {pattern}"
         
         # Vérifications de base
         if len(text) >= 6:
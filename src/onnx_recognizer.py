@@ -0,0 +1,146 @@
+"""
+Reconnaissance de texte par un modèle ONNX (ONNX Runtime, CPU)
+
+Le modèle est le recognizer d'EasyOCR exporté par ``export_onnx.py``:
+entrée [N, 1, H, W] (gris normalisé dans [-1, 1]), sortie [N, T, C]
+décodée en CTC glouton (classe 0: blanc). Le jeu de caractères est lu
+dans les métadonnées du modèle (``charset``) ou dans ``<modèle>.charset``.
+onnxruntime n'est importé qu'au premier besoin.
+"""
+
+import os
+import time
+import threading
+import cv2
+import numpy as np
+from constants import ONNX_INPUT_HEIGHT, ONNX_INTRA_OP_THREADS
+
+_sessions = {}
+_load_times = {}
+_lock = threading.Lock()
+
+def load_charset(model_path, metadata=None):
+    """Caractères du modèle (sans le blanc CTC)"""
+    charset = (metadata or {}).get('charset')
+    if charset is None:
+        with open(model_path + '.charset', encoding='utf-8') as f:
+            charset = f.read().rstrip('\n')
+    return list(charset)
+
+def get_session(model_path, threads=None):
+    """Session ONNX Runtime partagée, chargée au premier appel
+    
+    ``threads``: threads intra-opérateur (0: un par cœur, défaut ORT).
+    """
+    threads = ONNX_INTRA_OP_THREADS if threads is None else threads
+    key = (os.path.abspath(model_path), threads)
+    
+    session = _sessions.get(key)
+    if session is None:
+        with _lock:
+            session = _sessions.get(key)
+            if session is None:
+                import onnxruntime as ort
+                
+                start = time.perf_counter()
+                options = ort.SessionOptions()
+                options.intra_op_num_threads = threads
+                options.inter_op_num_threads = 1
+                options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+                options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+                
+                session = ort.InferenceSession(model_path, options,
+                                               providers=['CPUExecutionProvider'])
+                _load_times[key] = time.perf_counter() - start
+                _sessions[key] = session
+    
+    return session
+
+def ctc_greedy_decode(logits, charset):
+    """Décodage CTC glouton d'un lot [N, T, C]
+    
+    Meilleure classe à chaque pas, répétitions fusionnées puis blancs
+    (classe 0) retirés. Retourne, par ligne, (texte, confiance moyenne,
+    confiances par caractère) ; confiances = probabilités softmax.
+    """
+    logits = logits - logits.max(axis=2, keepdims=True)
+    probs = np.exp(logits)
+    probs /= probs.sum(axis=2, keepdims=True)
+    
+    best = probs.argmax(axis=2)
+    best_prob = probs.max(axis=2)
+    
+    # Un caractère par changement de classe non blanche (vectorisé)
+    changed = np.ones_like(best, dtype=bool)
+    changed[:, 1:] = best[:, 1:] != best[:, :-1]
+    emit = changed & (best != 0)
+    
+    decoded = []
+    for classes, confidences, keep in zip(best, best_prob, emit):
+        chars = [charset[c - 1] for c in classes[keep]]
+        char_confidences = confidences[keep].astype(float).tolist()
+        confidence = float(np.mean(char_confidences)) if chars else 0.0
+        decoded.append((''.join(chars), confidence, char_confidences))
+    
+    return decoded
+
+class OnnxRecognizer:
+    """Reconnaît le texte de lots de ROI (une ligne de texte par ROI)"""
+    
+    def __init__(self, model_path, threads=None, height=ONNX_INPUT_HEIGHT):
+        self.model_path = model_path
+        self.threads = ONNX_INTRA_OP_THREADS if threads is None else threads
+        self.height = height
+        self._charset = None
+    
+    @property
+    def session(self):
+        return get_session(self.model_path, self.threads)
+    
+    @property
+    def charset(self):
+        if self._charset is None:
+            metadata = self.session.get_modelmeta().custom_metadata_map
+            self._charset = load_charset(self.model_path, metadata)
+        return self._charset
+    
+    def warmup(self):
+        """Charge la session et retourne son temps de chargement (s)"""
+        self.charset
+        return _load_times[(os.path.abspath(self.model_path), self.threads)]
+    
+    def prepare_batch(self, rois):
+        """Lot [N, 1, H, W] float32 dans [-1, 1]
+        
+        ROI en gris à la hauteur du modèle, ratio conservé ; les plus
+        courtes sont complétées en répétant leur dernière colonne (comme
+        le ``NormalizePAD`` d'EasyOCR).
+        """
+        lines = []
+        for roi in rois:
+            if len(roi.shape) == 3:
+                roi = cv2.cvtColor(roi, cv2.COLOR_BGR2GRAY)
+            width = max(1, int(round(roi.shape[1] * self.height / roi.shape[0])))
+            lines.append(cv2.resize(roi, (width, self.height),
+                                    interpolation=cv2.INTER_AREA))
+        
+        max_width = max(line.shape[1] for line in lines)
+        batch = np.empty((len(lines), 1, self.height, max_width), dtype=np.float32)
+        for n, line in enumerate(lines):
+            batch[n, 0, :, :line.shape[1]] = line
+            batch[n, 0, :, line.shape[1]:] = line[:, -1:]
+        
+        batch *= 2 / 255
+        batch -= 1
+        return batch
+    
+    def recognize(self, rois):
+        """(texte, confiance, confiances par caractère) de chaque ROI"""
+        if not rois:
+            return []
+        
+        session = self.session
+        batch = self.prepare_batch(rois)
+        logits = session.run(None, {session.get_inputs()[0].name: batch})[0]
+        
+        return ctc_greedy_decode(logits, self.charset)
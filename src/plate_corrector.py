@@ -0,0 +1,144 @@
+"""
+Correction des confusions OCR guidée par le format de plaque
+"""
+
+import re
+import math
+from itertools import product
+from constants import (PLATE_FORMATS, MAX_PLATE_LENGTH, CORRECTOR_MAX_CHANGES,
+                       CORRECTOR_COUNTRY_PRIOR)
+
+# Confusions courantes de l'OCR
+DIGIT_TO_LETTER = {'0': 'O', '1': 'I', '2': 'Z', '5': 'S', '6': 'G', '8': 'B'}
+LETTER_TO_DIGIT = {'O': '0', 'Q': '0', 'D': '0', 'I': '1', 'L': '1',
+                   'Z': '2', 'S': '5', 'G': '6', 'B': '8'}
+
+# Éléments de motif reconnus: classe de caractères ou littéral, puis quantificateur
+_TOKEN = re.compile(r'(\[A-Z\]|\\d|\[0-9\]|[A-Z0-9\- ])(\{(\d+)(?:,(\d+))?\}|\?)?')
+
+def _slot_tables():
+    """Tables de correspondance par type de case
+    
+    Pour chaque type ('L' lettre, 'D' chiffre), caractère lu ->
+    (caractère corrigé, corrigé ou non).
+    """
+    letters = [chr(c) for c in range(ord('A'), ord('Z') + 1)]
+    digits = [str(d) for d in range(10)]
+    
+    letter_slot = {c: (c, False) for c in letters}
+    letter_slot.update({d: (l, True) for d, l in DIGIT_TO_LETTER.items()})
+    
+    digit_slot = {d: (d, False) for d in digits}
+    digit_slot.update({l: (d, True) for l, d in LETTER_TO_DIGIT.items()})
+    
+    return {'L': letter_slot, 'D': digit_slot}
+
+def expand_pattern(pattern, max_length=MAX_PLATE_LENGTH):
+    """Développe un motif en gabarits de cases ('L', 'D' ou littéral)
+    
+    Retourne None si le motif sort du sous-ensemble reconnu.
+    """
+    body = re.sub(r'^\^|\$$', '', pattern)
+    
+    elements = []
+    pos = 0
+    while pos < len(body):
+        match = _TOKEN.match(body, pos)
+        if not match:
+            return None
+        
+        atom, quantifier, low, high = match.groups()
+        slot = {'[A-Z]': 'L', '\\d': 'D', '[0-9]': 'D'}.get(atom, atom)
+        
+        if quantifier == '?':
+            counts = (0, 1)
+        elif quantifier:
+            low = int(low)
+            counts = range(low, int(high if high is not None else low) + 1)
+        else:
+            counts = (1,)
+        
+        elements.append([slot * n for n in counts])
+        pos = match.end()
+    
+    templates = {''.join(parts) for parts in product(*elements)}
+    return sorted(t for t in templates if 0 < len(t) <= max_length)
+
+class PlateCorrector:
+    """Corrige les confusions OCR case par case selon le format
+    
+    Chaque motif de ``PLATE_FORMATS`` est développé une fois en gabarits
+    de cases (lettre, chiffre, littéral), indexés par longueur. Un texte
+    est essayé contre les gabarits de sa longueur : les caractères
+    confondables sont remplacés selon le type de la case (au plus
+    ``max_changes``). Le gabarit le plus probable au vu des confiances par
+    caractère est retenu ; l'ordre des pays dans ``formats``, du plus
+    spécifique (FR) au plus générique (EU), n'ajoute que ``country_prior``
+    par rang et départage surtout les lectures valides dans plusieurs pays.
+    """
+    
+    def __init__(self, formats=None, max_length=MAX_PLATE_LENGTH,
+                 max_changes=CORRECTOR_MAX_CHANGES, country_prior=CORRECTOR_COUNTRY_PRIOR):
+        formats = PLATE_FORMATS if formats is None else formats
+        tables = _slot_tables()
+        self.max_changes = max_changes
+        
+        # longueur -> [(coût a priori du pays, rang, (pays, motif), [table par case])]
+        self.templates = {}
+        rank = 0
+        for priority, (country, patterns) in enumerate(formats.items()):
+            for pattern in patterns:
+                for template in expand_pattern(pattern, max_length) or []:
+                    slots = [tables.get(slot, {slot: (slot, False)})
+                             for slot in template]
+                    self.templates.setdefault(len(template), []).append(
+                        (priority * country_prior, rank, (country, pattern), slots)
+                    )
+                rank += 1
+    
+    def correct(self, text, confidence=0.9, char_confidences=None):
+        """Retourne (texte corrigé, (pays, motif)) ou None
+        
+        ``char_confidences`` donne la confiance de chaque caractère lu ;
+        à défaut, ``confidence`` est utilisée pour tous.
+        """
+        candidates = self.templates.get(len(text))
+        if not candidates:
+            return None
+        
+        # Un mot sans chiffre (STOP, TAXI...) ou sans lettre n'est pas
+        # une plaque à corriger
+        if not (any(c.isalpha() for c in text) and any(c.isdigit() for c in text)):
+            return None
+        
+        if char_confidences is None or len(char_confidences) != len(text):
+            char_confidences = [confidence] * len(text)
+        
+        # Coût d'un caractère conservé / corrigé (-log probabilité)
+        keep_cost = []
+        change_cost = []
+        for c in char_confidences:
+            c = min(max(float(c), 0.01), 0.99)
+            keep_cost.append(-math.log(c))
+            change_cost.append(-math.log(1.0 - c))
+        
+        best = None
+        for prior, rank, label, slots in candidates:
+            chars = []
+            cost = prior
+            changes = 0
+            for i, (char, table) in enumerate(zip(text, slots)):
+                entry = table.get(char)
+                if entry is None:
+                    break
+                if entry[1]:
+                    changes += 1
+                    if changes > self.max_changes:
+                        break
+                chars.append(entry[0])
+                cost += change_cost[i] if entry[1] else keep_cost[i]
+            else:
+                if best is None or (cost, rank) < best[:2]:
+                    best = (cost, rank, ''.join(chars), label)
+        
+        return (best[2], best[3]) if best else None
@@ -0,0 +1,56 @@
+"""
+Grammaire des plaques: tous les formats compilés en une seule regex
+"""
+
+import re
+from constants import PLATE_FORMATS
+
+class PlateGrammar:
+    """Classe un texte parmi les formats de plaques en un seul appel
+    
+    Tous les motifs de ``PLATE_FORMATS`` sont réunis dans une alternance
+    unique à groupes nommés, compilée une fois. Le groupe qui correspond
+    donne le pays et le motif.
+    """
+    
+    def __init__(self, formats=None, cache_size=4096):
+        formats = PLATE_FORMATS if formats is None else formats
+        
+        self.labels = {}
+        alternatives = []
+        for country, patterns in formats.items():
+            for pattern in patterns:
+                name = f"f{len(self.labels)}"
+                body = re.sub(r'^\^|\$$', '', pattern)
+                alternatives.append(f"(?P<{name}>{body})")
+                self.labels[name] = (country, pattern)
+        
+        self.regex = re.compile(r'\A(?:' + '|'.join(alternatives) + r')\Z')
+        
+        # Mémo des textes déjà classés (les mêmes reviennent souvent)
+        self._cache = {}
+        self._cache_size = cache_size
+    
+    def classify(self, text):
+        """Retourne (pays, motif) ou None"""
+        try:
+            return self._cache[text]
+        except KeyError:
+            pass
+        
+        match = self.regex.match(text)
+        result = self.labels[match.lastgroup] if match else None
+        
+        if len(self._cache) >= self._cache_size:
+            self._cache.clear()
+        self._cache[text] = result
+        
+        return result
+    
+    def classify_batch(self, texts):
+        """Classe une liste de textes (résultats dans le même ordre)"""
+        return [self.classify(text) for text in texts]
+    
+    def is_valid(self, text):
+        """Vrai si le texte correspond à un format connu"""
+        return self.classify(text) is not None
@@ -0,0 +1,294 @@
+"""
+Base SQLite des lectures de plaques
+
+Chaque lecture (texte, confiance, format, source, boîte, date) est
+ajoutée dans une file et écrite par lots dans un thread dédié : le
+pipeline ne fait jamais d'écriture disque. La recherche exacte passe
+par l'index (plaque, date) ; la recherche floue par un index de
+variantes par suppression (« symmetric delete ») calculé une seule fois
+par plaque distincte.
+"""
+
+import os
+import re
+import time
+import queue
+import sqlite3
+import threading
+from itertools import combinations
+from constants import PLATE_DB_PATH, PLATE_DB_BATCH, PLATE_DB_QUEUE, PLATE_DB_MAX_DISTANCE
+from log import get_logger
+
+log = get_logger('plate_store')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS reads (
+    id INTEGER PRIMARY KEY,
+    plate_key TEXT NOT NULL,
+    plate TEXT NOT NULL,
+    confidence REAL,
+    format TEXT,
+    source TEXT,
+    x1 INTEGER, y1 INTEGER, x2 INTEGER, y2 INTEGER,
+    seen_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS reads_plate_time ON reads (plate_key, seen_at);
+CREATE INDEX IF NOT EXISTS reads_time ON reads (seen_at);
+
+CREATE TABLE IF NOT EXISTS plates (
+    plate_key TEXT PRIMARY KEY,
+    plate TEXT NOT NULL,
+    first_seen REAL NOT NULL,
+    last_seen REAL NOT NULL,
+    reads INTEGER NOT NULL
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS plate_variants (
+    variant TEXT NOT NULL,
+    plate_key TEXT NOT NULL,
+    PRIMARY KEY (variant, plate_key)
+) WITHOUT ROWID;
+"""
+
+def plate_key(text):
+    """Clé de recherche: alphanumérique en majuscules (AB-123-CD -> AB123CD)"""
+    return re.sub(r'[^0-9A-Z]', '', str(text).upper())
+
+def deletion_variants(key, max_distance=PLATE_DB_MAX_DISTANCE):
+    """Chaînes obtenues en supprimant jusqu'à ``max_distance`` caractères"""
+    variants = {key}
+    for n in range(1, min(max_distance, len(key)) + 1):
+        for positions in combinations(range(len(key)), n):
+            variants.add(''.join(c for i, c in enumerate(key) if i not in positions))
+    return variants
+
+def levenshtein(a, b):
+    """Distance d'édition (insertion, suppression, substitution)"""
+    if len(a) < len(b):
+        a, b = b, a
+    
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1,
+                               previous[j - 1] + (ca != cb)))
+        previous = current
+    
+    return previous[-1]
+
+def _bbox_bounds(bbox):
+    """Boîte [x1, y1, x2, y2] depuis les 4 coins EasyOCR (ou déjà à plat)"""
+    if not bbox:
+        return None, None, None, None
+    if not hasattr(bbox[0], '__len__'):
+        return tuple(int(v) for v in bbox[:4])
+    xs = [int(p[0]) for p in bbox]
+    ys = [int(p[1]) for p in bbox]
+    return min(xs), min(ys), max(xs), max(ys)
+
+class PlateStore:
+    """Stockage persistant des lectures de plaques
+    
+    ``add`` ne fait que mettre en file ; un thread écrit par transactions
+    de ``batch_size`` lectures (ou toutes les ``flush_interval`` s). Avec
+    ``readonly=True`` (requêtes), aucun thread n'est lancé.
+    """
+    
+    def __init__(self, path=PLATE_DB_PATH, batch_size=PLATE_DB_BATCH,
+                 flush_interval=1.0, max_queue=PLATE_DB_QUEUE,
+                 max_distance=PLATE_DB_MAX_DISTANCE, readonly=False):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_distance = max_distance
+        self.written = 0
+        self.errors = 0
+        
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        
+        self.db = self._connect()
+        self.db.executescript(SCHEMA)
+        
+        self._queue = None
+        self._thread = None
+        if not readonly:
+            self._queue = queue.Queue(maxsize=max_queue)
+            self._thread = threading.Thread(target=self._run, name='plate-store',
+                                            daemon=True)
+            self._thread.start()
+    
+    def _connect(self):
+        db = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+        return db
+    
+    def add(self, source, plates, seen_at=None):
+        """Met en file les plaques lues sur ``source`` (bloque si la file est pleine)"""
+        seen_at = time.time() if seen_at is None else seen_at
+        
+        for plate in plates:
+            text = plate['text']
+            self._queue.put((
+                plate_key(text), text, float(plate['confidence']),
+                plate.get('format'), source, *_bbox_bounds(plate.get('bbox')),
+                seen_at
+            ))
+    
+    def _run(self):
+        """Thread d'écriture: vide la file par transactions"""
+        db = self._connect()
+        rows, waiters, stop = [], [], False
+        deadline = None
+        
+        while not stop:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = ()
+            
+            if item is None:
+                stop = True
+            elif isinstance(item, threading.Event):
+                waiters.append(item)
+            elif item:
+                rows.append(item)
+                if deadline is None:
+                    deadline = time.monotonic() + self.flush_interval
+            
+            if rows and (stop or waiters or len(rows) >= self.batch_size or
+                         time.monotonic() >= deadline):
+                self._write(db, rows)
+                rows, deadline = [], None
+            
+            for event in waiters:
+                event.set()
+            waiters = []
+        
+        db.close()
+    
+    def _write(self, db, rows):
+        """Insère un lot de lectures et met à jour plaques et variantes"""
+        try:
+            with db:
+                db.executemany(
+                    "INSERT INTO reads (plate_key, plate, confidence, format, source,"
+                    " x1, y1, x2, y2, seen_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    rows
+                )
+                
+                # Agrégat par plaque distincte du lot
+                batch = {}
+                for key, text, *_, seen_at in rows:
+                    first, last, count = batch.get(key, (seen_at, seen_at, 0))
+                    batch[key] = (min(first, seen_at), max(last, seen_at), count + 1)
+                
+                keys = list(batch)
+                known = set()
+                for start in range(0, len(keys), 500):
+                    part = keys[start:start + 500]
+                    known.update(k for k, in db.execute(
+                        f"SELECT plate_key FROM plates WHERE plate_key IN "
+                        f"({','.join('?' * len(part))})", part))
+                
+                texts = {key: text for key, text, *_ in rows}
+                db.executemany(
+                    "INSERT INTO plates VALUES (?, ?, ?, ?, ?) "
+                    "ON CONFLICT (plate_key) DO UPDATE SET "
+                    "first_seen = min(first_seen, excluded.first_seen), "
+                    "last_seen = max(last_seen, excluded.last_seen), "
+                    "reads = reads + excluded.reads",
+                    [(key, texts[key], *stats) for key, stats in batch.items()]
+                )
+                
+                # Variantes: seulement pour les nouvelles plaques
+                db.executemany(
+                    "INSERT OR IGNORE INTO plate_variants VALUES (?, ?)",
+                    [(variant, key) for key in keys if key not in known
+                     for variant in deletion_variants(key, self.max_distance)]
+                )
+            self.written += len(rows)
+        except sqlite3.Error as e:
+            self.errors += len(rows)
+            log.error("❌ Écriture base des plaques: %s", e)
+    
+    def flush(self, timeout=None):
+        """Attend l'écriture des lectures en file"""
+        if self._thread is None or not self._thread.is_alive():
+            return
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait(timeout)
+    
+    def close(self):
+        """Écrit les lectures restantes et ferme la base"""
+        if self._thread is not None and self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+        self.db.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+    
+    def sightings(self, plate, since=None, until=None, limit=100):
+        """Lectures d'une plaque (plus récentes d'abord)"""
+        query = ("SELECT plate, confidence, format, source, x1, y1, x2, y2, seen_at "
+                 "FROM reads WHERE plate_key = ?")
+        params = [plate_key(plate)]
+        if since is not None:
+            query += " AND seen_at >= ?"
+            params.append(since)
+        if until is not None:
+            query += " AND seen_at < ?"
+            params.append(until)
+        query += " ORDER BY seen_at DESC LIMIT ?"
+        params.append(limit)
+        
+        columns = ('plate', 'confidence', 'format', 'source',
+                   'x1', 'y1', 'x2', 'y2', 'seen_at')
+        return [dict(zip(columns, row)) for row in self.db.execute(query, params)]
+    
+    def fuzzy(self, text, max_distance=1, limit=20):
+        """Plaques connues à au plus ``max_distance`` éditions de ``text``
+        
+        Deux chaînes à distance <= d partagent une variante à d
+        suppressions près : les candidats viennent de l'index des
+        variantes, la distance exacte est vérifiée ensuite.
+        """
+        if max_distance > self.max_distance:
+            raise ValueError(f"Distance max de la base: {self.max_distance}")
+        
+        key = plate_key(text)
+        variants = list(deletion_variants(key, max_distance))
+        candidates = {k for k, in self.db.execute(
+            f"SELECT DISTINCT plate_key FROM plate_variants WHERE variant IN "
+            f"({','.join('?' * len(variants))})", variants)}
+        
+        matches = []
+        for candidate in candidates:
+            distance = levenshtein(key, candidate)
+            if distance <= max_distance:
+                matches.append((distance, candidate))
+        matches.sort()
+        
+        results = []
+        for distance, candidate in matches[:limit]:
+            plate, first_seen, last_seen, reads = self.db.execute(
+                "SELECT plate, first_seen, last_seen, reads FROM plates "
+                "WHERE plate_key = ?", (candidate,)).fetchone()
+            results.append({'plate': plate, 'distance': distance, 'reads': reads,
+                            'first_seen': first_seen, 'last_seen': last_seen})
+        
+        return results
+    
+    def stats(self):
+        """Nombre de lectures et de plaques distinctes"""
+        reads, = self.db.execute("SELECT COUNT(*) FROM reads").fetchone()
+        plates, = self.db.execute("SELECT COUNT(*) FROM plates").fetchone()
+        return {'reads': reads, 'plates': plates}
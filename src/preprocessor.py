@@ -2,66 +2,163 @@
 Pré-traitement des images pour l'OCR
 """
 
+import time
+import threading
 import cv2
 import numpy as np
+from constants import PREPROCESS_PROFILE, PREPROCESS_PROFILES
+from profiling import timed
+from buffer_pool import BufferPool
 
 class ImagePreprocessor:
-    """Pré-traite les images pour améliorer l'OCR"""
+    """Pré-traite les images pour améliorer l'OCR
+    
+    Le pipeline est une liste déclarative d'étapes, choisie par profil
+    (voir ``PREPROCESS_PROFILES``). Chaque étape est chronométrée. Sur
+    l'image complète, chaque étape écrit dans un tampon réutilisé d'une
+    image à l'autre (``dst=``).
+    """
+    
+    # Nom d'étape -> méthode
+    STAGES = {
+        'resize': 'resize',
+        'grayscale': 'to_grayscale',
+        'contrast': 'enhance_contrast',
+        'denoise': 'denoise',
+        'median': 'median_blur',
+        'bilateral': 'bilateral_filter',
+        'sharpen': 'sharpen',
+    }
+    
+    # CLAHE réutilisé, un par thread (l'objet OpenCV garde des tampons internes)
+    _local = threading.local()
+    
+    SHARPEN_KERNEL = np.array([[-1, -1, -1],
+                               [-1,  9, -1],
+                               [-1, -1, -1]], dtype=np.float32)
+    
+    def __init__(self, profile=None, reuse_buffers=True):
+        self.profile = profile or PREPROCESS_PROFILE
+        self.pool = BufferPool() if reuse_buffers else None
+        
+        if self.profile not in PREPROCESS_PROFILES:
+            raise ValueError(f"Profil de pré-traitement inconnu: {self.profile}")
+        
+        stages = PREPROCESS_PROFILES[self.profile]
+        self.frame_stages = self._compile(stages.get('frame', []))
+        self.roi_stages = self._compile(stages.get('roi', []))
+        
+        # Durées (s) de la dernière image, par étape
+        self.timings = {}
+    
+    @classmethod
+    def _compile(cls, stages):
+        """Résout les étapes déclarées en (nom, fonction, paramètres)"""
+        compiled = []
+        for stage in stages:
+            name, params = (stage, {}) if isinstance(stage, str) else stage
+            
+            if name not in cls.STAGES:
+                raise ValueError(f"Étape de pré-traitement inconnue: {name}")
+            
+            compiled.append((name, getattr(cls, cls.STAGES[name]), dict(params)))
+        
+        return compiled
+    
+    def _run(self, image, stages, scope, pool=None):
+        """Exécute une liste d'étapes en chronométrant chacune
+        
+        Les durées s'accumulent jusqu'au prochain ``preprocess_for_ocr``
+        (plusieurs ROI par image). Avec ``pool``, la sortie de chaque
+        étape va dans son tampon.
+        """
+        for i, (name, func, params) in enumerate(stages):
+            start = time.perf_counter()
+            if pool is not None:
+                image = pool.run(f"{scope}.{i}", func, image, **params)
+            else:
+                image = func(image, **params)
+            key = f"{scope}.{name}"
+            self.timings[key] = self.timings.get(key, 0.0) + time.perf_counter() - start
+        
+        return image
     
     @staticmethod
-    def to_grayscale(image):
+    def to_grayscale(image, dst=None):
         """Convertit en niveaux de gris"""
         if len(image.shape) == 3:
-            return cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+            return cv2.cvtColor(image, cv2.COLOR_BGR2GRAY, dst=dst)
         return image
     
     @staticmethod
-    def resize(image, max_width=1200):
-        """Redimensionne l'image (conserve ratio)"""
+    def resize(image, max_width=1200, dst=None):
+        """Redimensionne l'image (conserve ratio)
+        
+        Les grandes images descendent d'abord la pyramide gaussienne
+        (``pyrDown``) puis sont ajustées à ``max_width``.
+        """
+        while image.shape[1] >= 2 * max_width:
+            image = cv2.pyrDown(image)
+        
         if image.shape[1] > max_width:
             ratio = max_width / image.shape[1]
             new_height = int(image.shape[0] * ratio)
-            return cv2.resize(image, (max_width, new_height))
+            return cv2.resize(image, (max_width, new_height), dst=dst,
+                              interpolation=cv2.INTER_AREA)
         return image
     
     @staticmethod
-    def enhance_contrast(image):
+    def enhance_contrast(image, dst=None):
         """Améliore le contraste (CLAHE)"""
         if len(image.shape) == 3:
             image = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
         
-        clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))
-        return clahe.apply(image)
+        clahe = getattr(ImagePreprocessor._local, 'clahe', None)
+        if clahe is None:
+            clahe = ImagePreprocessor._local.clahe = cv2.createCLAHE(
+                clipLimit=2.0, tileGridSize=(8, 8)
+            )
+        return clahe.apply(image, dst=dst)
     
     @staticmethod
-    def denoise(image):
-        """Réduit le bruit"""
-        return cv2.fastNlMeansDenoising(image, h=10)
+    def denoise(image, h=10, dst=None):
+        """Réduit le bruit (non-local means, lent)"""
+        return cv2.fastNlMeansDenoising(image, dst=dst, h=h)
     
     @staticmethod
-    def sharpen(image):
-        """Améliore la netteté"""
-        kernel = np.array([[-1, -1, -1],
-                          [-1,  9, -1],
-                          [-1, -1, -1]])
-        return cv2.filter2D(image, -1, kernel)
+    def median_blur(image, ksize=3, dst=None):
+        """Réduit le bruit impulsionnel (filtre médian, rapide)"""
+        return cv2.medianBlur(image, ksize, dst=dst)
     
     @staticmethod
-    def preprocess_for_ocr(image):
-        """Pipeline complet de pré-traitement pour OCR"""
-        # 1. Redimensionner
-        image = ImagePreprocessor.resize(image)
-        
-        # 2. Convertir en gris
-        gray = ImagePreprocessor.to_grayscale(image)
+    def bilateral_filter(image, d=7, sigma_color=50, sigma_space=50, dst=None):
+        """Réduit le bruit en préservant les contours"""
+        return cv2.bilateralFilter(image, d, sigma_color, sigma_space, dst=dst)
+    
+    @staticmethod
+    def sharpen(image, dst=None):
+        """Améliore la netteté"""
+        return cv2.filter2D(image, -1, ImagePreprocessor.SHARPEN_KERNEL, dst=dst)
+    
+    @timed('preprocess.frame')
+    def preprocess_for_ocr(self, image):
+        """Pipeline complet de pré-traitement (image complète)
         
-        # 3. Améliorer contraste
-        enhanced = ImagePreprocessor.enhance_contrast(gray)
+        Le résultat est un tampon réutilisé par l'appel suivant (même
+        thread) : le copier pour le garder au-delà.
+        """
+        self.timings = {}
         
-        # 4. Réduire bruit
-        denoised = ImagePreprocessor.denoise(enhanced)
+        start = time.perf_counter()
+        processed = self._run(image, self.frame_stages, 'frame', self.pool)
+        self.timings['frame.total'] = time.perf_counter() - start
         
-        # 5. Améliorer netteté
-        sharpened = ImagePreprocessor.sharpen(denoised)
+        return processed
+    
+    @timed('preprocess.roi')
+    def preprocess_roi(self, roi):
+        """Pré-traitement d'une région candidate avant OCR"""
+        if not self.roi_stages or roi.size == 0:
+            return roi
         
-        return sharpened
\ No newline at end of file
+        return self._run(roi, self.roi_stages, 'roi')
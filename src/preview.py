@@ -0,0 +1,69 @@
+"""
+Aperçu des résultats dans un thread séparé
+"""
+
+import time
+import threading
+import cv2
+
+class PreviewWindow(threading.Thread):
+    """Affiche la dernière image publiée, au plus ``max_fps`` fois par seconde
+    
+    ``show`` ne fait que remplacer l'image en attente: le pipeline n'attend
+    jamais l'affichage, les images intermédiaires sont simplement sautées.
+    """
+    
+    def __init__(self, title="ALPR Résultat", max_fps=10):
+        super().__init__(daemon=True)
+        self.title = title
+        self.interval = 1.0 / max_fps
+        self.shown = 0
+        self.skipped = 0
+        self._latest = None
+        self._lock = threading.Lock()
+        self._new_frame = threading.Event()
+        self._stop_event = threading.Event()
+    
+    def show(self, image):
+        """Publie une image (non bloquant)"""
+        with self._lock:
+            if self._latest is not None:
+                self.skipped += 1
+            self._latest = image
+        self._new_frame.set()
+    
+    def stop(self):
+        """Ferme la fenêtre"""
+        self._stop_event.set()
+        self._new_frame.set()
+        if self.is_alive():
+            self.join(timeout=2)
+    
+    def run(self):
+        try:
+            while not self._stop_event.is_set():
+                # waitKey fait vivre la fenêtre même sans nouvelle image
+                if not self._new_frame.wait(self.interval):
+                    if self.shown:
+                        cv2.waitKey(1)
+                    continue
+                
+                with self._lock:
+                    image, self._latest = self._latest, None
+                    self._new_frame.clear()
+                
+                if image is None:
+                    continue
+                
+                start = time.perf_counter()
+                cv2.imshow(self.title, image)
+                cv2.waitKey(1)
+                self.shown += 1
+                
+                # Fréquence d'affichage plafonnée
+                remaining = self.interval - (time.perf_counter() - start)
+                if remaining > 0:
+                    self._stop_event.wait(remaining)
+        finally:
+            if self.shown:
+                cv2.destroyWindow(self.title)
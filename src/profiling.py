@@ -0,0 +1,177 @@
+"""
+Instrumentation: temps par étape du pipeline
+
+Désactivée par défaut: ``timer`` et ``timed`` ne coûtent alors qu'un test
+de booléen. Une fois activée (``enable``), chaque étape accumule un
+histogramme de durées (échelle logarithmique) et ``report`` affiche un
+tableau récapitulatif, plus un fichier cProfile/pstats si demandé.
+"""
+
+import time
+import bisect
+import threading
+import functools
+from contextlib import contextmanager
+from log import get_logger, banner
+
+log = get_logger('profiling')
+
+# Bornes des classes de l'histogramme (ms): 0.05 ms à ~40 s, pas de sqrt(2)
+BUCKETS_MS = [0.05 * 2 ** (i / 2) for i in range(40)]
+
+_enabled = False
+_stats = {}
+_lock = threading.Lock()
+_cprofile = None
+
+class StageStats:
+    """Durées d'une étape: compteurs et histogramme"""
+    
+    __slots__ = ('count', 'total', 'max', 'buckets')
+    
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets = [0] * (len(BUCKETS_MS) + 1)
+    
+    def add(self, ms):
+        self.count += 1
+        self.total += ms
+        self.max = max(self.max, ms)
+        self.buckets[bisect.bisect_left(BUCKETS_MS, ms)] += 1
+    
+    def merge(self, other):
+        self.count += other['count']
+        self.total += other['total']
+        self.max = max(self.max, other['max'])
+        self.buckets = [a + b for a, b in zip(self.buckets, other['buckets'])]
+    
+    def percentile(self, q):
+        """Borne supérieure de la classe contenant le quantile ``q``"""
+        if not self.count:
+            return 0.0
+        
+        rank = q / 100 * self.count
+        seen = 0
+        for i, n in enumerate(self.buckets):
+            seen += n
+            if seen >= rank and n:
+                return min(BUCKETS_MS[i], self.max) if i < len(BUCKETS_MS) else self.max
+        return self.max
+    
+    def as_dict(self):
+        return {'count': self.count, 'total': self.total,
+                'max': self.max, 'buckets': list(self.buckets)}
+
+def enable(cprofile=False):
+    """Active la collecte (et cProfile si demandé)"""
+    global _enabled, _cprofile
+    _enabled = True
+    
+    if cprofile and _cprofile is None:
+        import cProfile
+        _cprofile = cProfile.Profile()
+        _cprofile.enable()
+
+def disable():
+    global _enabled
+    _enabled = False
+
+def is_enabled():
+    return _enabled
+
+def reset():
+    with _lock:
+        _stats.clear()
+
+def record(name, seconds):
+    """Ajoute une durée (s) à l'étape ``name``"""
+    with _lock:
+        stats = _stats.get(name)
+        if stats is None:
+            stats = _stats[name] = StageStats()
+        stats.add(seconds * 1000)
+
+@contextmanager
+def _timing(name):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(name, time.perf_counter() - start)
+
+class _NullTimer:
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        return False
+
+_NULL_TIMER = _NullTimer()
+
+def timer(name):
+    """Chronomètre un bloc ``with``"""
+    return _timing(name) if _enabled else _NULL_TIMER
+
+def timed(name):
+    """Décorateur: chronomètre chaque appel sous le nom ``name``"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                record(name, time.perf_counter() - start)
+        return wrapper
+    return decorator
+
+def snapshot(reset_after=False):
+    """Statistiques sérialisables (pour les workers)"""
+    with _lock:
+        data = {name: stats.as_dict() for name, stats in _stats.items()}
+        if reset_after:
+            _stats.clear()
+    return data
+
+def merge(data):
+    """Fusionne un ``snapshot`` (d'un autre processus)"""
+    with _lock:
+        for name, other in data.items():
+            _stats.setdefault(name, StageStats()).merge(other)
+
+def summary_table():
+    """Tableau: appels, total, moyenne, p50/p95/p99, max (ms)"""
+    with _lock:
+        items = sorted(_stats.items(), key=lambda item: -item[1].total)
+    
+    lines = [f"{'étape':<28} {'appels':>7} {'total':>10} {'moy':>8} "
+             f"{'p50':>8} {'p95':>8} {'p99':>8} {'max':>8}"]
+    for name, s in items:
+        lines.append(f"{name:<28} {s.count:>7} {s.total:>10.1f} {s.total / s.count:>8.2f} "
+                     f"{s.percentile(50):>8.2f} {s.percentile(95):>8.2f} "
+                     f"{s.percentile(99):>8.2f} {s.max:>8.2f}")
+    return "\n".join(lines)
+
+def report(stats_path=None):
+    """Affiche le récapitulatif et écrit le fichier pstats si demandé"""
+    global _cprofile
+    
+    if _cprofile is not None:
+        _cprofile.disable()
+        if stats_path:
+            _cprofile.dump_stats(stats_path)
+        _cprofile = None
+    
+    if not _stats:
+        return
+    
+    banner(log, "⏱️  PROFIL PAR ÉTAPE (ms)")
+    log.info(summary_table(), extra={'fields': {'event': 'profile', 'stages': snapshot()}})
+    
+    if stats_path:
+        log.info("💾 cProfile: %s (python -m pstats %s)", stats_path, stats_path)
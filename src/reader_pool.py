@@ -0,0 +1,54 @@
+"""
+Registre global des lecteurs EasyOCR (chargement paresseux)
+
+Un seul ``easyocr.Reader`` par couple (langues, gpu) et par processus,
+partagé par tous les points d'entrée. EasyOCR n'est importé qu'au
+premier besoin.
+"""
+
+import time
+import threading
+from constants import OCR_LANGUAGES, OCR_GPU
+
+_readers = {}
+_load_times = {}
+_lock = threading.Lock()
+
+def _make_key(languages, gpu):
+    """Clé du registre"""
+    languages = OCR_LANGUAGES if languages is None else languages
+    gpu = OCR_GPU if gpu is None else gpu
+    return tuple(languages), bool(gpu)
+
+def get_reader(languages=None, gpu=None):
+    """Retourne le lecteur partagé, chargé au premier appel"""
+    key = _make_key(languages, gpu)
+
+    reader = _readers.get(key)
+    if reader is None:
+        with _lock:
+            reader = _readers.get(key)
+            if reader is None:
+                import easyocr
+
+                start = time.perf_counter()
+                reader = easyocr.Reader(
+                    list(key[0]),
+                    gpu=key[1],
+                    model_storage_directory=None,
+                    download_enabled=True
+                )
+                _load_times[key] = time.perf_counter() - start
+                _readers[key] = reader
+
+    return reader
+
+def warmup(languages=None, gpu=None):
+    """Pré-charge un lecteur et retourne son temps de chargement (s)"""
+    key = _make_key(languages, gpu)
+    get_reader(*key)
+    return _load_times[key]
+
+def is_loaded(languages=None, gpu=None):
+    """Indique si le lecteur est déjà en mémoire"""
+    return _make_key(languages, gpu) in _readers
@@ -0,0 +1,150 @@
+"""
+Rapport de batch: un seul fichier de données pour tout le batch
+"""
+
+import os
+import csv
+import json
+import time
+from datetime import datetime
+from constants import REPORTS_DIR
+
+class BatchReportSink:
+    """Écrit les résultats d'un batch dans un fichier unique
+    
+    Les lignes sont ajoutées à un fichier CSV (une ligne par plaque) ou
+    JSON Lines (un enregistrement par image), bufferisé et vidé
+    périodiquement. Le résumé lisible est écrit une seule fois, à la
+    fermeture.
+    """
+    
+    FORMATS = ('csv', 'jsonl')
+    CSV_HEADER = [
+        'Date', 'Fichier', 'ID_Plaque', 'Texte',
+        'Confiance', 'Format', 'X_min', 'Y_min', 'X_max', 'Y_max'
+    ]
+    
+    def __init__(self, fmt='csv', reports_dir=REPORTS_DIR, flush_every=200,
+                 flush_interval=5.0):
+        if fmt not in self.FORMATS:
+            raise ValueError(f"Format de rapport inconnu: {fmt}")
+        
+        os.makedirs(reports_dir, exist_ok=True)
+        
+        # Nom unique par batch (horodatage + pid)
+        stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        self.name = f"batch_{stamp}_{os.getpid()}"
+        self.fmt = fmt
+        self.path = os.path.join(reports_dir, f"{self.name}.{fmt}")
+        self.summary_path = os.path.join(reports_dir, f"{self.name}_summary.txt")
+        
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        
+        self._file = open(self.path, 'w', newline='', encoding='utf-8',
+                          buffering=1 << 16)
+        self._writer = None
+        if fmt == 'csv':
+            self._writer = csv.writer(self._file)
+            self._writer.writerow(self.CSV_HEADER)
+        
+        self.started = time.time()
+        self._pending = 0
+        self._last_flush = time.monotonic()
+        self.closed = False
+        
+        # Statistiques du résumé
+        self.images = 0
+        self.images_with_plates = 0
+        self.total_plates = 0
+        self.unique_plates = set()
+    
+    def add(self, input_path, plates):
+        """Ajoute les plaques d'une image"""
+        now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        file_name = os.path.basename(input_path)
+        
+        if self._writer is not None:
+            for i, plate in enumerate(plates, 1):
+                bbox = plate.get('bbox') or [(0, 0)]
+                x_coords = [p[0] for p in bbox]
+                y_coords = [p[1] for p in bbox]
+                
+                self._writer.writerow([
+                    now, file_name, i, plate['text'],
+                    f"{plate['confidence']:.1%}",
+                    plate.get('format', 'Inconnu'),
+                    min(x_coords), min(y_coords),
+                    max(x_coords), max(y_coords)
+                ])
+        else:
+            record = {
+                'date': now,
+                'file': file_name,
+                'path': input_path,
+                'plates': [{
+                    'text': plate['text'],
+                    'confidence': float(plate['confidence']),
+                    'format': plate.get('format', 'Inconnu'),
+                    'bbox': [[float(v) for v in p] for p in plate.get('bbox', [])]
+                } for plate in plates]
+            }
+            self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        
+        self.images += 1
+        self.images_with_plates += bool(plates)
+        self.total_plates += len(plates)
+        self.unique_plates.update(plate['text'] for plate in plates)
+        
+        # Vidage périodique (nombre d'images ou délai)
+        self._pending += 1
+        if (self._pending >= self.flush_every or
+                time.monotonic() - self._last_flush >= self.flush_interval):
+            self.flush()
+    
+    def flush(self):
+        """Vide le buffer vers le disque"""
+        self._file.flush()
+        self._pending = 0
+        self._last_flush = time.monotonic()
+    
+    def close(self, extra_stats=None):
+        """Ferme le fichier de données et écrit le résumé"""
+        if self.closed:
+            return self.summary_path
+        
+        self._file.close()
+        self.closed = True
+        
+        duration = time.time() - self.started
+        
+        with open(self.summary_path, 'w', encoding='utf-8') as f:
+            f.write("="*60 + "\n")
+            f.write("RAPPORT ALPR - Batch\n")
+            f.write("="*60 + "\n\n")
+            
+            f.write(f"Date: {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}\n")
+            f.write(f"Données: {os.path.basename(self.path)}\n")
+            f.write(f"Durée: {duration:.1f}s\n\n")
+            
+            f.write(f"Images: {self.images}\n")
+            f.write(f"Images avec plaque(s): {self.images_with_plates}\n")
+            f.write(f"Plaques détectées: {self.total_plates}\n")
+            f.write(f"Plaques uniques: {len(self.unique_plates)}\n")
+            
+            for key, value in (extra_stats or {}).items():
+                f.write(f"{key}: {value}\n")
+            
+            if self.unique_plates:
+                f.write("\nPLAQUES UNIQUES:\n")
+                f.write("-"*40 + "\n")
+                for text in sorted(self.unique_plates):
+                    f.write(f"  {text}\n")
+        
+        return self.summary_path
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,134 @@
+"""
+Cache disque des résultats, adressé par le contenu des images
+"""
+
+import os
+import json
+import hashlib
+import tempfile
+import threading
+from collections import OrderedDict
+import numpy as np
+from constants import CACHE_DIR, CACHE_MAX_BYTES, CACHE_VERSION
+
+def json_default(value):
+    """Convertit les types numpy pour la sérialisation JSON"""
+    if isinstance(value, np.integer):
+        return int(value)
+    if isinstance(value, np.floating):
+        return float(value)
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    raise TypeError(f"Type non sérialisable: {type(value).__name__}")
+
+def config_fingerprint(**config):
+    """Empreinte de la configuration du pipeline"""
+    payload = json.dumps(
+        {'version': CACHE_VERSION, **config},
+        sort_keys=True, default=json_default
+    )
+    return hashlib.blake2b(payload.encode('utf-8'), digest_size=8).hexdigest()
+
+class ResultCache:
+    """Cache des résultats sur disque, éviction LRU par taille
+    
+    La clé combine un hachage rapide (BLAKE2b) des octets de l'image et
+    l'empreinte de la configuration : tout changement de profil, de
+    formats ou de langues OCR invalide les entrées. Utilisable depuis
+    plusieurs threads (service HTTP).
+    """
+    
+    def __init__(self, fingerprint, cache_dir=CACHE_DIR, max_bytes=CACHE_MAX_BYTES):
+        self.fingerprint = fingerprint
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        
+        os.makedirs(cache_dir, exist_ok=True)
+        
+        # clé -> taille, du moins au plus récemment utilisé
+        self._entries = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self._load_index()
+    
+    def _load_index(self):
+        """Reconstruit l'index LRU depuis le disque (date d'accès = mtime)"""
+        found = []
+        for shard in os.scandir(self.cache_dir):
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                if entry.name.endswith('.json'):
+                    stat = entry.stat()
+                    found.append((stat.st_mtime, entry.name[:-5], stat.st_size))
+        
+        for _, key, size in sorted(found):
+            self._entries[key] = size
+            self._total_bytes += size
+    
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key[:2], f"{key}.json")
+    
+    def key(self, data):
+        """Clé de cache pour les octets d'une image"""
+        digest = hashlib.blake2b(data, digest_size=16)
+        digest.update(self.fingerprint.encode('ascii'))
+        return digest.hexdigest()
+    
+    def get(self, key):
+        """Retourne le résultat en cache ou None"""
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                value = json.load(f)
+            os.utime(path)
+        except (OSError, ValueError):
+            with self._lock:
+                self.misses += 1
+                self._total_bytes -= self._entries.pop(key, 0)
+            return None
+        
+        with self._lock:
+            self.hits += 1
+            if key in self._entries:
+                self._entries.move_to_end(key)
+        return value
+    
+    def put(self, key, value):
+        """Enregistre un résultat (écriture atomique)
+        
+        Fichier temporaire unique par écriture: plusieurs threads ou
+        processus peuvent écrire la même clé en même temps.
+        """
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        
+        data = json.dumps(value, default=json_default).encode('utf-8')
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+        
+        with self._lock:
+            self._total_bytes += len(data) - self._entries.pop(key, 0)
+            self._entries[key] = len(data)
+            self._evict()
+    
+    def _evict(self):
+        """Supprime les entrées les moins récemment utilisées (verrou tenu)"""
+        while self._total_bytes > self.max_bytes and self._entries:
+            key, size = self._entries.popitem(last=False)
+            self._total_bytes -= size
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
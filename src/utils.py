@@ -2,13 +2,25 @@
 Fonctions utilitaires pour l'ALPR
 """
 
+import os
+import re
+import sys
+import logging
+import functools
 import cv2
 import numpy as np
 from datetime import datetime
+from log import get_logger
 
-def draw_results(image, plates):
-    """Dessine les résultats sur l'image"""
-    result_image = image.copy()
+log = get_logger('utils')
+
+def draw_results(image, plates, copy=True):
+    """Dessine les résultats sur l'image
+    
+    Avec ``copy=False``, dessine directement sur ``image`` (l'appelant
+    n'en a plus besoin).
+    """
+    result_image = image.copy() if copy else image
     
     for plate in plates:
         bbox = plate['bbox']
@@ -48,8 +60,27 @@ def draw_results(image, plates):
     
     return result_image
 
+@functools.lru_cache(maxsize=None)
+def has_display():
+    """Vrai si une fenêtre peut être ouverte (écran et OpenCV avec GUI)"""
+    if sys.platform.startswith('linux') and not (
+            os.environ.get('DISPLAY') or os.environ.get('WAYLAND_DISPLAY')):
+        return False
+    
+    # opencv-python-headless: pas de module d'interface
+    return not re.search(r'^\s*GUI:\s*NONE\s*$', cv2.getBuildInformation(), re.M)
+
+def is_interactive():
+    """Vrai si le programme est lancé depuis un terminal"""
+    return sys.stdin is not None and sys.stdin.isatty()
+
+def pause_before_exit(headless=False):
+    """Garde la console ouverte, seulement en usage interactif"""
+    if not headless and is_interactive() and has_display():
+        input("\nAppuyez sur Entrée pour quitter...")
+
 def display_image(image, title="Résultat", timeout=3000):
-    """Affiche une image temporairement"""
+    """Affiche une image temporairement (bloquant, hors pipeline)"""
     cv2.imshow(title, image)
     cv2.waitKey(timeout)
     cv2.destroyAllWindows()
@@ -58,24 +89,34 @@ def get_timestamp():
     """Retourne un timestamp formaté"""
     return datetime.now().strftime("%Y%m%d_%H%M%S")
 
-def print_summary(input_path, plates, output_files):
-    """Affiche un résumé des résultats"""
-    print("\n" + "="*50)
-    print("📊 RÉSUMÉ DE L'ANALYSE")
-    print("="*50)
+def print_summary(input_path, plates, output_files, level=logging.INFO):
+    """Affiche un résumé des résultats (au niveau de log ``level``)"""
+    if not log.isEnabledFor(level):
+        return
     
-    print(f"\n📁 Fichier: {input_path}")
-    print(f"📅 Horodatage: {get_timestamp()}")
+    lines = [
+        "\n" + "="*50,
+        "📊 RÉSUMÉ DE L'ANALYSE",
+        "="*50,
+        f"\n📁 Fichier: {input_path}",
+        f"📅 Horodatage: {get_timestamp()}",
+    ]
     
     if plates:
-        print(f"\n✅ {len(plates)} plaque(s) détectée(s):")
+        lines.append(f"\n✅ {len(plates)} plaque(s) détectée(s):")
         for plate in plates:
-            print(f"  • {plate['text']} ({plate['confidence']:.1%})")
+            lines.append(f"  • {plate['text']} ({plate['confidence']:.1%})")
     else:
-        print("\n⚠️  Aucune plaque détectée")
+        lines.append("\n⚠️  Aucune plaque détectée")
     
     if output_files:
-        print(f"\n💾 Fichiers générés:")
+        lines.append(f"\n💾 Fichiers générés:")
         for key, path in output_files.items():
             if path and key != 'plates':
-                print(f"  • {key}: {path}")
\ No newline at end of file
+                lines.append(f"  • {key}: {path}")
+    
+    log.log(level, "\n".join(lines), extra={'fields': {
+        'event': 'image', 'path': input_path,
+        'plates': [{'text': p['text'], 'confidence': p['confidence']} for p in plates],
+        'outputs': {k: v for k, v in output_files.items() if k != 'plates'},
+    }})
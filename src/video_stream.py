@@ -0,0 +1,297 @@
+"""
+Traitement de flux vidéo (fichier, caméra, RTSP)
+
+Un thread producteur lit les frames dans une file bornée ; le pipeline
+saute des frames quand il prend du retard et suit les plaques d'une frame
+à l'autre pour ne lancer l'OCR qu'une fois par véhicule.
+"""
+
+import time
+import queue
+import threading
+from collections import defaultdict
+import cv2
+import numpy as np
+from boxes import iou_matrix
+
+def is_live_source(source):
+    """Flux temps réel (caméra ou URL) plutôt que fichier"""
+    if isinstance(source, int) or str(source).isdigit():
+        return True
+    return str(source).lower().startswith(('rtsp://', 'rtmp://', 'http://', 'https://'))
+
+class FrameReader(threading.Thread):
+    """Lit les frames d'une source ``cv2.VideoCapture`` dans une file bornée
+    
+    Pour un flux temps réel, la frame la plus ancienne est jetée quand la
+    file est pleine ; pour un fichier, le producteur attend le pipeline.
+    """
+    
+    def __init__(self, source, max_queue=8, drop_when_full=None):
+        super().__init__(daemon=True)
+        self.source = int(source) if str(source).isdigit() else source
+        self.frames = queue.Queue(maxsize=max_queue)
+        self.drop_when_full = (is_live_source(source)
+                               if drop_when_full is None else drop_when_full)
+        self.fps = 0.0
+        self.frames_read = 0
+        self.dropped = 0
+        self._opened = threading.Event()
+        self._stop_event = threading.Event()
+    
+    def open(self, timeout=10):
+        """Démarre la lecture et attend l'ouverture de la source"""
+        self.start()
+        
+        if not self._opened.wait(timeout):
+            self.stop()
+            raise TimeoutError(f"Source vidéo non ouverte après {timeout} s: {self.source}")
+        
+        if self.fps is None:
+            raise ValueError(f"Impossible d'ouvrir la source vidéo: {self.source}")
+        
+        return self
+    
+    def stop(self):
+        """Demande l'arrêt du producteur"""
+        self._stop_event.set()
+    
+    def _put(self, item):
+        """Ajoute une frame (en jetant la plus ancienne si besoin)
+        
+        Retourne False si l'arrêt a été demandé avant l'ajout.
+        """
+        while not self._stop_event.is_set():
+            try:
+                self.frames.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                if self.drop_when_full:
+                    try:
+                        self.frames.get_nowait()
+                        self.dropped += 1
+                    except queue.Empty:
+                        pass
+        return False
+    
+    def _put_end(self):
+        """Ajoute la fin de flux, même après stop(): le consommateur s'arrête"""
+        if self._put(None):
+            return
+        
+        while True:
+            try:
+                self.frames.put_nowait(None)
+                return
+            except queue.Full:
+                try:
+                    self.frames.get_nowait()
+                    self.dropped += 1
+                except queue.Empty:
+                    pass
+    
+    def run(self):
+        capture = cv2.VideoCapture(self.source)
+        
+        if not capture.isOpened():
+            self.fps = None
+            self._opened.set()
+            return
+        
+        self.fps = capture.get(cv2.CAP_PROP_FPS) or 25.0
+        self._opened.set()
+        
+        try:
+            while not self._stop_event.is_set():
+                ok, frame = capture.read()
+                if not ok:
+                    break
+                
+                self._put((self.frames_read, frame))
+                self.frames_read += 1
+        finally:
+            capture.release()
+            self._put_end()
+    
+    def __iter__(self):
+        """Itère sur (index, frame) jusqu'à la fin du flux"""
+        while True:
+            item = self.frames.get()
+            if item is None:
+                return
+            yield item
+
+class PlateTrack:
+    """Suivi d'une plaque au fil des frames"""
+    
+    def __init__(self, track_id, bbox, frame_index):
+        self.id = track_id
+        self.bbox = bbox
+        self.first_frame = frame_index
+        self.last_frame = frame_index
+        self.reads = []
+        self.attempts = 0
+    
+    def add_read(self, text, confidence):
+        self.reads.append((text, confidence))
+    
+    def needs_ocr(self, max_reads):
+        """Vrai tant que la lecture n'est pas consolidée
+        
+        Au plus ``max_reads`` passages OCR, réussis ou non (région non
+        lisible ou faux positif).
+        """
+        if self.attempts >= max_reads:
+            return False
+        
+        # Deux lectures identiques suffisent
+        texts = [text for text, _ in self.reads]
+        return not any(texts.count(text) >= 2 for text in texts)
+    
+    def vote(self):
+        """Texte retenu: somme des confiances par texte lu"""
+        if not self.reads:
+            return None
+        
+        scores = defaultdict(float)
+        for text, confidence in self.reads:
+            scores[text] += confidence
+        
+        text = max(scores, key=scores.get)
+        confidences = [c for t, c in self.reads if t == text]
+        
+        return {
+            'track_id': self.id,
+            'text': text,
+            'confidence': max(confidences),
+            'votes': len(confidences),
+            'reads': len(self.reads),
+            'first_frame': self.first_frame,
+            'last_frame': self.last_frame,
+            'bbox': self.bbox
+        }
+
+class PlateTracker:
+    """Associe les détections aux pistes existantes (IoU glouton)"""
+    
+    def __init__(self, iou_threshold=0.3, max_missed=15):
+        self.iou_threshold = iou_threshold
+        self.max_missed = max_missed
+        self.tracks = []
+        self._next_id = 1
+    
+    def update(self, frame_index, boxes):
+        """Met à jour les pistes
+        
+        Retourne (pistes associées à chaque boîte, pistes terminées).
+        """
+        assigned = [None] * len(boxes)
+        
+        if self.tracks and boxes:
+            ious = iou_matrix([t.bbox for t in self.tracks], boxes)
+            
+            # Meilleures paires d'abord
+            for flat in np.argsort(-ious, axis=None):
+                t, b = divmod(int(flat), len(boxes))
+                if ious[t, b] < self.iou_threshold:
+                    break
+                track = self.tracks[t]
+                if assigned[b] is None and track.last_frame != frame_index:
+                    track.bbox = boxes[b]
+                    track.last_frame = frame_index
+                    assigned[b] = track
+        
+        for b, box in enumerate(boxes):
+            if assigned[b] is None:
+                track = PlateTrack(self._next_id, box, frame_index)
+                self._next_id += 1
+                self.tracks.append(track)
+                assigned[b] = track
+        
+        finished = [t for t in self.tracks
+                    if frame_index - t.last_frame > self.max_missed]
+        self.tracks = [t for t in self.tracks if t not in finished]
+        
+        return assigned, finished
+    
+    def flush(self):
+        """Termine toutes les pistes (fin du flux)"""
+        finished, self.tracks = self.tracks, []
+        return finished
+
+class VideoProcessor:
+    """Détection + suivi + OCR consolidé sur un flux vidéo
+    
+    ``recognize(rois)`` retourne, pour chaque ROI, un tuple
+    (texte, confiance) ou None. ``on_frame(frame, tracks)``, si donné, est
+    appelé après chaque frame traitée (aperçu).
+    """
+    
+    def __init__(self, detector, recognize, max_reads=3, max_stride=8,
+                 iou_threshold=0.3, max_missed=15, debug=False, on_frame=None):
+        self.detector = detector
+        self.recognize = recognize
+        self.on_frame = on_frame
+        self.max_reads = max_reads
+        self.max_stride = max_stride
+        self.tracker = PlateTracker(iou_threshold, max_missed)
+        self.debug = debug
+        self.stats = {'frames': 0, 'processed': 0, 'skipped': 0,
+                      'dropped': 0, 'ocr_calls': 0}
+    
+    def _process_frame(self, index, frame):
+        """Traite une frame et retourne les pistes terminées"""
+        regions = self.detector.find_plates(frame)
+        tracks, finished = self.tracker.update(index, [r['bbox'] for r in regions])
+        
+        # OCR uniquement pour les pistes non consolidées
+        pending = [(region, track) for region, track in zip(regions, tracks)
+                   if track.needs_ocr(self.max_reads)]
+        
+        if pending:
+            self.stats['ocr_calls'] += len(pending)
+            reads = self.recognize([region['roi'] for region, _ in pending])
+            
+            for (_, track), read in zip(pending, reads):
+                track.attempts += 1
+                if read:
+                    track.add_read(*read)
+        
+        return finished
+    
+    def run(self, reader):
+        """Traite le flux et génère une lecture consolidée par piste"""
+        fps = reader.fps or 25.0
+        next_index = 0
+        stride = 1
+        
+        for index, frame in reader:
+            self.stats['frames'] += 1
+            
+            # Saut adaptatif: le pipeline est en retard sur la source
+            if index < next_index:
+                self.stats['skipped'] += 1
+                continue
+            
+            start = time.perf_counter()
+            finished = self._process_frame(index, frame)
+            elapsed = time.perf_counter() - start
+            
+            self.stats['processed'] += 1
+            stride = int(min(self.max_stride, max(1, round(elapsed * fps))))
+            next_index = index + stride
+            
+            if self.on_frame is not None:
+                self.on_frame(frame, self.tracker.tracks)
+            
+            for track in finished:
+                read = track.vote()
+                if read:
+                    yield read
+        
+        self.stats['dropped'] = reader.dropped
+        
+        for track in self.tracker.flush():
+            read = track.vote()
+            if read:
+                yield read
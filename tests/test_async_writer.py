@@ -0,0 +1,36 @@
+"""
+Tests pour l'écriture asynchrone des images
+"""
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from async_writer import AsyncImageWriter
+import cv2
+import numpy as np
+
+def test_writes_all_images(tmp_path):
+    """File bornée: toutes les images sont écrites après flush"""
+    writer = AsyncImageWriter(max_workers=2, max_pending=2, jpeg_quality=80)
+    
+    for i in range(10):
+        writer.submit(str(tmp_path / f"{i}.jpg"), np.full((60, 120, 3), i * 20, np.uint8))
+    writer.flush()
+    
+    assert writer.written == 10
+    image = cv2.imread(str(tmp_path / "9.jpg"))
+    assert image.shape == (60, 120, 3)
+    
+    writer.close()
+    print(f"✅ {writer.written} images écrites")
+
+def test_errors_are_collected(tmp_path):
+    """Une écriture impossible n'interrompt pas les autres"""
+    with AsyncImageWriter(image_format='png') as writer:
+        writer.submit(str(tmp_path / "absent" / "x.png"), np.zeros((8, 8), np.uint8))
+        writer.submit(str(tmp_path / "ok.png"), np.zeros((8, 8), np.uint8))
+    
+    assert writer.written == 1
+    assert len(writer.errors) == 1
+    assert (tmp_path / "ok.png").exists()
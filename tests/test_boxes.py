@@ -0,0 +1,53 @@
+"""
+Tests pour la suppression des doublons (boîtes et lectures)
+"""
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import numpy as np
+from boxes import iou_matrix, nms, union_box
+from ocr_engine import OCREngine
+
+def test_nms_keeps_best_of_overlapping_boxes():
+    """Recouvrement ou inclusion: seule la meilleure boîte reste"""
+    boxes = [[0, 0, 100, 40],      # plaque
+             [4, 2, 104, 42],      # même plaque, contour décalé
+             [20, 10, 60, 30],     # incluse dans la plaque
+             [300, 0, 400, 40]]    # autre plaque
+    keep, groups = nms(boxes, [0.9, 0.8, 0.5, 0.7])
+    
+    assert keep == [0, 3]
+    assert sorted(groups[0]) == [1, 2]
+    assert groups[3] == []
+    assert union_box([boxes[0], boxes[1]]) == [0, 0, 104, 42]
+    print(f"✅ Gardées: {keep}")
+
+def test_iou_matrix_is_vectorized():
+    """Matrice IoU sur toutes les paires"""
+    ious = iou_matrix([[0, 0, 10, 10], [5, 0, 15, 10]], [[0, 0, 10, 10]])
+    
+    assert ious.shape == (2, 1)
+    assert np.isclose(ious[0, 0], 1.0)
+    assert np.isclose(ious[1, 0], 1 / 3)
+    print("✅ IoU vectorisé")
+
+def test_deduplicate_plates_by_text_and_box():
+    """Même texte ou même emplacement: une seule lecture"""
+    box = lambda x: [[x, 0], [x + 100, 0], [x + 100, 30], [x, 30]]
+    plates = [
+        {'text': 'AB-123-CD', 'confidence': 0.7, 'bbox': box(0)},
+        {'text': 'AB123CD', 'confidence': 0.9, 'bbox': box(500)},
+        {'text': 'AB-123-C0', 'confidence': 0.6, 'bbox': box(5)},
+        {'text': 'EF-456-GH', 'confidence': 0.8, 'bbox': box(200)},
+    ]
+    kept = OCREngine.deduplicate_plates(plates)
+    
+    assert [p['text'] for p in kept] == ['AB123CD', 'EF-456-GH']
+    print(f"✅ {len(plates)} lectures -> {len(kept)}")
+
+if __name__ == "__main__":
+    test_nms_keeps_best_of_overlapping_boxes()
+    test_iou_matrix_is_vectorized()
+    test_deduplicate_plates_by_text_and_box()
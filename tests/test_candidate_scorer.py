@@ -0,0 +1,46 @@
+"""
+Tests pour le score des régions candidates
+"""
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import cv2
+import numpy as np
+from candidate_scorer import CandidateScorer
+
+def plate_roi(text="AB-123-CD"):
+    roi = np.full((60, 280, 3), 235, dtype=np.uint8)
+    cv2.putText(roi, text, (12, 44), cv2.FONT_HERSHEY_SIMPLEX, 1.3, (0, 0, 0), 3)
+    return roi
+
+def test_plate_scores_above_clutter():
+    """Texte de plaque: score élevé ; fond uni ou bruit: rejeté"""
+    scorer = CandidateScorer()
+    rng = np.random.default_rng(0)
+    
+    plate = scorer.score(plate_roi())
+    flat = scorer.score(np.full((60, 280, 3), 128, dtype=np.uint8))
+    stripes = np.zeros((60, 280), dtype=np.uint8)
+    stripes[:, ::2] = 255
+    noise = rng.integers(0, 255, (60, 280), dtype=np.uint8)
+    
+    assert plate > 0.8
+    assert flat == 0.0
+    assert scorer.score(stripes) < scorer.min_score
+    assert scorer.score(noise) < scorer.min_score
+    print(f"✅ Plaque: {plate:.2f}")
+
+def test_rank_applies_threshold_and_top_k():
+    """Tri par confiance, seuil puis top-K"""
+    regions = [{'roi': np.full((60, 280), 128, dtype=np.uint8)}] + \
+              [{'roi': plate_roi(text)} for text in ("AB-123-CD", "EF-456-GH", "JK-789-LM")]
+    
+    ranked = CandidateScorer(top_k=2, min_score=0.35).rank(regions)
+    
+    assert len(ranked) == 2
+    assert ranked[0]['confidence'] >= ranked[1]['confidence'] >= 0.35
+    assert all(r is not regions[0] for r in ranked)
+    assert len(CandidateScorer(top_k=0, min_score=0).rank(regions)) == 4
+    print("✅ Classement")
@@ -0,0 +1,55 @@
+"""
+Tests pour le décodage réduit et la réutilisation des tampons
+"""
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import cv2
+import numpy as np
+from io_manager import jpeg_size, decode_image_reduced
+from preprocessor import ImagePreprocessor
+
+def encode(width, height, ext='.jpg'):
+    image = np.random.default_rng(0).integers(0, 255, (height, width, 3), dtype=np.uint8)
+    return cv2.imencode(ext, image)[1].tobytes()
+
+def test_jpeg_size():
+    """Dimensions lues dans l'en-tête, None hors JPEG"""
+    assert jpeg_size(encode(640, 360)) == (640, 360)
+    assert jpeg_size(memoryview(encode(33, 17))) == (33, 17)
+    assert jpeg_size(encode(64, 64, '.png')) is None
+    print("✅ En-tête JPEG")
+
+def test_reduced_decode_keeps_min_width():
+    """Facteur le plus fort qui garde la largeur minimale"""
+    data = encode(3840, 2160)
+    
+    image, scale = decode_image_reduced(data, min_width=1920)
+    assert image.shape[:2] == (1080, 1920) and scale == 2.0
+    
+    image, scale = decode_image_reduced(data, min_width=900)
+    assert image.shape[1] == 960 and scale == 4.0
+    
+    image, scale = decode_image_reduced(data, min_width=0)
+    assert image.shape[1] == 3840 and scale == 1.0
+    print("✅ Décodage réduit")
+
+def test_preprocess_reuses_buffers():
+    """Même résolution: les sorties d'étapes sont réutilisées"""
+    preprocessor = ImagePreprocessor('fast')
+    image = np.random.default_rng(1).integers(0, 255, (720, 1280, 3), dtype=np.uint8)
+    
+    first = preprocessor.preprocess_for_ocr(image)
+    expected = first.copy()
+    allocated = preprocessor.pool.allocated
+    
+    second = preprocessor.preprocess_for_ocr(image)
+    
+    assert second is first
+    assert preprocessor.pool.allocated == allocated
+    assert np.array_equal(second, expected)
+    assert np.array_equal(second, ImagePreprocessor('fast', reuse_buffers=False)
+                          .preprocess_for_ocr(image))
+    print(f"✅ {preprocessor.pool.reused} tampon(s) réutilisé(s)")
@@ -0,0 +1,90 @@
+"""
+Tests pour les moteurs de détection
+"""
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import cv2
+import numpy as np
+import pytest
+from detector import PlateDetector
+from detection_engines import ENGINES, create_engines
+
+PLATE = (300, 250, 700, 340)
+
+def street_image(shading=False):
+    """Plaque claire sur carrosserie sombre, éclairage optionnellement inégal"""
+    image = np.full((600, 1000, 3), 60, dtype=np.uint8)
+    cv2.rectangle(image, PLATE[:2], PLATE[2:], (235, 235, 235), -1)
+    cv2.putText(image, "AB-123-CD", (PLATE[0] + 30, PLATE[1] + 65),
+                cv2.FONT_HERSHEY_SIMPLEX, 1.8, (0, 0, 0), 5)
+    
+    if shading:
+        gain = np.linspace(0.25, 1.0, image.shape[1], dtype=np.float32)
+        image = (image * gain[None, :, None]).astype(np.uint8)
+    return image
+
+def overlaps_plate(regions):
+    x1, y1, x2, y2 = PLATE
+    return any(r['bbox'][0] < x2 and r['bbox'][2] > x1 and
+               r['bbox'][1] < y2 and r['bbox'][3] > y1 for r in regions)
+
+@pytest.mark.parametrize('name', sorted(ENGINES))
+def test_each_engine_finds_plate(name):
+    """Chaque moteur seul trouve la plaque"""
+    detector = PlateDetector(engines=[name])
+    regions = detector.find_plates(street_image())
+    
+    assert overlaps_plate(regions), name
+    assert all(r['engine'] == name for r in regions)
+    assert all(r['area'] > 0 and r['aspect_ratio'] > 1 for r in regions)
+    print(f"✅ {name}: {len(regions)} région(s)")
+
+def test_chain_stops_at_first_confident_engine():
+    """En chaîne, les moteurs suivants ne tournent pas si le premier est sûr"""
+    detector = PlateDetector(engines=['contours', 'morphology', 'mser'], mode='chain')
+    detector.find_plates(street_image())
+    runs = {name: s['runs'] for name, s in detector.stats['engines'].items()}
+    
+    assert runs == {'contours': 1, 'morphology': 0, 'mser': 0}
+    
+    detector = PlateDetector(engines=['contours', 'morphology', 'mser'], mode='all')
+    regions = detector.find_plates(street_image(shading=True))
+    
+    assert all(s['runs'] == 1 for s in detector.stats['engines'].values())
+    assert overlaps_plate(regions)
+    print("✅ Chaîne / tous les moteurs")
+
+def test_merge_keeps_area_and_ratio():
+    """Deux régions quasi identiques fusionnées: surface et ratio de l'union"""
+    detector = PlateDetector()
+    image = street_image()
+    regions = [
+        {'bbox': [300, 250, 700, 340], 'work_bbox': [300, 250, 700, 340],
+         'roi': image[250:340, 300:700], 'confidence': 0.9,
+         'aspect_ratio': 400 / 90, 'area': 30000.0},
+        {'bbox': [310, 250, 710, 340], 'work_bbox': [310, 250, 710, 340],
+         'roi': image[250:340, 310:710], 'confidence': 0.8,
+         'aspect_ratio': 400 / 90, 'area': 29000.0},
+    ]
+    
+    merged, = detector._merge_duplicates(regions, image)
+    
+    assert merged['bbox'] == [300, 250, 710, 340]
+    assert merged['area'] == 410 * 90
+    assert merged['aspect_ratio'] == 410 / 90
+
+def test_unknown_engine_rejected():
+    with pytest.raises(ValueError):
+        create_engines(['contours', 'hough'])
+    with pytest.raises(ValueError):
+        PlateDetector(mode='vote')
+
+if __name__ == "__main__":
+    for name in sorted(ENGINES):
+        test_each_engine_finds_plate(name)
+    test_chain_stops_at_first_confident_engine()
+    test_merge_keeps_area_and_ratio()
+    test_unknown_engine_rejected()
@@ -7,6 +7,7 @@ import os
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
 
 from detector import PlateDetector
+from detection_engines import contour_rects
 import cv2
 import numpy as np
 
@@ -32,5 +33,82 @@ def test_detector():
     
     return len(plates) > 0
 
+def test_detector_large_frame():
+    """Les ROI d'une image 4K sont extraites au bon endroit"""
+    print("🧪 Test du détecteur (image 4K)...")
+    
+    # Plaque blanche dans le coin inférieur droit d'une image 3840x2160
+    test_image = np.zeros((2160, 3840, 3), dtype=np.uint8)
+    plate = (2600, 1500, 3120, 1610)
+    cv2.rectangle(test_image, plate[:2], plate[2:], (255, 255, 255), -1)
+    cv2.putText(test_image, "AB-123-CD", (2640, 1585),
+                cv2.FONT_HERSHEY_SIMPLEX, 3, (0, 0, 0), 8)
+    
+    detector = PlateDetector()
+    plates = detector.find_plates(test_image)
+    
+    print(f"  Régions trouvées: {len(plates)}")
+    assert plates, "aucune région détectée"
+    
+    # La bbox est en coordonnées de l'image originale
+    x1, y1, x2, y2 = plates[0]['bbox']
+    assert abs(x1 - plate[0]) < 10 and abs(y1 - plate[1]) < 10
+    assert abs(x2 - plate[2]) < 10 and abs(y2 - plate[3]) < 10
+    
+    # La ROI est en pleine résolution et contient la plaque
+    roi = plates[0]['roi']
+    assert roi.shape[1] >= plate[2] - plate[0] - 10
+    assert roi.mean() > 150
+    
+    print("✅ Test réussi")
+
+def test_refine_rois_full_resolution():
+    """Image décodée réduite: petites plaques relues en pleine résolution"""
+    full = np.zeros((2160, 3840, 3), dtype=np.uint8)
+    plate = (2600, 1500, 2960, 1580)
+    cv2.rectangle(full, plate[:2], plate[2:], (255, 255, 255), -1)
+    cv2.putText(full, "AB-123-CD", (2620, 1560),
+                cv2.FONT_HERSHEY_SIMPLEX, 2, (0, 0, 0), 5)
+    reduced = cv2.resize(full, (1920, 1080), interpolation=cv2.INTER_AREA)
+    
+    detector = PlateDetector()
+    decodes = []
+    
+    def decode_full():
+        decodes.append(1)
+        return full
+    
+    regions = detector.refine_rois(detector.find_plates(reduced), decode_full, 2.0)
+    assert regions and len(decodes) == 1
+    
+    # ROI extraite de l'image complète, deux fois plus grande
+    region = regions[0]
+    x1, y1, x2, y2 = region['bbox']
+    assert region['roi_scale'] == 2.0
+    assert region['roi_bbox'] == [x1 * 2, y1 * 2, x2 * 2, y2 * 2]
+    assert region['roi'].shape[0] == (y2 - y1) * 2
+    
+    # Régions assez hautes (ou image pleine résolution): aucun décodage
+    regions = detector.refine_rois(detector.find_plates(reduced), decode_full, 2.0,
+                                   min_height=10)
+    assert len(decodes) == 1 and 'roi_scale' not in regions[0]
+    detector.refine_rois(detector.find_plates(full), decode_full, 1.0)
+    assert len(decodes) == 1
+
+def test_contour_rects():
+    """Les rectangles vectorisés reproduisent cv2.boundingRect"""
+    rng = np.random.default_rng(0)
+    noise = (rng.random((300, 400)) > 0.6).astype(np.uint8) * 255
+    contours, _ = cv2.findContours(noise, cv2.RETR_EXTERNAL,
+                                   cv2.CHAIN_APPROX_SIMPLE)
+    
+    rects = contour_rects(contours)
+    
+    assert len(contours) > 100
+    for contour, rect in zip(contours, rects):
+        assert tuple(rect) == cv2.boundingRect(contour)
+
 if __name__ == "__main__":
-    test_detector()
\ No newline at end of file
+    test_detector()
+    test_detector_large_frame()
+    test_contour_rects()
\ No newline at end of file
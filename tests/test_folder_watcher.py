@@ -0,0 +1,78 @@
+"""
+Tests pour la surveillance incrémentale de dossier
+"""
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from folder_watcher import FolderWatcher, ProcessedIndex, scan_images
+
+def touch(path, data=b'x'):
+    with open(path, 'wb') as f:
+        f.write(data)
+
+def test_scan_images(tmp_path):
+    """Un seul parcours, extensions insensibles à la casse"""
+    for name in ("b.JPG", "a.png", "notes.txt"):
+        touch(tmp_path / name)
+    (tmp_path / "sub.jpg").mkdir()
+    
+    names = [os.path.basename(p) for p in scan_images(str(tmp_path))]
+    assert names == ["a.png", "b.JPG"]
+    print(f"✅ {names}")
+
+def test_index_persists_and_detects_changes(tmp_path):
+    """Nouveaux et modifiés seulement, d'une exécution à l'autre"""
+    db = str(tmp_path / "index.sqlite3")
+    index = ProcessedIndex(db)
+    index.mark([("/x/a.jpg", 10, 100, 1), ("/x/b.jpg", 20, 200, 0)])
+    index.close()
+    
+    index = ProcessedIndex(db)
+    entries = [("/x/a.jpg", 10, 100), ("/x/b.jpg", 20, 201), ("/x/c.jpg", 5, 50)]
+    pending = [path for path, _, _ in index.unprocessed(entries)]
+    
+    assert len(index) == 2
+    assert pending == ["/x/b.jpg", "/x/c.jpg"]
+    index.close()
+    print(f"✅ À traiter: {pending}")
+
+def test_polling_watcher_yields_only_new_files(tmp_path):
+    """Fallback polling: lot initial puis seulement les nouveaux fichiers"""
+    folder = tmp_path / "input"
+    folder.mkdir()
+    touch(folder / "a.jpg")
+    
+    index = ProcessedIndex(":memory:")
+    watcher = FolderWatcher(str(folder), index, settle=0, use_inotify=False)
+    assert watcher.mode == 'polling'
+    
+    first = watcher.poll(0)
+    assert [os.path.basename(p) for p, _, _ in first] == ["a.jpg"]
+    index.mark([(*e, 0) for e in first])
+    
+    # Rien de nouveau: pas de lot
+    assert watcher.poll(0) == []
+    
+    touch(folder / "b.jpg")
+    os.utime(folder, ns=(0, os.stat(folder).st_mtime_ns + 1))
+    second = watcher.poll(0)
+    assert [os.path.basename(p) for p, _, _ in second] == ["b.jpg"]
+    
+    watcher.close()
+    print("✅ Seuls les nouveaux fichiers sont rendus")
+
+def test_inotify_watcher(tmp_path):
+    """inotify (si disponible): fichier écrit après le démarrage"""
+    index = ProcessedIndex(":memory:")
+    watcher = FolderWatcher(str(tmp_path), index, settle=0)
+    
+    assert watcher.poll(0) == []
+    touch(tmp_path / "new.png")
+    
+    batch = watcher.poll(1.0) or watcher.poll(1.0)
+    assert [os.path.basename(p) for p, _, _ in batch] == ["new.png"]
+    
+    watcher.close()
+    print(f"✅ Mode {watcher.mode}")
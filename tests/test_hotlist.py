@@ -0,0 +1,51 @@
+"""
+Tests pour la liste de surveillance
+"""
+
+import sys
+import os
+import json
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from hotlist import Hotlist, AlertSink, fold, weighted_distance
+
+def test_confusions_are_cheap():
+    """O/0, B/8... coûtent moins qu'une vraie erreur"""
+    assert fold("AB123CD") == fold("A8123C0")
+    assert weighted_distance("AB123CD", "A8123CD", 0.25) == 0.25
+    assert weighted_distance("AB123CD", "AX123CD", 0.25) == 1.0
+    assert weighted_distance("AB123CD", "ZZ999ZZ", 0.25, max_cost=1) == float('inf')
+    print("✅ Coûts pondérés")
+
+def test_match_within_distance(tmp_path):
+    """Lectures bruitées retrouvées, plaques éloignées ignorées"""
+    path = tmp_path / "hotlist.csv"
+    path.write_text("# plaques surveillées\nAB-123-CD,vol\nGH-456-JK\n", encoding='utf-8')
+    hotlist = Hotlist.load(str(path), max_distance=1.0)
+    
+    assert len(hotlist) == 2
+    
+    matches = hotlist.match("A8-I23-C0")
+    assert [(m['plate'], m['distance'], m['reason']) for m in matches] == \
+        [("AB-123-CD", 0.75, "vol")]
+    
+    assert hotlist.match("GH-456-JX")[0]['distance'] == 1.0
+    assert hotlist.match("GH-45-JX") == []
+    assert hotlist.match("XY-999-ZZ") == []
+    print("✅ Correspondances floues")
+
+def test_alert_sink(tmp_path):
+    """Une ligne JSON par alerte"""
+    path = str(tmp_path / "alerts.jsonl")
+    hotlist = Hotlist(["AB-123-CD"])
+    plate = {'text': "AB-123-C0", 'confidence': 0.8}
+    
+    with AlertSink(path) as sink:
+        sink.alert("cam1.jpg", plate, hotlist.match(plate['text'])[0])
+    
+    with open(path, encoding='utf-8') as f:
+        records = [json.loads(line) for line in f]
+    
+    assert len(records) == 1
+    assert records[0]['hotlist'] == "AB-123-CD" and records[0]['source'] == "cam1.jpg"
+    print("✅ Alerte enregistrée")
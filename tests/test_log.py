@@ -0,0 +1,42 @@
+"""
+Tests pour la journalisation structurée
+"""
+
+import sys
+import os
+import io
+import json
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from log import get_logger, setup_logging, ProgressReporter
+
+def test_json_output_and_quiet():
+    """JSON: une ligne par message ; quiet: rien sous WARNING"""
+    stream = io.StringIO()
+    setup_logging('info', json_output=True, stream=stream)
+    log = get_logger('test')
+    
+    log.info("📸 %d image(s)", 3, extra={'fields': {'event': 'start'}})
+    entry = json.loads(stream.getvalue())
+    assert entry['msg'] == "📸 3 image(s)"
+    assert entry['event'] == 'start'
+    
+    stream = io.StringIO()
+    setup_logging('info', quiet=True, stream=stream)
+    log.info("par image")
+    log.debug("détail")
+    log.warning("attention")
+    assert stream.getvalue() == "attention\n"
+
+def test_progress_is_rate_limited():
+    """Une ligne par intervalle, plus la dernière"""
+    stream = io.StringIO()
+    setup_logging('info', stream=stream)
+    progress = ProgressReporter(1000, get_logger('test'), interval=60)
+    
+    for _ in range(1000):
+        progress.update()
+    
+    lines = stream.getvalue().splitlines()
+    assert len(lines) == 1
+    assert "1000/1000" in lines[0]
@@ -0,0 +1,56 @@
+"""
+Tests pour le regroupement des requêtes (micro-batching)
+"""
+
+import sys
+import os
+import threading
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from micro_batcher import MicroBatcher, QueueFullError
+import pytest
+
+def test_concurrent_items_are_batched():
+    """Des soumissions simultanées partagent un même lot"""
+    sizes = []
+    
+    def double(items):
+        sizes.append(len(items))
+        return [2 * x for x in items]
+    
+    batcher = MicroBatcher(double, max_batch=8, max_wait=0.05).start()
+    try:
+        futures = [batcher.submit(i) for i in range(20)]
+        assert [f.result(timeout=5) for f in futures] == [2 * i for i in range(20)]
+    finally:
+        batcher.stop()
+    
+    assert max(sizes) <= 8
+    assert len(sizes) < 20
+    print(f"✅ 20 éléments en {len(sizes)} lots")
+
+def test_backpressure_and_errors():
+    """File pleine: refus immédiat ; erreur du lot: propagée"""
+    release = threading.Event()
+    
+    def blocked(items):
+        release.wait()
+        raise RuntimeError("échec OCR")
+    
+    batcher = MicroBatcher(blocked, max_batch=1, max_wait=0, max_queue=2).start()
+    try:
+        first = batcher.submit(0)
+        while batcher.pending:  # le premier élément est en traitement
+            pass
+        batcher.submit(1)
+        batcher.submit(2)
+        
+        with pytest.raises(QueueFullError):
+            batcher.submit(3)
+        
+        release.set()
+        with pytest.raises(RuntimeError):
+            first.result(timeout=5)
+        assert batcher.rejected == 1
+    finally:
+        batcher.stop()
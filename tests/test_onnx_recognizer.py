@@ -0,0 +1,75 @@
+"""
+Tests pour le moteur OCR ONNX (sans onnxruntime: décodage et lots)
+"""
+
+import sys
+import os
+import tempfile
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import numpy as np
+import pytest
+from onnx_recognizer import OnnxRecognizer, ctc_greedy_decode, load_charset
+from ocr_engine import OCREngine
+
+CHARSET = list('0123456789ABCD-')
+
+def one_hot(classes, n_classes=len(CHARSET) + 1):
+    logits = np.full((len(classes), n_classes), -10.0, dtype=np.float32)
+    logits[np.arange(len(classes)), classes] = 10.0
+    return logits
+
+def test_ctc_greedy_decode():
+    """Répétitions fusionnées, blancs retirés, blanc entre deux lettres identiques"""
+    idx = {c: CHARSET.index(c) + 1 for c in CHARSET}
+    line = [0, idx['A'], idx['A'], 0, idx['A'], idx['1'], idx['1'], 0, 0, idx['-']]
+    logits = np.stack([one_hot(line), one_hot([0] * len(line))])
+    
+    (text, confidence, chars), (empty, zero, _) = ctc_greedy_decode(logits, CHARSET)
+    
+    assert text == "AA1-"
+    assert len(chars) == 4 and confidence > 0.99
+    assert empty == "" and zero == 0.0
+    print(f"✅ Décodé: {text}")
+
+def test_prepare_batch_pads_to_widest():
+    """ROI en gris à la hauteur du modèle, complétées par la dernière colonne"""
+    recognizer = OnnxRecognizer('absent.onnx', height=32)
+    narrow = np.full((16, 20, 3), 255, dtype=np.uint8)
+    wide = np.zeros((32, 100), dtype=np.uint8)
+    
+    batch = recognizer.prepare_batch([narrow, wide])
+    
+    assert batch.shape == (2, 1, 32, 100) and batch.dtype == np.float32
+    assert np.allclose(batch[0], 1.0) and np.allclose(batch[1], -1.0)
+
+def test_onnx_backend_in_ocr_engine():
+    """extract_text_batch passe par le recognizer, confiances par caractère comprises"""
+    ocr = OCREngine(backend='onnx', model_path='absent.onnx')
+    ocr.recognizer.recognize = lambda rois: [("AB123CD", 0.9, [0.9] * 7)] * len(rois)
+    
+    roi = np.zeros((40, 180, 3), dtype=np.uint8)
+    batch = ocr.extract_text_batch([roi, None, roi])
+    
+    assert [len(r) for r in batch] == [1, 0, 1]
+    assert batch[0][0][1:] == ("AB123CD", 0.9, [0.9] * 7)
+    assert ocr.process_plates(batch[0])[0]['text'] == "AB123CD"
+    assert ocr.model_id.startswith('onnx:')
+    
+    with pytest.raises(ValueError):
+        OCREngine(backend='tesseract')
+
+def test_charset_sidecar():
+    with tempfile.TemporaryDirectory() as folder:
+        model = os.path.join(folder, 'recognizer.onnx')
+        with open(model + '.charset', 'w', encoding='utf-8') as f:
+            f.write("0123AB\n")
+        
+        assert load_charset(model) == list("0123AB")
+        assert load_charset(model, {'charset': 'XY'}) == ['X', 'Y']
+
+if __name__ == "__main__":
+    test_ctc_greedy_decode()
+    test_prepare_batch_pads_to_widest()
+    test_onnx_backend_in_ocr_engine()
+    test_charset_sidecar()
@@ -0,0 +1,71 @@
+"""
+Tests pour la correction des confusions OCR
+"""
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from constants import PLATE_FORMATS
+from plate_corrector import PlateCorrector, expand_pattern
+from ocr_engine import OCREngine
+
+FR_DASH = ('FR', PLATE_FORMATS['FR'][0])
+FR = ('FR', PLATE_FORMATS['FR'][1])
+EU = ('EU', PLATE_FORMATS['EU'][0])
+
+def test_expand_pattern():
+    """Motifs développés en gabarits de cases"""
+    assert expand_pattern(r'^[A-Z]{2}-\d{3}-[A-Z]{2}$') == ['LL-DDD-LL']
+    assert len(expand_pattern(r'^[A-Z]{1,3}\d{1,4}[A-Z]{0,2}$')) == 36
+    assert expand_pattern(r'^(AB|CD)\d+$') is None
+
+def test_digit_block_preserved():
+    """Les chiffres d'une plaque AB-123-CD ne sont plus remplacés"""
+    corrector = PlateCorrector()
+    
+    assert corrector.correct("AB-123-CD") == ("AB-123-CD", FR_DASH)
+    assert corrector.correct("AB-I23-CD") == ("AB-123-CD", FR_DASH)
+    assert corrector.correct("AB-12-CD") is None
+    
+    # Au plus deux caractères corrigés par lecture
+    assert corrector.correct("A8-I5O-C0") is None
+    assert PlateCorrector(max_changes=4).correct("A8-I5O-C0") == ("AB-150-CO", FR_DASH)
+
+def test_char_confidences():
+    """Les confiances par caractère départagent les formats"""
+    corrector = PlateCorrector()
+    
+    # Lecture sûre: AB1234C reste tel quel
+    assert corrector.correct("AB1234C")[0] == "AB1234C"
+    
+    # '1' peu sûr: la lecture ABI234C devient plus probable
+    confidences = [0.9, 0.9, 0.2, 0.9, 0.9, 0.9, 0.9]
+    assert corrector.correct("AB1234C", char_confidences=confidences)[0] == "ABI234C"
+
+def test_format_from_confidences():
+    """Les confiances choisissent le format, FR ne départage qu'à coût égal"""
+    corrector = PlateCorrector()
+    
+    # Valide en FR comme en EU: FR
+    assert corrector.correct("AB123CD") == ("AB123CD", FR)
+    
+    # Lecture EU sûre: conservée
+    assert corrector.correct("B8123CD") == ("B8123CD", EU)
+    assert corrector.correct("ABI23CD") == ("ABI23CD", EU)
+    
+    # Caractère douteux: la plaque FR devient plus probable
+    confidences = [0.9, 0.3, 0.9, 0.9, 0.9, 0.9, 0.9]
+    assert corrector.correct("B8123CD", char_confidences=confidences) == ("BB123CD", FR)
+    confidences = [0.9, 0.9, 0.3, 0.9, 0.9, 0.9, 0.9]
+    assert corrector.correct("ABI23CD", char_confidences=confidences) == ("AB123CD", FR)
+
+def test_plain_words_rejected():
+    """Des mots sans chiffre ne deviennent pas des plaques"""
+    corrector = PlateCorrector()
+    ocr = OCREngine()
+    box = [[0, 0], [10, 0], [10, 10], [0, 10]]
+    
+    for word in ("STOP", "TAXI", "BUS", "SALE", "HELLO"):
+        assert corrector.correct(word) is None, word
+        assert ocr.process_plates([(box, word, 0.9)]) == [], word
@@ -0,0 +1,36 @@
+"""
+Tests pour la grammaire des plaques
+"""
+
+import sys
+import os
+import re
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from constants import PLATE_FORMATS
+from plate_grammar import PlateGrammar
+
+def test_classify():
+    """Un seul appel donne le pays et le motif"""
+    grammar = PlateGrammar()
+    
+    assert grammar.classify("AB-123-CD") == ('FR', PLATE_FORMATS['FR'][0])
+    assert grammar.classify("AB123CD") == ('FR', PLATE_FORMATS['FR'][1])
+    assert grammar.classify("ABC1234") == ('EU', PLATE_FORMATS['EU'][0])
+    assert grammar.classify("AB-12") is None
+    assert grammar.classify("") is None
+
+def test_same_result_as_pattern_loop():
+    """Même classement que l'ancienne boucle sur PLATE_FORMATS"""
+    grammar = PlateGrammar()
+    tokens = ["AB-123-CD", "AB123CD", "A1", "ABC12DE", "1234", "AB-123-CDE",
+              "ZZ999ZZ", "X1234YZ", "HELLO", "AB-1234-CD"]
+    
+    def loop(text):
+        for country, patterns in PLATE_FORMATS.items():
+            for pattern in patterns:
+                if re.match(pattern, text):
+                    return (country, pattern)
+        return None
+    
+    assert grammar.classify_batch(tokens) == [loop(t) for t in tokens]
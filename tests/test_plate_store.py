@@ -0,0 +1,69 @@
+"""
+Tests pour la base des lectures de plaques
+"""
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from plate_store import PlateStore, deletion_variants, levenshtein, plate_key
+
+def plate(text, confidence=0.9):
+    return {'text': text, 'confidence': confidence, 'format': 'FR',
+            'bbox': [[10, 20], [110, 20], [110, 50], [10, 50]]}
+
+def test_levenshtein_and_variants():
+    assert plate_key("ab-123 cd") == "AB123CD"
+    assert levenshtein("AB123CD", "AB123CD") == 0
+    assert levenshtein("AB123CD", "AB128CD") == 1
+    assert levenshtein("AB123CD", "B123CDX") == 2
+    assert "A123CD" in deletion_variants("AB123CD", 1)
+    print("✅ Distance et variantes")
+
+def test_batched_writes_and_sightings(tmp_path):
+    """Écriture en arrière-plan, recherche exacte par plaque et période"""
+    store = PlateStore(str(tmp_path / "plates.sqlite3"), batch_size=3)
+    
+    for i in range(10):
+        store.add(f"img_{i}.jpg", [plate("AB-123-CD"), plate(f"XY-{i:03d}-ZZ")],
+                  seen_at=1000.0 + i)
+    store.flush()
+    
+    assert store.written == 20
+    assert store.stats() == {'reads': 20, 'plates': 11}
+    
+    reads = store.sightings("ab123cd", since=1005)
+    assert [r['source'] for r in reads] == [f"img_{i}.jpg" for i in range(9, 4, -1)]
+    assert (reads[0]['x1'], reads[0]['y2']) == (10, 50)
+    
+    store.close()
+    print(f"✅ {len(reads)} lecture(s) de AB-123-CD")
+
+def test_fuzzy_search(tmp_path):
+    """Recherche floue via l'index des variantes"""
+    with PlateStore(str(tmp_path / "plates.sqlite3")) as store:
+        store.add("a.jpg", [plate("AB-123-CD"), plate("AB-128-CD"), plate("GH-456-JK")])
+        store.add("b.jpg", [plate("AB-123-CD")])
+        store.flush()
+        
+        matches = store.fuzzy("AB-123-CO", max_distance=1)
+        assert [m['plate'] for m in matches] == ["AB-123-CD"]
+        assert matches[0]['reads'] == 2
+        
+        matches = store.fuzzy("AB-123-CO", max_distance=2)
+        assert [m['plate'] for m in matches] == ["AB-123-CD", "AB-128-CD"]
+    
+    print("✅ Recherche floue")
+
+def test_video_read_flat_bbox(tmp_path):
+    """Lecture consolidée d'une vidéo: boîte déjà à plat, sans format"""
+    with PlateStore(str(tmp_path / "plates.sqlite3")) as store:
+        store.add("rue.mp4", [{'text': "AB-123-CD", 'confidence': 0.8,
+                               'bbox': [12, 30, 140, 62]}])
+        store.flush()
+        
+        read = store.sightings("AB123CD")[0]
+        assert (read['x1'], read['y1'], read['x2'], read['y2']) == (12, 30, 140, 62)
+        assert read['source'] == "rue.mp4"
+    
+    print("✅ Lecture vidéo enregistrée")
@@ -0,0 +1,26 @@
+"""
+Tests pour le mode sans affichage
+"""
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from preview import PreviewWindow
+from utils import pause_before_exit
+import numpy as np
+
+def test_show_never_blocks():
+    """Seule la dernière image est conservée, l'appel rend la main"""
+    preview = PreviewWindow(max_fps=1)
+    frames = [np.full((10, 10, 3), i, np.uint8) for i in range(5)]
+    
+    for frame in frames:
+        preview.show(frame)
+    
+    assert preview.skipped == 4
+    assert preview._latest is frames[-1]
+
+def test_headless_does_not_pause():
+    """Pas de saisie attendue en mode headless"""
+    pause_before_exit(headless=True)
@@ -0,0 +1,51 @@
+"""
+Tests pour l'instrumentation par étape
+"""
+
+import sys
+import os
+import time
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import profiling
+
+def test_disabled_records_nothing():
+    """Désactivée: aucune statistique collectée"""
+    profiling.disable()
+    profiling.reset()
+    
+    @profiling.timed('test.noop')
+    def noop():
+        return 42
+    
+    with profiling.timer('test.block'):
+        assert noop() == 42
+    
+    assert profiling.snapshot() == {}
+
+def test_histogram_and_merge():
+    """Histogramme par étape, fusion d'un autre processus"""
+    profiling.reset()
+    profiling.enable()
+    try:
+        @profiling.timed('test.sleep')
+        def sleep():
+            time.sleep(0.002)
+        
+        for _ in range(5):
+            sleep()
+        
+        data = profiling.snapshot(reset_after=True)
+        assert data['test.sleep']['count'] == 5
+        assert profiling.snapshot() == {}
+        
+        profiling.merge(data)
+        profiling.merge(data)
+        stats = profiling._stats['test.sleep']
+        
+        assert stats.count == 10
+        assert 2.0 <= stats.percentile(50) <= stats.max
+        assert 'test.sleep' in profiling.summary_table()
+    finally:
+        profiling.disable()
+        profiling.reset()
@@ -0,0 +1,44 @@
+"""
+Tests pour le rapport de batch
+"""
+
+import sys
+import os
+import csv
+import json
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from report_sink import BatchReportSink
+
+PLATE = {'text': 'AB-123-CD', 'confidence': 0.9, 'format': 'FR',
+         'bbox': [[10, 20], [110, 20], [110, 50], [10, 50]]}
+
+def test_single_csv_for_batch(tmp_path):
+    """Un seul fichier de données et un seul résumé par batch"""
+    with BatchReportSink('csv', str(tmp_path)) as sink:
+        for i in range(50):
+            sink.add(f"/images/car_{i}.jpg", [PLATE] if i % 2 else [])
+    
+    assert sorted(os.listdir(tmp_path)) == sorted(
+        [os.path.basename(sink.path), os.path.basename(sink.summary_path)]
+    )
+    
+    with open(sink.path, newline='', encoding='utf-8') as f:
+        rows = list(csv.reader(f))
+    
+    assert rows[0] == BatchReportSink.CSV_HEADER
+    assert len(rows) == 1 + 25
+    assert rows[1][3] == 'AB-123-CD' and rows[1][6:] == ['10', '20', '110', '50']
+    assert (sink.images, sink.total_plates, len(sink.unique_plates)) == (50, 25, 1)
+
+def test_jsonl(tmp_path):
+    """Un enregistrement JSON par image"""
+    with BatchReportSink('jsonl', str(tmp_path)) as sink:
+        sink.add("/images/a.jpg", [PLATE])
+        sink.add("/images/b.jpg", [])
+    
+    with open(sink.path, encoding='utf-8') as f:
+        records = [json.loads(line) for line in f]
+    
+    assert [r['file'] for r in records] == ['a.jpg', 'b.jpg']
+    assert records[0]['plates'][0]['text'] == 'AB-123-CD'
@@ -0,0 +1,67 @@
+"""
+Tests pour le cache des résultats
+"""
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from result_cache import ResultCache, config_fingerprint
+import numpy as np
+
+def test_hit_and_miss(tmp_path):
+    """Même contenu et même configuration: hit"""
+    cache = ResultCache(config_fingerprint(profile='fast'), str(tmp_path))
+    key = cache.key(b"image-bytes")
+    
+    assert cache.get(key) is None
+    cache.put(key, {'plates': [{'text': 'AB-123-CD',
+                                'confidence': np.float64(0.9),
+                                'bbox': [[np.int32(1), 2]]}]})
+    
+    # Relu par une nouvelle instance (autre processus, autre exécution)
+    reopened = ResultCache(config_fingerprint(profile='fast'), str(tmp_path))
+    value = reopened.get(key)
+    
+    assert value['plates'][0]['text'] == 'AB-123-CD'
+    assert value['plates'][0]['bbox'] == [[1, 2]]
+    assert (cache.misses, reopened.hits) == (1, 1)
+
+def test_config_change_invalidates(tmp_path):
+    """Une autre configuration donne une autre clé"""
+    fast = ResultCache(config_fingerprint(profile='fast'), str(tmp_path))
+    quality = ResultCache(config_fingerprint(profile='quality'), str(tmp_path))
+    
+    assert fast.key(b"image-bytes") != quality.key(b"image-bytes")
+
+def test_lru_eviction(tmp_path):
+    """Au-delà de la taille maximale, l'entrée la moins récente part"""
+    cache = ResultCache('test', str(tmp_path), max_bytes=150)
+    keys = [cache.key(bytes([i])) for i in range(3)]
+    
+    cache.put(keys[0], {'plates': ['x' * 50]})
+    cache.put(keys[1], {'plates': ['y' * 50]})
+    cache.get(keys[0])
+    cache.put(keys[2], {'plates': ['z' * 50]})
+    
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[0]) is not None
+    assert cache.get(keys[2]) is not None
+
+def test_concurrent_put_same_key(tmp_path):
+    """Plusieurs threads écrivent la même clé sans erreur"""
+    from concurrent.futures import ThreadPoolExecutor
+    
+    cache = ResultCache('test', str(tmp_path))
+    key = cache.key(b"image-bytes")
+    
+    def write(i):
+        cache.put(key, {'plates': [i]})
+        return cache.get(key)
+    
+    with ThreadPoolExecutor(8) as pool:
+        results = list(pool.map(write, range(400)))
+    
+    assert all(r is not None for r in results)
+    assert cache._total_bytes == sum(cache._entries.values())
+    assert not [f for f in os.listdir(tmp_path / key[:2]) if f.endswith('.tmp')]